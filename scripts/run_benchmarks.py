@@ -0,0 +1,244 @@
+"""Performance benchmarks for compositing, filters and display conversion.
+
+    QT_QPA_PLATFORM=offscreen python scripts/run_benchmarks.py -o bench.json
+    python scripts/run_benchmarks.py --compare bench.json --threshold 0.2
+
+Results (milliseconds per call) go to a JSON file. With --compare the run
+is checked against a stored baseline: every case slower by more than the
+threshold is listed and the exit code is 1.
+"""
+
+# pylint: disable=no-member
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # before Qt is imported
+
+import cv2  # pylint: disable=wrong-import-position
+import numpy as np  # pylint: disable=wrong-import-position
+from PyQt6.QtWidgets import QApplication  # pylint: disable=wrong-import-position
+
+# pylint: disable=wrong-import-position
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.boolean_operations.image_boolean import merge
+from creatumlibre.graphics.filters import enhancers
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.graphics.selection.cropped_mask import CroppedMask
+from creatumlibre.ui.manager.object_manager import ObjectManager
+
+BASE_SIZE = (2048, 1536)  # width, height of the images under test
+MERGE_SIZES = (64, 256, 1024)  # square overlays
+LAYER_COUNTS = (1, 10, 100, 1000)
+LAYER_SIZE = 128
+ZOOM_LEVELS = (0.25, 0.5, 1.0, 2.0)
+MIN_RUNS = 3
+MAX_RUNS = 20
+TIME_PER_CASE = 1.0  # seconds, fast cases repeat up to MAX_RUNS
+THRESHOLD = 0.2  # slower by more than 20 % counts as a regression
+
+rng = np.random.default_rng(0)  # same pixels on every run
+app = QApplication.instance() or QApplication([])  # QPixmap needs one
+
+
+def random_image(width: int, height: int) -> np.ndarray:
+    return rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+
+def circle_mask(size: int, soft: bool) -> CroppedMask | None:
+    alpha = np.zeros((size, size), dtype=np.uint8)
+    cv2.circle(alpha, (size // 2, size // 2), size // 2 - 1, 255, -1)
+    if soft:
+        alpha = cv2.GaussianBlur(alpha, (0, 0), size / 16)
+    return CroppedMask.from_array(alpha)
+
+
+def merge_cases():
+    width, height = BASE_SIZE
+    target = ImageHandler(random_image(width, height), Vector2D(0, 0))
+    for size in MERGE_SIZES:
+        for mask_type in ("opaque", "binary", "soft"):
+            layer = ImageHandler(random_image(size, size), Vector2D(100, 100))
+            if mask_type != "opaque":
+                layer.region_manager.mask = circle_mask(size, mask_type == "soft")
+            yield f"merge/{size}px/{mask_type}", lambda l=layer: merge(l, target)
+
+
+def enhancer_cases():
+    image = random_image(*BASE_SIZE)
+    filters = {
+        "brightness": (enhancers.adjust_brightness, 1.2),
+        "saturation": (enhancers.adjust_saturation, 1.3),
+        "contrast": (enhancers.adjust_contrast, 1.1),
+        "rgb": (enhancers.adjust_rgb, 0.1, "Red"),
+    }
+    for name, (function, *args) in filters.items():
+        # on a copy, adjust_rgb works in place
+        yield f"enhancers/{name}", lambda f=function, a=args: f(image.copy(), *a)
+
+
+def layered_manager(count: int) -> ObjectManager:
+    width, height = BASE_SIZE
+    manager = ObjectManager()
+    manager.set_base_image(random_image(width, height))
+    mask = circle_mask(LAYER_SIZE, soft=True)
+    for _ in range(count):
+        x = int(rng.integers(0, width - LAYER_SIZE))
+        y = int(rng.integers(0, height - LAYER_SIZE))
+        layer = ImageHandler(random_image(LAYER_SIZE, LAYER_SIZE), Vector2D(x, y))
+        layer.region_manager.mask = mask
+        manager.add_object(layer)
+    return manager
+
+
+def composite_cases():
+    for count in LAYER_COUNTS:
+        manager = layered_manager(count)
+
+        def full(manager=manager):
+            manager.compositor.invalidate()
+            manager.show_resulting_image()
+
+        def move(manager=manager):
+            # the interactive case: one layer moved, only its tiles recomposite
+            layer = manager.object_list[-1]
+            x, y = layer.get_position()
+            layer.set_position(Vector2D(x + 1 if x < 1000 else 0, y))
+            manager.show_resulting_image()
+
+        yield f"show_resulting_image/{count}-layers/full", full
+        yield f"show_resulting_image/{count}-layers/move-one", move
+
+
+def display_cases():
+    manager = layered_manager(10)
+    composite = manager.composite().copy()
+    for zoom in ZOOM_LEVELS:
+
+        def convert(zoom=zoom):
+            manager.zoom_factor = zoom
+            manager._to_qpixmap(composite)  # pylint: disable=protected-access
+
+        yield f"to_qpixmap/zoom-{zoom}", convert
+
+
+def copy_cases():
+    width, height = BASE_SIZE
+    plain = ImageHandler(random_image(width, height), Vector2D(0, 0))
+    masked = ImageHandler(random_image(width, height), Vector2D(0, 0))
+    masked.region_manager.mask = circle_mask(min(width, height), soft=True)
+
+    def copy_and_write(handler=plain):
+        handler.copy().get_writable_image()  # the copy is paid for on write
+
+    yield "image_handler_copy/plain", plain.copy
+    yield "image_handler_copy/masked", masked.copy
+    yield "image_handler_copy/plain-then-write", copy_and_write
+
+
+SUITES = {
+    "merge": merge_cases,
+    "enhancers": enhancer_cases,
+    "composite": composite_cases,
+    "display": display_cases,
+    "copy": copy_cases,
+}
+
+
+def measure(function) -> dict:
+    """milliseconds per call after one warm-up call"""
+    function()
+    times = []
+    start = time.perf_counter()
+    while len(times) < MIN_RUNS or (
+        len(times) < MAX_RUNS and time.perf_counter() - start < TIME_PER_CASE
+    ):
+        begin = time.perf_counter()
+        function()
+        times.append((time.perf_counter() - begin) * 1000)
+    return {
+        "median_ms": statistics.median(times),
+        "min_ms": min(times),
+        "max_ms": max(times),
+        "runs": len(times),
+    }
+
+
+def run(suites: list[str], match: str | None) -> dict:
+    results = {}
+    for suite in suites:
+        for name, function in SUITES[suite]():
+            if match and match not in name:
+                continue
+            results[name] = measure(function)
+            print(f"{name:<48} {results[name]['median_ms']:10.3f} ms")
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Names of the cases whose median got slower than baseline * (1 + threshold).
+    Cases missing on either side are skipped.
+    """
+    regressions = []
+    print(f"\n{'case':<48} {'baseline':>10} {'now':>10} {'change':>8}")
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        before, now = baseline[name]["median_ms"], result["median_ms"]
+        change = now / before - 1 if before > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<48} {before:10.3f} {now:10.3f} {change:+8.1%}{flag}")
+    return regressions
+
+
+def environment() -> dict:
+    return {
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "base_size": BASE_SIZE,
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-o", "--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", metavar="BASELINE", help="JSON of an earlier run")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD)
+    parser.add_argument(
+        "--suite", action="append", choices=list(SUITES), help="default: all"
+    )
+    parser.add_argument("-k", "--match", help="only cases containing this text")
+    args = parser.parse_args(argv)
+
+    report = {
+        "environment": environment(),
+        "results": run(args.suite or list(SUITES), args.match),
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(report["results"], baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+# pylint: disable=no-member
+import argparse
+import fnmatch
+import functools
+import multiprocessing
+import os
+
+import cv2
+
+from creatumlibre.core.document import Document
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.filters import enhancers
+from creatumlibre.graphics.io.image_store import ImageStore
+from creatumlibre.graphics.math.vector2d import Vector2D
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+FILTERS = {
+    "brightness": enhancers.adjust_brightness,
+    "saturation": enhancers.adjust_saturation,
+    "contrast": enhancers.adjust_contrast,
+    "red": functools.partial(enhancers.adjust_rgb, channel="Red"),
+    "green": functools.partial(enhancers.adjust_rgb, channel="Green"),
+    "blue": functools.partial(enhancers.adjust_rgb, channel="Blue"),
+}
+# no .npy caches in the shared temp directory, every file is read once
+_batch_store = ImageStore(keep_cache=False)
+
+
+class BatchJob:
+    """What happens to every file: the filter chain on the image, then the
+    layers composited on top. Picklable, each worker process gets a copy.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        filters: list[tuple[str, float]] = (),
+        layers: list[tuple[str, int, int]] = (),
+        extension: str | None = None,
+    ):
+        self.output_dir = output_dir
+        self.filters = list(filters)  # (name in FILTERS, value)
+        self.layers = list(layers)  # (file, x, y), bottom to top
+        self.extension = extension  # None: same format as the input
+
+    def output_path(self, file_path: str) -> str:
+        stem, extension = os.path.splitext(os.path.basename(file_path))
+        return os.path.join(self.output_dir, stem + (self.extension or extension))
+
+    def process(self, file_path: str) -> tuple[str, str | None]:
+        """Renders one file into the output directory.
+        Returns (file, None) or (file, error message).
+        """
+        image = _batch_store.load(file_path)
+        if image is None:
+            return file_path, "Datei nicht lesbar"
+
+        document = Document(image_store=_batch_store, keep_history=False)
+        document.set_base_image(image)
+
+        for name, value in self.filters:
+            document.apply_filter(FILTERS[name], value)
+        for layer_path, x, y in self.layers:
+            document.add_object(ImageHandler(_load_layer(layer_path), Vector2D(x, y)))
+
+        if not document.save(self.output_path(file_path)):
+            return file_path, "Datei nicht schreibbar"
+        return file_path, None
+
+
+@functools.lru_cache(maxsize=None)
+def _load_layer(file_path: str):
+    """overlay images are read once per worker, not once per file"""
+    image = _batch_store.load(file_path)
+    if image is None:
+        raise ValueError(f"Ebene nicht lesbar: {file_path}")
+    image.flags.writeable = False  # shared by all documents of the worker
+    return image
+
+
+def find_images(input_dir: str, pattern: str = "*") -> list[str]:
+    """image files in 'input_dir' (not recursive) matching the glob pattern"""
+    return sorted(
+        entry.path
+        for entry in os.scandir(input_dir)
+        if entry.is_file()
+        and entry.name.lower().endswith(IMAGE_EXTENSIONS)
+        and fnmatch.fnmatch(entry.name, pattern)
+    )
+
+
+def run_batch(job: BatchJob, files: list[str], workers: int | None = None):
+    """Processes 'files' on a pool of 'workers' processes (default: all cores).
+    Yields (file, error or None) in the order the files finish, every result
+    is on disk by then, so nothing piles up in memory.
+    """
+    os.makedirs(job.output_dir, exist_ok=True)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(files) or 1))
+    if workers == 1:
+        _init_worker()
+        for file_path in files:
+            yield _process(job, file_path)
+        return
+
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        yield from pool.imap_unordered(
+            functools.partial(_process, job), files, chunksize=1
+        )
+
+
+def _init_worker():
+    # the pool is the parallelism, OpenCV threads per process would compete
+    cv2.setNumThreads(1)
+
+
+def _process(job: BatchJob, file_path: str) -> tuple[str, str | None]:
+    try:
+        return job.process(file_path)
+    except Exception as error:  # pylint: disable=broad-exception-caught
+        return file_path, str(error)  # one broken file does not stop the batch
+
+
+def parse_filter(spec: str) -> tuple[str, float]:
+    """'brightness=1.2' -> ('brightness', 1.2)"""
+    name, _, value = spec.partition("=")
+    if name not in FILTERS:
+        raise argparse.ArgumentTypeError(
+            f"unbekannter Filter '{name}', möglich: {', '.join(FILTERS)}"
+        )
+    try:
+        return name, float(value)
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(f"kein Zahlenwert in '{spec}'") from error
+
+
+def parse_layer(spec: str) -> tuple[str, int, int]:
+    """'logo.png@20,40' -> ('logo.png', 20, 40), without position at 0, 0"""
+    file_path, separator, position = spec.rpartition("@")
+    if not separator:
+        return spec, 0, 0
+    try:
+        x, y = (int(value) for value in position.split(","))
+    except ValueError as error:
+        raise argparse.ArgumentTypeError(
+            f"Position x,y erwartet in '{spec}'"
+        ) from error
+    return file_path, x, y
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="creatumlibre batch",
+        description="Filter und Ebenen auf alle Bilder eines Verzeichnisses anwenden.",
+    )
+    parser.add_argument("input_dir")
+    parser.add_argument("output_dir")
+    parser.add_argument(
+        "-f",
+        "--filter",
+        dest="filters",
+        action="append",
+        type=parse_filter,
+        default=[],
+        metavar="NAME=WERT",
+        help=f"in Reihenfolge angewendet: {', '.join(FILTERS)}",
+    )
+    parser.add_argument(
+        "-l",
+        "--layer",
+        dest="layers",
+        action="append",
+        type=parse_layer,
+        default=[],
+        metavar="DATEI[@X,Y]",
+        help="Ebene über dem gefilterten Bild, mehrfach von unten nach oben",
+    )
+    parser.add_argument("-p", "--pattern", default="*", help="z.B. '*.jpg'")
+    parser.add_argument(
+        "-e", "--extension", help="Ausgabeformat, z.B. .png (Standard: wie Eingabe)"
+    )
+    parser.add_argument(
+        "-w", "--workers", type=int, default=None, help="Prozesse (Standard: Kerne)"
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    extension = args.extension
+    if extension and not extension.startswith("."):
+        extension = f".{extension}"
+
+    files = find_images(args.input_dir, args.pattern)
+    job = BatchJob(args.output_dir, args.filters, args.layers, extension)
+    failed = 0
+    for count, (file_path, error) in enumerate(
+        run_batch(job, files, args.workers), start=1
+    ):
+        if error is None:
+            print(f"[{count}/{len(files)}] {job.output_path(file_path)}")
+        else:
+            failed += 1
+            print(f"[{count}/{len(files)}] Fehler bei {file_path}: {error}")
+    return 1 if failed else 0
@@ -0,0 +1,208 @@
+# pylint: disable=no-member
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.core.layer_stack import LayerStack
+from creatumlibre.core.undo_history import UndoHistory
+from creatumlibre.graphics.boolean_operations.image_boolean import merge
+from creatumlibre.graphics.compositing.tile_compositor import TileCompositor
+from creatumlibre.graphics.filters.tiled_executor import TiledExecutor
+from creatumlibre.graphics.io.image_store import ImageStore, get_default_store
+from creatumlibre.graphics.math.point_array import PointArray
+from creatumlibre.graphics.math.vector2d import Vector2D
+
+
+class Document(LayerStack):
+    """The layers of one image and the edits on them, without any Qt.
+
+    object_list[0] is the base image, everything above is composited onto
+    it. Used by the editor (ObjectManager adds the display) and by batch
+    jobs that never start a GUI.
+    """
+
+    def __init__(
+        self,
+        file_path: str | None = None,
+        image_store: ImageStore | None = None,
+        keep_history: bool = True,
+    ):
+        super().__init__()
+        self.image_store = image_store or get_default_store()  # large files on disk
+        self.compositor = TileCompositor()
+        self._drag: tuple[list[ImageHandler], PointArray] | None = None
+        self._drag_step = False  # the drag opened the pending undo step
+        # batch jobs go without, an edit then costs no tile comparison
+        self.history = UndoHistory() if keep_history else None
+
+        if file_path is not None:
+            self._add_new_image_by_filename(file_path)
+
+    def _add_new_image_by_filename(self, file_path):
+        self.set_base_image(self.image_store.load(file_path))
+
+    def composite(self, zoom_factor: float = 1.0) -> np.ndarray:
+        """All layers blended onto the base (BGR). The compositor's canvas,
+        valid until the next composite, copy it to keep it.
+        """
+        return self.compositor.render(self.object_list, zoom_factor)
+
+    def save(self, file_path: str) -> bool:
+        """writes the composited image, the format follows the file extension"""
+        return cv2.imwrite(file_path, self.composite())
+
+    def apply_filter(
+        self,
+        function,
+        *args,
+        target: ImageHandler | None = None,
+        executor: TiledExecutor | None = None,
+    ):
+        """Replaces the pixels of 'target' (default: the base) with
+        function(pixels, *args), one undo step. Without an executor the
+        function runs on the whole image in this thread and may work in place.
+        """
+        target = target or self.get_base_object()
+        with self.undo_step("filter", touched=(target,)):
+            # a copy only if the undo step or another layer shares the pixels
+            pixels = target.get_writable_image()
+            if executor is None:
+                result = function(pixels, *args)
+            else:
+                result = executor.run(function, pixels, *args)
+            target.set_image(result)
+
+    def select_at(self, position: Vector2D, toggle: bool = False):
+        """selects the objects at the point, 'toggle' adds to the selection"""
+        self._drag = None
+        count = 0
+        for image_object in self.get_objects_at(position):
+            if not image_object.is_promoted:
+                count += 1
+                image_object.position_before_drag = image_object.position
+                if toggle:
+                    image_object.is_selected = not image_object.is_selected
+                else:
+                    self.clear_selection()
+                    image_object.is_selected = True
+        if count == 0:
+            self.clear_selection()
+
+    def set_new_position(self):
+        """new posiotn of the moved object"""
+        self._drag = None
+        if self._drag_step:
+            self._drag_step = False
+            self.end_step("move")
+        for image_object in reversed(self.object_list[1:]):
+            if image_object.is_selected:
+                image_object.position_before_drag = image_object.position
+
+    def update_selected_position(self, delta: Vector2D):
+        """update all selected posiitons"""
+        if self._drag is None:
+            self._drag_step = self._drag_step or self.begin_step()
+            # the start positions of one drag, gathered once in an array
+            selected = [obj for obj in self.object_list[1:] if obj.is_selected]
+            origins = PointArray([obj.position_before_drag for obj in selected])
+            self._drag = (selected, origins)
+
+        selected, origins = self._drag
+        for image_object, position in zip(selected, origins.translated(delta)):
+            image_object.set_position(position)
+        self._stale_index.update(selected)  # re-indexed on the next hit test
+
+    def clear_selection(self):
+        """release all selections i.e: by Esc"""
+        self._drag = None
+        for image_object in reversed(self.object_list):
+            image_object.is_selected = False
+
+    def clear_promoted(self):
+        """release all promotions i.e: by Esc"""
+        for image_object in reversed(self.object_list):
+            if image_object.is_promoted:
+                self.delete_object(image_object)
+
+    def copy_promoted_to_clipboard(self, is_cut: bool) -> ImageHandler:
+        """create a new object from the promoted image
+        param is_cut: if is cut: erase the underlying image
+        """
+        print(f"Cut mode: {is_cut}")
+        if (promoted_object := self.get_promoted_object()) is not None:
+            return promoted_object.copy()
+        return None
+
+    def paste_clipboard(self, clipboard: ImageHandler):
+        """put clipboard image to object list"""
+        image_object = clipboard.copy()
+        image_object.is_selected = True
+        image_object.is_promoted = False
+        with self.undo_step("paste"):
+            self.add_object(image_object)
+
+    def merge_selection(self):
+        """Finds the promoted object and merges it into the layer below."""
+        # Find promoted ImageHandler
+        promoted = self.get_promoted_object()
+
+        index = self.object_list.index(promoted)
+        if index == 0:
+            # No underlying layer to merge into
+            return
+
+        target = self.object_list[index - 1]
+
+        with self.undo_step("merge", touched=(target,)):
+            merge(from_obj=promoted, to_obj=target)
+
+            # Remove promoted selection from stack
+            self.delete_object(promoted)
+
+    def begin_step(self, touched=()) -> bool:
+        """Starts an undoable edit that may write the pixels of 'touched'.
+        False if it joins an edit already running, e.g. of a dialog.
+        """
+        if self.history is None:
+            return False
+        return self.history.begin(self.object_list, touched)
+
+    def end_step(self, label: str):
+        if self.history is not None:
+            self.history.commit(label, self.object_list)
+
+    def abort_step(self):
+        if self.history is not None:
+            self.history.abort()
+
+    @contextmanager
+    def undo_step(self, label: str, touched=()):
+        """the edits inside become one undo step, none if they raise"""
+        started = self.begin_step(touched)
+        try:
+            yield
+        except BaseException:
+            if started:
+                self.abort_step()  # a half done edit is no undo step
+            raise
+        if started:
+            self.end_step(label)
+
+    def undo(self) -> bool:
+        if self.history is None or not self.history.undo(self.object_list):
+            return False
+        self._rebuild_index()
+        return True
+
+    def redo(self) -> bool:
+        if self.history is None or not self.history.redo(self.object_list):
+            return False
+        self._rebuild_index()
+        return True
+
+    def _rebuild_index(self):
+        """a pending drag refers to the replaced objects"""
+        self._drag = None
+        super()._rebuild_index()
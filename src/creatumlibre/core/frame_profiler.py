@@ -0,0 +1,132 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+
+WINDOW = 300  # samples per stage the statistics are taken over
+MAX_EVENTS = 20000  # timeline entries kept for the trace export
+PROFILE_ENV = "CREATUMLIBRE_PROFILE"  # set to 1 to start with timing enabled
+
+_NO_STAGE = nullcontext()  # reusable, what a disabled profiler hands out
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler: "FrameProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *_):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+
+
+class FrameProfiler:
+    """Times the stages of a frame (sync, composite, resize, upload, paint).
+
+    Wrap a stage in 'with profiler.stage(name):'. While disabled that is
+    one attribute check, nothing is timed or stored. Enabled, every stage
+    keeps its last 'window' durations for rolling p50 / p95 / max, and a
+    bounded timeline can be written as a Chrome trace (chrome://tracing,
+    Perfetto). Stages may nest, a trace shows them stacked.
+    """
+
+    def __init__(self, window: int = WINDOW, enabled: bool = False):
+        self.enabled = enabled
+        self.window = window
+        self.samples: dict[str, deque[float]] = {}  # stage -> milliseconds
+        self.events: deque[tuple] = deque(maxlen=MAX_EVENTS)
+        self._lock = threading.Lock()  # stages may end on worker threads
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NO_STAGE
+        return _Stage(self, name)
+
+    def record(self, name: str, start_ns: int, end_ns: int):
+        with self._lock:
+            if (samples := self.samples.get(name)) is None:
+                samples = self.samples[name] = deque(maxlen=self.window)
+            samples.append((end_ns - start_ns) / 1e6)
+            self.events.append((name, start_ns, end_ns, threading.get_ident()))
+
+    def set_enabled(self, enabled: bool):
+        self.enabled = enabled
+
+    def reset(self):
+        with self._lock:
+            self.samples.clear()
+            self.events.clear()
+
+    def get_stats(self) -> dict[str, dict[str, float]]:
+        """per stage p50, p95 and max in milliseconds over the window"""
+        with self._lock:
+            snapshot = {name: sorted(values) for name, values in self.samples.items()}
+        return {
+            name: {
+                "p50": _percentile(values, 0.5),
+                "p95": _percentile(values, 0.95),
+                "max": values[-1],
+                "count": len(values),
+            }
+            for name, values in snapshot.items()
+            if values
+        }
+
+    def summary(self) -> str:
+        """one line for the status bar, slowest stages first"""
+        stats = sorted(
+            self.get_stats().items(), key=lambda item: item[1]["p95"], reverse=True
+        )
+        return "   ".join(
+            f"{name} {stat['p50']:.1f} / {stat['p95']:.1f} / {stat['max']:.1f}"
+            for name, stat in stats
+        )
+
+    def export_json(self, file_path: str):
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump(
+                {"window": self.window, "stages": self.get_stats()}, file, indent=2
+            )
+
+    def export_chrome_trace(self, file_path: str):
+        """the timeline in the Trace Event Format, 'X' events in microseconds"""
+        with self._lock:
+            events = list(self.events)
+        pid = os.getpid()
+        trace = [
+            {
+                "name": name,
+                "ph": "X",
+                "ts": start_ns / 1000,
+                "dur": (end_ns - start_ns) / 1000,
+                "pid": pid,
+                "tid": thread,
+            }
+            for name, start_ns, end_ns, thread in events
+        ]
+        with open(file_path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    """nearest rank on sorted values"""
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+_default_profiler: FrameProfiler | None = None
+
+
+def get_default_profiler() -> FrameProfiler:
+    """shared profiler, enabled from the start if CREATUMLIBRE_PROFILE=1"""
+    global _default_profiler  # pylint: disable=global-statement
+    if _default_profiler is None:
+        _default_profiler = FrameProfiler(enabled=os.environ.get(PROFILE_ENV) == "1")
+    return _default_profiler
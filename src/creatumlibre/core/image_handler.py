@@ -0,0 +1,202 @@
+# pylint: disable=no-member
+
+import cv2
+import numpy as np
+
+from creatumlibre.graphics.compositing.image_pyramid import LevelCache
+from creatumlibre.graphics.io.image_store import get_default_store
+from creatumlibre.graphics.math.point_array import PointArray
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.graphics.memory.cow_buffer import CowBuffer
+from creatumlibre.graphics.selection.cropped_mask import CroppedMask
+from creatumlibre.graphics.selection.polygon_mask import rasterize_polygon
+from creatumlibre.graphics.selection.region_manager import RegionManager
+
+
+class ImageHandler:
+    """Handles a single image object: pixel data, selection, and position."""
+
+    def __init__(
+        self,
+        image_array: np.ndarray | CowBuffer,
+        position: Vector2D,
+        is_promoted=False,
+        region_manager: RegionManager | None = None,
+    ):
+
+        if not isinstance(position, Vector2D):
+            raise TypeError(
+                f"Expected Vector2D for position, got {type(position).__name__}"
+            )
+
+        # BGR format, shared with copies until one of them writes
+        self.pixels = (
+            image_array
+            if isinstance(image_array, CowBuffer)
+            else CowBuffer(image_array)
+        )
+        self.position = position  # Absolute position in scene (e.g., top-left)
+        self.position_before_drag = position  # reference to add dx,dy while dragging
+        self.is_promoted = is_promoted
+        self.is_selected = False
+        self.revision = 0  # bumped on every visible change, read by the compositor
+        self._pixel_revision = 0  # bumped on pixel changes only
+        self.levels = LevelCache()  # downsampled copies for zoomed out views
+        if region_manager is None:
+            region_manager = RegionManager()
+            region_manager.initialize_mask(self.original_image.shape)
+        self.region_manager = region_manager
+
+    def copy(self):
+        """O(1) copy, pixels and mask are shared until either side writes"""
+        if not isinstance(self.position, Vector2D):
+            raise TypeError(
+                f"Expected Vector2D for position, got {type(self.position).__name__}"
+            )
+
+        new = ImageHandler(
+            self.pixels.share(),
+            self.position,
+            region_manager=self.region_manager.copy(),
+        )
+        new.position_before_drag = self.position_before_drag
+        new.is_promoted = False
+        new.is_selected = False
+        return new
+
+    @property
+    def original_image(self) -> np.ndarray:
+        return self.pixels.read()
+
+    def get_image(self) -> np.ndarray:
+        """Returns the raw image array, read-only while it is shared."""
+        return self.pixels.read()
+
+    def get_writable_image(self) -> np.ndarray:
+        """Returns the image array for in-place edits, call mark_dirty() after."""
+        return self.pixels.write()
+
+    def get_level(self, level: int) -> tuple[np.ndarray, CroppedMask | None]:
+        """Returns image and mask downsampled by 2**level (level 0: originals)."""
+        mask_revision = self.get_mask_revision()
+        return self.levels.get_level(
+            self.original_image,
+            self.get_mask(),
+            level,
+            ((self._pixel_revision, mask_revision), (self.revision, mask_revision)),
+        )
+
+    @property
+    def preview(self) -> tuple[int, np.ndarray] | None:
+        """(level, pixels) shown instead of the real pixels, see set_preview()"""
+        return self.levels.preview
+
+    def set_preview(self, image: np.ndarray, level: int):
+        """Shows 'image', pixels at pyramid 'level', instead of the real pixels
+        until those change. Used for quick low resolution previews.
+        """
+        self.levels.set_preview(image, level)
+        self.revision += 1
+
+    def clear_preview(self):
+        if self.levels.clear_preview():
+            self.revision += 1
+
+    def contains_point(self, click_position: Vector2D) -> bool:
+        """hit test in scene coordinates, transparent pixels are not hit"""
+        x, y = click_position
+        px, py = self.get_position().to_tuple()
+        h, w = self.original_image.shape[:2]
+        if not (px <= x < px + w and py <= y < py + h):
+            return False
+        mask = self.get_mask()
+        return mask is None or mask.contains(x - px, y - py)
+
+    def get_opaque_bounds(self) -> tuple[int, int, int, int]:
+        """(x0, y0, x1, y1) in scene coordinates around all visible pixels"""
+        px, py = self.get_position().to_tuple()
+        if (mask := self.get_mask()) is None:
+            h, w = self.original_image.shape[:2]
+            return px, py, px + w, py + h
+        x0, y0, x1, y1 = mask.get_bounds()
+        return px + x0, py + y0, px + x1, py + y1
+
+    def set_image(self, image):
+        if image is not self.pixels.read():
+            self.pixels = CowBuffer(image)
+        self.mark_dirty()
+
+    def mark_dirty(self):
+        """signal a pixel change done in place on the image array"""
+        self.revision += 1
+        self._pixel_revision += 1
+        self.levels.clear_preview()
+
+    def set_position(self, position: Vector2D):
+        """set global position"""
+        self.position = position
+
+    def get_position(self) -> Vector2D:
+        """Returns the (x, y) position in global scene space."""
+        return self.position
+
+    def get_mask(self) -> CroppedMask | None:
+        """Returns the alpha mask (0-255) cropped to its box, None: opaque."""
+        return self.region_manager.mask
+
+    def get_mask_revision(self) -> int:
+        """changes whenever a new mask is set, unlike the id() of the mask"""
+        return self.region_manager.mask_revision
+
+    def extract_selection_as_new_image(self) -> "ImageHandler | None":
+        """Extracts the currently selected region as a new ImageHandler instance."""
+        if self.region_manager.get_bounding_rect() is None:
+            return None
+
+        x, y, w, h = self.region_manager.get_bounding_rect()
+
+        # Clip region safely from image
+        selected_region = get_default_store().copy(
+            self.original_image[y : y + h, x : x + w]
+        )
+
+        # Optional: clip selection mask too
+        # cropped_mask = selection_mask[y:y+h, x:x+w].copy()
+
+        new_object = ImageHandler(
+            image_array=selected_region, position=Vector2D(x, y), is_promoted=True
+        )
+
+        return new_object
+
+    def extract_polygon_as_new_image(
+        self, points: PointArray | list[Vector2D]
+    ) -> "ImageHandler | None":
+        """Cuts the closed polygon (scene coordinates) out as a new promoted
+        image, masked with anti-aliased edges. None if it misses the image.
+        """
+        points = PointArray(points)
+        px, py = self.get_position().to_tuple()
+        local = points.translated((-px, -py)).to_array()
+        if (box := self._clip_rect(*cv2.boundingRect(local))) is None:
+            return None
+        x0, y0, x1, y1 = box
+
+        new_object = ImageHandler(
+            image_array=get_default_store().copy(self.original_image[y0:y1, x0:x1]),
+            position=Vector2D(x0 + px, y0 + py),
+            is_promoted=True,
+        )
+        # rasterized within the bounding box only
+        new_object.region_manager.mask = rasterize_polygon(local, (x0, y0, x1, y1))
+        new_object.region_manager.set_mask_points(points)
+        return new_object
+
+    def _clip_rect(self, x: int, y: int, w: int, h: int) -> tuple | None:
+        """(x0, y0, x1, y1) of a local rectangle within the image, None: outside"""
+        height, width = self.original_image.shape[:2]
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, width), min(y + h, height)
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return x0, y0, x1, y1
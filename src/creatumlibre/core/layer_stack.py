@@ -0,0 +1,108 @@
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.graphics.spatial.grid_index import GridIndex
+
+
+class LayerStack:
+    """The layers in stacking order and the index the hit tests run on.
+
+    object_list[0] is the base image, it is never indexed: it covers
+    everything. Objects moved during a drag are only marked stale and
+    re-indexed on the next query.
+    """
+
+    def __init__(self):
+        self.object_list = []
+        self.spatial_index = GridIndex()  # bounds of all objects but the base
+        self._stack_order: dict[ImageHandler, int] = {}  # higher: further up
+        self._next_stack_order = 0
+        self._stale_index: set[ImageHandler] = set()  # moved, not yet re-indexed
+
+    def set_base_image(self, image):
+        """sets the pixels of the bottom layer, e.g. once loading finished"""
+        if self.object_list:
+            self.object_list[0].set_image(image)
+            return
+        image_instance = ImageHandler(image, Vector2D(0, 0), False)
+        self.object_list.append(image_instance)
+
+    def get_base_image(self):
+        return self.object_list[0].get_image() if self.object_list else None
+
+    def get_promoted_object(self):
+        """get the promoted image by flag"""
+        for image_object in self.object_list:
+            if image_object.is_promoted:
+                return image_object
+        return None
+
+    def get_parent(self):
+        """get the activated object or the base image"""
+        for image_object in self.object_list:
+            if image_object.is_selected:
+                return image_object
+        return self.get_base_object()
+
+    def get_base_object(self):
+        return self.object_list[0] if self.object_list else None
+
+    def delete_object(self, image_object: ImageHandler):
+        """Deletes object from list by value"""
+        if image_object in self.object_list:
+            self.object_list.remove(image_object)
+        self.spatial_index.remove(image_object)
+        self._stale_index.discard(image_object)
+        self._stack_order.pop(image_object, None)
+
+    def add_object(self, image_handler: ImageHandler):
+        """Adds a new object"""
+        self.object_list.append(image_handler)
+        self._stack_order[image_handler] = self._next_stack_order
+        self._next_stack_order += 1
+        self.update_index(image_handler)
+
+    def update_index(self, image_object: ImageHandler):
+        """call after an object moved or changed its size or mask"""
+        self._stale_index.discard(image_object)
+        self.spatial_index.update(image_object, image_object.get_opaque_bounds())
+        if (mask := image_object.get_mask()) is not None:
+            mask.get_occupancy()  # built now rather than on the first click
+
+    def _flush_index(self):
+        """re-indexes the objects moved since the last query"""
+        while self._stale_index:
+            self.update_index(next(iter(self._stale_index)))
+
+    def get_objects_at(self, position: Vector2D) -> list[ImageHandler]:
+        """all objects hit at the point, top to bottom, the base excluded"""
+        self._flush_index()
+        x, y = position
+        hits = [
+            image_object
+            for image_object in self.spatial_index.query_point(x, y)
+            if image_object.contains_point(position)
+        ]
+        return sorted(hits, key=self._stack_order.__getitem__, reverse=True)
+
+    def get_objects_in_rect(self, x0: int, y0: int, x1: int, y1: int):
+        """all objects overlapping the rectangle, top to bottom, the base excluded"""
+        self._flush_index()
+        hits = self.spatial_index.query_rect((x0, y0, x1, y1))
+        return sorted(hits, key=self._stack_order.__getitem__, reverse=True)
+
+    def get_object_at(self, position: Vector2D):
+        """get image at clicked point"""
+        for image_object in self.get_objects_at(position):
+            if not image_object.is_promoted:
+                return image_object
+        return None
+
+    def _rebuild_index(self):
+        """stacking and hit test index after the object list was replaced"""
+        self.spatial_index = GridIndex()
+        self._stale_index.clear()
+        self._stack_order.clear()
+        for image_object in self.object_list[1:]:
+            self._stack_order[image_object] = self._next_stack_order
+            self._next_stack_order += 1
+            self.update_index(image_object)
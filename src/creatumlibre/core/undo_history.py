@@ -0,0 +1,229 @@
+from creatumlibre.graphics.memory.cow_buffer import CowBuffer
+from creatumlibre.graphics.memory.tile_delta import TileDelta
+
+DEFAULT_BUDGET = 512 * 1024 * 1024  # bytes in memory for all steps together
+RAW_STEPS = 4  # the newest steps stay uncompressed, undoing them is instant
+MAX_STEPS = 100
+
+
+class LayerState:
+    """Everything an undo step restores of a layer but its pixels."""
+
+    __slots__ = (
+        "layer",
+        "position",
+        "is_promoted",
+        "is_selected",
+        "mask",
+        "mask_revision",
+        "points",
+    )
+
+    def __init__(self, layer):
+        self.layer = layer
+        self.position = layer.position
+        self.is_promoted = layer.is_promoted
+        self.is_selected = layer.is_selected
+        self.mask = layer.region_manager.mask  # immutable, shared
+        self.mask_revision = layer.region_manager.mask_revision
+        self.points = layer.region_manager.point_list
+
+    def key(self) -> tuple:
+        return (
+            self.layer,
+            self.position,
+            self.is_promoted,
+            self.is_selected,
+            self.mask_revision,
+            id(self.points),
+        )
+
+    def restore(self):
+        layer = self.layer
+        layer.position = self.position
+        layer.position_before_drag = self.position
+        layer.is_promoted = self.is_promoted
+        layer.is_selected = self.is_selected
+        region_manager = layer.region_manager
+        if region_manager.mask_revision != self.mask_revision:
+            # a new revision would rebuild tiles and pyramid of an unchanged mask
+            region_manager.mask = self.mask
+            region_manager.mask_revision = self.mask_revision
+        region_manager.point_list = self.points
+
+
+class PendingStep:  # pylint: disable=too-few-public-methods
+    """The state before an edit: layer states and shared pixels of the
+    layers the edit may write. The pixels cost nothing until one is written.
+    """
+
+    def __init__(self, object_list: list, touched=()):
+        self.layers = [LayerState(layer) for layer in object_list]
+        self.pixels: dict[object, CowBuffer] = {}
+        self.watch(touched)
+
+    def watch(self, layers):
+        """pixels of 'layers' are compared when the step is recorded"""
+        for layer in layers:
+            if layer not in self.pixels:
+                self.pixels[layer] = layer.pixels.share()
+
+
+class UndoStep:
+    """One edit: the layer list of the other side and changed tiles per layer.
+    Undo and redo swap both with the live state, so a step flips sides.
+    """
+
+    __slots__ = ("label", "layers", "deltas", "retained")
+
+    def __init__(self, label: str, layers: list[LayerState], deltas: dict):
+        self.label = label
+        self.layers = layers
+        self.deltas: dict[object, TileDelta] = deltas
+        self.retained = 0  # pixel bytes of layers only this step still holds
+
+    @property
+    def nbytes(self) -> int:
+        return self.retained + sum(delta.nbytes for delta in self.deltas.values())
+
+    def compress(self):
+        for delta in self.deltas.values():
+            delta.compress()
+
+    def spill(self, directory: str):
+        for delta in self.deltas.values():
+            delta.spill(directory)
+
+    def discard(self):
+        for delta in self.deltas.values():
+            delta.discard()
+        self.deltas.clear()
+        self.layers.clear()
+
+
+class UndoHistory:
+    """Undo and redo of ObjectManager edits within a memory budget.
+
+    Steps store only the tiles an edit changed plus the layer states, so
+    the cost follows what was touched, not the image size. Beyond the
+    newest RAW_STEPS the tiles get zlib compressed. Above the budget the
+    oldest steps move to 'spill_dir' (if given) or are dropped.
+    """
+
+    def __init__(
+        self,
+        budget: int = DEFAULT_BUDGET,
+        spill_dir: str | None = None,
+        raw_steps: int = RAW_STEPS,
+        max_steps: int = MAX_STEPS,
+    ):
+        self.budget = budget
+        self.spill_dir = spill_dir
+        self.raw_steps = raw_steps
+        self.max_steps = max_steps
+        self.undo_steps: list[UndoStep] = []
+        self.redo_steps: list[UndoStep] = []
+        self.pending: PendingStep | None = None
+
+    def begin(self, object_list: list, touched=()) -> bool:
+        """Remembers the state before an edit. While a step is pending, the
+        edit becomes part of it and False is returned.
+        """
+        if self.pending is not None:
+            self.pending.watch(touched)
+            return False
+        self.pending = PendingStep(object_list, touched)
+        return True
+
+    def commit(self, label: str, object_list: list) -> bool:
+        """Records the pending step, False if it changed nothing."""
+        pending, self.pending = self.pending, None
+        if pending is None:
+            return False
+
+        deltas = {}
+        for layer, before in pending.pixels.items():
+            if before.shares_with(layer.pixels):
+                continue  # never written
+            delta = TileDelta.between(before.read(), layer.get_image())
+            if delta is not None:
+                deltas[layer] = delta
+        del pending.pixels  # drops the shared pixels before anything else
+
+        current = [LayerState(layer) for layer in object_list]
+        if not deltas and [state.key() for state in pending.layers] == [
+            state.key() for state in current
+        ]:
+            return False
+
+        for step in self.redo_steps:
+            step.discard()
+        self.redo_steps.clear()
+        self.undo_steps.append(UndoStep(label, pending.layers, deltas))
+        self._enforce_budget(object_list)
+        return True
+
+    def abort(self):
+        self.pending = None
+
+    def can_undo(self) -> bool:
+        return self.pending is None and bool(self.undo_steps)
+
+    def can_redo(self) -> bool:
+        return self.pending is None and bool(self.redo_steps)
+
+    def undo(self, object_list: list) -> bool:
+        """Restores the state before the last step, 'object_list' in place."""
+        if not self.can_undo():
+            return False
+        self._swap(self.undo_steps, self.redo_steps, object_list)
+        return True
+
+    def redo(self, object_list: list) -> bool:
+        if not self.can_redo():
+            return False
+        self._swap(self.redo_steps, self.undo_steps, object_list)
+        return True
+
+    def get_nbytes(self) -> int:
+        """memory held by all steps, spilled tiles not counted"""
+        return sum(step.nbytes for step in self.undo_steps + self.redo_steps)
+
+    def _swap(self, source: list[UndoStep], target: list[UndoStep], object_list):
+        step = source.pop()
+        current = [LayerState(layer) for layer in object_list]
+        for layer, delta in step.deltas.items():
+            layer.set_image(delta.swap(layer.get_writable_image()))
+
+        object_list[:] = [state.layer for state in step.layers]
+        for state in step.layers:
+            state.restore()
+        step.layers = current
+        target.append(step)
+        self._enforce_budget(object_list)
+
+    def _enforce_budget(self, object_list: list):
+        live = {id(layer) for layer in object_list}
+        for step in self.undo_steps + self.redo_steps:
+            step.retained = sum(
+                state.layer.get_image().nbytes
+                for state in step.layers
+                if id(state.layer) not in live
+            )
+
+        # older steps compressed, the redo side from its far end as well
+        for steps in (self.undo_steps, self.redo_steps):
+            for step in steps[: max(0, len(steps) - self.raw_steps)]:
+                step.compress()
+
+        oldest_first = iter(self.undo_steps)
+        if self.spill_dir is not None:
+            while self.get_nbytes() > self.budget:
+                if (step := next(oldest_first, None)) is None:
+                    break
+                step.spill(self.spill_dir)
+
+        while self.undo_steps and (
+            self.get_nbytes() > self.budget or len(self.undo_steps) > self.max_steps
+        ):
+            self.undo_steps.pop(0).discard()
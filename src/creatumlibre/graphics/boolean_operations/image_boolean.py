@@ -4,27 +4,47 @@
 import cv2
 import numpy as np
 
+from creatumlibre.core.image_handler import ImageHandler
 from creatumlibre.graphics.math.vector2d import Vector2D
-from creatumlibre.ui.manager.image_handler import ImageHandler
+from creatumlibre.graphics.selection.cropped_mask import CroppedMask
 
+BAND_PIXELS = 1 << 17  # pixels per band of blend_fixed_point
 
-def merge(
-    from_obj: ImageHandler, to_obj: ImageHandler
-):  # pylint: disable=too-many-locals
+
+def merge(from_obj: ImageHandler, to_obj: ImageHandler):
     """Composites the 'from' image into the 'to' image using its mask and position."""
-    overlay = from_obj.get_image()
-    mask = from_obj.get_mask()
-    act_postion = from_obj.get_position()
+    base = to_obj.get_writable_image()
+    if merge_arrays(
+        from_obj.get_image(), from_obj.get_mask(), from_obj.get_position(), base
+    ):
+        to_obj.set_image(base)
+
+
+def merge_arrays(  # pylint: disable=too-many-locals
+    overlay: np.ndarray,
+    mask: CroppedMask | np.ndarray | None,
+    act_postion: Vector2D,
+    base,
+) -> bool:
+    """Composites 'overlay' into 'base' in place, 'act_postion' is relative to base.
+    The mask is a CroppedMask, a full size array or None (opaque).
+    Returns False if nothing was touched.
+    """
+    if isinstance(mask, CroppedMask):
+        # only the masked box can show up, the rest is transparent
+        x, y = mask.offset
+        h, w = mask.alpha.shape
+        overlay = overlay[y : y + h, x : x + w]
+        act_postion = act_postion + Vector2D(x, y)
+        mask = mask.alpha
 
-    base = to_obj.get_image()
     h, w = overlay.shape[:2]
     if h < 1 or w < 1:
-        return
+        return False
 
     base_h, base_w = base.shape[:2]
 
     # Begrenzung berechnen
-    print(f"--- Act position: {act_postion.to_tuple()}")
     posTopLeft = act_postion.max_vector(Vector2D(0, 0))
     posRightBottom = (act_postion + (Vector2D(w, h))).min_vector(
         Vector2D(base_w, base_h)
@@ -32,31 +52,69 @@ def merge(
 
     # Falls komplett außerhalb: abbrechen
     if posTopLeft.x >= posRightBottom.x or posTopLeft.y >= posRightBottom.y:
-        return
+        return False
 
     # Offset im Overlay berechnen
     overlay_1 = posTopLeft - act_postion
     overlay_2 = overlay_1 + (posRightBottom - posTopLeft)
 
-    roi = base[posTopLeft.y : posRightBottom.y, posTopLeft.x : posRightBottom.x].astype(
-        np.float32
-    )
-    overlay_crop = overlay[overlay_1.y : overlay_2.y, overlay_1.x : overlay_2.x].astype(
-        np.float32
+    roi = base[posTopLeft.y : posRightBottom.y, posTopLeft.x : posRightBottom.x]
+    overlay_crop = overlay[overlay_1.y : overlay_2.y, overlay_1.x : overlay_2.x]
+
+    if mask is None:
+        roi[...] = overlay_crop
+        return True
+
+    alpha = to_fixed_point_alpha(
+        mask[overlay_1.y : overlay_2.y, overlay_1.x : overlay_2.x]
     )
+    lowest, highest = cv2.minMaxLoc(alpha)[:2]
+    if highest == 0:
+        return False  # fully transparent
+    if lowest == 255:
+        roi[...] = overlay_crop  # fully opaque: plain copy
+        return True
 
-    if mask is not None:
-        alpha = mask[overlay_1.y : overlay_2.y, overlay_1.x : overlay_2.x].astype(
-            np.float32
-        )
-        if len(alpha.shape) == 2:
-            alpha = cv2.merge([alpha] * 3)
-    else:
-        alpha = np.ones_like(overlay_crop, dtype=np.float32)
-
-    blended = overlay_crop * alpha + roi * (1 - alpha)
-    base[posTopLeft.y : posRightBottom.y, posTopLeft.x : posRightBottom.x] = (
-        blended.astype(np.uint8)
+    # skip transparent rows and columns around the visible part
+    x, y, w, h = cv2.boundingRect(alpha)
+    blend_fixed_point(
+        overlay_crop[y : y + h, x : x + w],
+        alpha[y : y + h, x : x + w],
+        roi[y : y + h, x : x + w],
     )
+    return True
+
+
+def to_fixed_point_alpha(mask: np.ndarray) -> np.ndarray:
+    """Converts a mask to uint8 alpha, 0: transparent, 255: opaque."""
+    if mask.dtype == np.uint8:
+        return mask
+    return cv2.convertScaleAbs(mask, alpha=255)  # float 0..1
+
+
+def blend_fixed_point(overlay: np.ndarray, alpha: np.ndarray, dest: np.ndarray):
+    """dest = (overlay * alpha + dest * (255 - alpha)) / 255, in place.
+    Works on uint8 and uint16 images with uint8 alpha. Runs in row bands so
+    the temporaries stay small and cache resident.
+    """
+    height, width = dest.shape[:2]
+    band = max(1, BAND_PIXELS // max(width, 1))
+
+    for y in range(0, height, band):
+        alpha_band = alpha[y : y + band]
+        dest_band = dest[y : y + band]
+
+        if dest.dtype == np.uint8:
+            weights = alpha_band.astype(np.float32)
+            dest_band[...] = cv2.blendLinear(
+                overlay[y : y + band], dest_band, weights, 255 - weights
+            )
+            continue
 
-    to_obj.set_image(base)
+        if overlay.ndim == 3:
+            alpha_band = alpha_band[..., np.newaxis]  # broadcast, no channel copy
+        acc = np.multiply(overlay[y : y + band], alpha_band, dtype=np.uint32)
+        acc += np.multiply(dest_band, 255 - alpha_band, dtype=np.uint32)
+        acc += 127
+        acc //= 255
+        dest_band[...] = acc
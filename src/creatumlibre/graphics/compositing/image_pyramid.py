@@ -0,0 +1,112 @@
+# pylint: disable=no-member
+import math
+
+import cv2
+import numpy as np
+
+from creatumlibre.graphics.io.image_store import get_default_store
+from creatumlibre.graphics.selection.cropped_mask import CroppedMask
+
+
+def level_for_zoom(zoom_factor: float) -> int:
+    """Coarsest pyramid level that still has at least the zoomed resolution."""
+    if zoom_factor >= 1:
+        return 0
+    return int(math.floor(math.log2(1 / zoom_factor) + 1e-9))
+
+
+def level_size(width: int, height: int, level: int) -> tuple[int, int]:
+    """size of an image at a pyramid level, never smaller than one pixel"""
+    for _ in range(level):
+        width, height = max(1, (width + 1) // 2), max(1, (height + 1) // 2)
+    return width, height
+
+
+class ImagePyramid:
+    """Lazily built half-size copies (mipmaps) of an image and its mask.
+
+    Level n holds the pixels downsampled by 2**n. All levels are dropped
+    as soon as the key of the source (pixel revision, mask revision) changes.
+    """
+
+    def __init__(self):
+        self._key = None
+        self._levels: dict[int, tuple[np.ndarray, CroppedMask | None]] = {}
+
+    def get_level(
+        self, image: np.ndarray, mask: CroppedMask | None, level: int, key
+    ) -> tuple[np.ndarray, CroppedMask | None]:
+        """Returns (image, mask) at the given level, building missing levels."""
+        if level <= 0:
+            return image, mask
+
+        if key != self._key:
+            self._levels.clear()
+            self._key = key
+
+        if level not in self._levels:
+            prev_image, prev_mask = self.get_level(image, mask, level - 1, key)
+            height, width = prev_image.shape[:2]
+            size = level_size(width, height, 1)
+            # levels of images on disk are on disk as well
+            scaled = get_default_store().empty(
+                size[::-1] + prev_image.shape[2:], prev_image.dtype
+            )
+            self._levels[level] = (
+                cv2.resize(prev_image, size, dst=scaled, interpolation=cv2.INTER_AREA),
+                None if prev_mask is None else prev_mask.downsampled(),
+            )
+        return self._levels[level]
+
+    def clear(self):
+        self._key = None
+        self._levels.clear()
+
+
+class LevelCache:
+    """The pyramid of an image, plus a low resolution preview that is shown
+    instead of the real pixels until those change.
+    """
+
+    def __init__(self):
+        self.pyramid = ImagePyramid()
+        self.preview: tuple[int, np.ndarray] | None = None  # (level, pixels)
+        self.preview_pyramid = ImagePyramid()
+
+    def set_preview(self, image: np.ndarray, level: int):
+        self.preview = (level, image)
+
+    def clear_preview(self) -> bool:
+        """drops the preview, False if there was none"""
+        if self.preview is None:
+            return False
+        self.preview = None
+        return True
+
+    def get_level(
+        self, image: np.ndarray, mask: CroppedMask | None, level: int, keys: tuple
+    ) -> tuple[np.ndarray, CroppedMask | None]:
+        """(image, mask) at 'level', from the preview while there is one.
+        'keys' are the cache keys of the real pixels and of the preview.
+        """
+        pixel_key, preview_key = keys
+        if self.preview is None:
+            return self.pyramid.get_level(image, mask, level, pixel_key)
+
+        preview_level, preview = self.preview
+        if level < preview_level:
+            # finer than the preview, only while the zoom changes under a preview
+            height, width = image.shape[:2]
+            level_mask = self._get_mask_level(image, mask, level, pixel_key)
+            return cv2.resize(preview, level_size(width, height, level)), level_mask
+
+        preview_mask = self._get_mask_level(image, mask, preview_level, pixel_key)
+        return self.preview_pyramid.get_level(
+            preview, preview_mask, level - preview_level, preview_key
+        )
+
+    def _get_mask_level(self, image, mask, level: int, key) -> CroppedMask | None:
+        """the mask at 'level', the real pixels are not touched without one"""
+        if mask is None:
+            return None
+        return self.pyramid.get_level(image, mask, level, key)[1]
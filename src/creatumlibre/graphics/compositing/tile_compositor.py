@@ -0,0 +1,304 @@
+# pylint: disable=no-member
+
+import numpy as np
+
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.boolean_operations.image_boolean import merge_arrays
+from creatumlibre.graphics.compositing.image_pyramid import level_for_zoom
+from creatumlibre.graphics.math.vector2d import Vector2D
+
+TILE_SIZE = 256
+
+
+class FrozenPlanes:
+    """Pre-blended layers below and above the moving part of the stack."""
+
+    def __init__(self, lo: int, hi: int, key: tuple):
+        self.lo = lo  # first moving layer
+        self.hi = hi  # last moving layer
+        self.key = key  # state of everything that was frozen
+        self.below: np.ndarray | None = None
+        self.above_origin = (0, 0)
+        self.above_color: np.ndarray | None = None  # premultiplied
+        self.above_transmission: np.ndarray | None = None  # 255: see-through
+        self.touched: set[tuple[int, int]] = set()
+
+    def allocate_above(self, origin: tuple[int, int], shape: tuple):
+        """an empty, fully see-through above plane with its top left at origin"""
+        self.above_origin = origin
+        self.above_color = np.zeros(shape, dtype=np.uint8)
+        self.above_transmission = np.full(shape, 255, dtype=np.uint8)
+
+    def apply_above(self, dest: np.ndarray, x0: int, y0: int):
+        """dest = color + dest * transmission, clipped to the above plane"""
+        if (overlap := self._above_overlap(dest.shape, x0, y0)) is None:
+            return
+        target, crop = overlap
+        sub = dest[target]
+        under = sub.astype(np.uint16) * self.above_transmission[crop]
+        sub[...] = np.minimum(self.above_color[crop] + (under + 127) // 255, 255)
+
+    def _above_overlap(self, shape: tuple, x0: int, y0: int) -> tuple | None:
+        """(slice of dest, slice of the above plane) where both overlap"""
+        if self.above_color is None:
+            return None
+        ax, ay = self.above_origin
+        ah, aw = self.above_color.shape[:2]
+        sx0, sy0 = max(ax - x0, 0), max(ay - y0, 0)
+        sx1, sy1 = min(ax + aw - x0, shape[1]), min(ay + ah - y0, shape[0])
+        if sx0 >= sx1 or sy0 >= sy1:
+            return None
+        return (
+            np.s_[sy0:sy1, sx0:sx1],
+            np.s_[sy0 + y0 - ay : sy1 + y0 - ay, sx0 + x0 - ax : sx1 + x0 - ax],
+        )
+
+
+class TileCompositor:
+    """Keeps the composited picture between frames and re-blends only dirty tiles.
+
+    A tile is dirty if a layer covering it changed its pixels, position
+    or mask since the last frame. Selection frames are not part of the
+    pixels, they are drawn on top by the view. The canvas lives at the
+    pyramid level matching the zoom factor, so zoomed out views blend
+    downsampled layers only.
+    """
+
+    def __init__(self, tile_size: int = TILE_SIZE):
+        self.tile_size = tile_size
+        self.canvas: np.ndarray | None = None  # composited result (BGR)
+        self.level = 0  # pyramid level of the canvas, scale 1 / 2**level
+        self.dirty_tiles: set[tuple[int, int]] = set()
+        self.changed_tiles: set[tuple[int, int]] = set()  # to repaint on screen
+        self._base_state = None
+        self._layer_states: dict[int, tuple] = {}  # id -> (layer, state, bounds)
+        self._layer_order: list[int] = []
+        self._frozen: FrozenPlanes | None = None
+
+    def invalidate(self):
+        """forget everything, the next render recomposites the whole canvas"""
+        self.canvas = None
+        self._base_state = None
+        self._layer_states.clear()
+        self._layer_order.clear()
+        self._frozen = None
+        self.dirty_tiles.clear()
+        self.changed_tiles.clear()
+
+    def freeze(self, layers: list[ImageHandler], zoom_factor: float, lo: int, hi: int):
+        """Pre-blends everything below layers[lo] and above layers[hi].
+        Until thaw(), dirty tiles only blend layers[lo:hi + 1] between both planes.
+        """
+        self.render(layers, zoom_factor)
+        frozen = FrozenPlanes(lo, hi, self._frozen_key(layers, lo, hi))
+
+        frozen.below = layers[0].get_level(self.level)[0].copy()
+        for layer in layers[1:lo]:
+            self._blend(layer, frozen.below, 0, 0)
+
+        self._freeze_above(frozen, layers[hi + 1 :])
+        self._frozen = frozen
+
+    def _freeze_above(self, frozen: FrozenPlanes, layers: list[ImageHandler]):
+        """blends 'layers' into the above plane, sized to their bounds"""
+        if not (bounds := [self._layer_states[id(layer)][2] for layer in layers]):
+            return
+        h, w = self.canvas.shape[:2]
+        x0, y0 = max(min(b[0] for b in bounds), 0), max(min(b[1] for b in bounds), 0)
+        x1, y1 = min(max(b[2] for b in bounds), w), min(max(b[3] for b in bounds), h)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        frozen.allocate_above((x0, y0), (y1 - y0, x1 - x0) + self.canvas.shape[2:])
+        for layer in layers:
+            self._blend(layer, frozen.above_color, x0, y0)
+            # transmission *= 1 - alpha
+            image, mask = layer.get_level(self.level)
+            lx, ly = self._layer_states[id(layer)][2][:2]
+            merge_arrays(
+                np.zeros_like(image),
+                mask,
+                Vector2D(lx - x0, ly - y0),
+                frozen.above_transmission,
+            )
+
+    def thaw(self):
+        """drops the frozen planes, tiles blended while frozen are redone exactly"""
+        if self._frozen is None:
+            return
+        self.dirty_tiles |= self._frozen.touched
+        self.changed_tiles |= self._frozen.touched
+        self._frozen = None
+
+    def render(self, layers: list[ImageHandler], zoom_factor: float) -> np.ndarray:
+        """Returns the composited canvas, recompositing only the dirty tiles."""
+        self.render_region(layers, zoom_factor, None)
+        return self.canvas
+
+    def render_region(
+        self,
+        layers: list[ImageHandler],
+        zoom_factor: float,
+        rect: tuple[int, int, int, int] | None,
+    ) -> tuple[np.ndarray, tuple[int, int]]:
+        """Recomposites the dirty tiles inside rect (x0, y0, x1, y1 in image
+        coordinates, None: everything). Dirty tiles outside stay dirty.
+        Returns the canvas pixels of that area and their top left corner.
+        """
+        self.sync(layers, zoom_factor)
+        if self._frozen is not None and self._frozen.key != self._frozen_key(
+            layers, self._frozen.lo, self._frozen.hi
+        ):
+            self.thaw()  # a frozen layer changed underneath us
+
+        h, w = self.canvas.shape[:2]
+        if rect is None:
+            x0, y0, x1, y1 = 0, 0, w, h
+        else:
+            scale = 1 << self.level
+            x0, y0 = max(rect[0] // scale, 0), max(rect[1] // scale, 0)
+            x1, y1 = min(-(-rect[2] // scale), w), min(-(-rect[3] // scale), h)
+        if x0 >= x1 or y0 >= y1:
+            return self.canvas[0:0, 0:0], (0, 0)
+
+        ts = self.tile_size
+        tiles = [
+            tile
+            for tile in self.dirty_tiles
+            if x0 // ts <= tile[0] <= (x1 - 1) // ts
+            and y0 // ts <= tile[1] <= (y1 - 1) // ts
+        ]
+        for tile in tiles:
+            self._composite_tile(tile, layers)
+        self.dirty_tiles.difference_update(tiles)
+        return self.canvas[y0:y1, x0:x1], (x0, y0)
+
+    def take_changed_rects(self) -> list[tuple[int, int, int, int]]:
+        """Areas (x0, y0, x1, y1 in image coordinates) marked dirty since the
+        last call, i.e. what a view has to repaint.
+        """
+        scale = self.tile_size << self.level
+        rects = [
+            (tx * scale, ty * scale, (tx + 1) * scale, (ty + 1) * scale)
+            for tx, ty in self.changed_tiles
+        ]
+        self.changed_tiles.clear()
+        return rects
+
+    def sync(self, layers: list[ImageHandler], zoom_factor: float):
+        """Compares the layers with the last frame and marks changed tiles dirty."""
+        if (level := level_for_zoom(zoom_factor)) != self.level:
+            self.invalidate()
+            self.level = level
+
+        base = layers[0]
+        base_image = base.get_level(self.level)[0]
+        base_state = (id(base), base_image.shape, base_image.dtype, base.revision)
+
+        if self.canvas is None or base_state[:3] != (self._base_state or ())[:3]:
+            self.invalidate()
+            self.canvas = np.empty_like(base_image)
+            self._mark_all_dirty()
+        elif base_state != self._base_state:
+            self._mark_all_dirty()
+        self._base_state = base_state
+
+        states = {}
+        for layer in layers[1:]:
+            state = self._layer_state(layer)
+            bounds = self._layer_bounds(layer)
+            states[id(layer)] = (layer, state, bounds)
+
+            if (old := self._layer_states.get(id(layer))) is None:
+                self._mark_rect_dirty(bounds)
+            elif old[1] != state:
+                self._mark_rect_dirty(old[2])
+                self._mark_rect_dirty(bounds)
+
+        for key, (_, _, bounds) in self._layer_states.items():
+            if key not in states:
+                self._mark_rect_dirty(bounds)
+
+        order = [id(layer) for layer in layers[1:]]
+        kept = [key for key in self._layer_order if key in states]
+        if kept != [key for key in order if key in self._layer_states]:
+            self._mark_all_dirty()  # stack was reordered
+
+        self._layer_states = states
+        self._layer_order = order
+        return self.dirty_tiles
+
+    def _frozen_key(self, layers: list[ImageHandler], lo: int, hi: int) -> tuple:
+        frozen = layers[1:lo] + layers[hi + 1 :]
+        return (
+            len(layers),
+            self._base_state,
+            self.level,
+            tuple((id(layer), self._layer_states[id(layer)][1]) for layer in frozen),
+        )
+
+    def _layer_state(self, layer: ImageHandler) -> tuple:
+        return (
+            layer.get_position().to_tuple(),
+            layer.get_image().shape,
+            layer.revision,
+            layer.get_mask_revision(),
+        )
+
+    def _layer_bounds(self, layer: ImageHandler) -> tuple[int, int, int, int]:
+        """bounds in canvas pixels, i.e. at the current pyramid level"""
+        x, y = layer.get_position().to_tuple()
+        x, y = x >> self.level, y >> self.level
+        h, w = layer.get_level(self.level)[0].shape[:2]
+        return x, y, x + w, y + h
+
+    def _mark_all_dirty(self):
+        h, w = self.canvas.shape[:2]
+        self._mark_rect_dirty((0, 0, w, h))
+
+    def _mark_rect_dirty(self, bounds: tuple[int, int, int, int]):
+        h, w = self.canvas.shape[:2]
+        x0, y0 = max(bounds[0], 0), max(bounds[1], 0)
+        x1, y1 = min(bounds[2], w), min(bounds[3], h)
+        if x0 >= x1 or y0 >= y1:
+            return
+        ts = self.tile_size
+        for ty in range(y0 // ts, (y1 - 1) // ts + 1):
+            for tx in range(x0 // ts, (x1 - 1) // ts + 1):
+                self.dirty_tiles.add((tx, ty))
+                self.changed_tiles.add((tx, ty))
+
+    def _composite_tile(self, tile: tuple[int, int], layers: list[ImageHandler]):
+        x0, y0, x1, y1 = rect = self._tile_rect(tile)
+        dest = self.canvas[y0:y1, x0:x1]
+        if (frozen := self._frozen) is None:
+            dest[...] = layers[0].get_level(self.level)[0][y0:y1, x0:x1]
+            moving = layers[1:]
+        else:
+            dest[...] = frozen.below[y0:y1, x0:x1]
+            moving = layers[frozen.lo : frozen.hi + 1]
+
+        for layer in moving:
+            if _overlaps(self._layer_states[id(layer)][2], rect):
+                self._blend(layer, dest, x0, y0)
+
+        if frozen is not None:
+            frozen.apply_above(dest, x0, y0)
+            frozen.touched.add(tile)
+
+    def _tile_rect(self, tile: tuple[int, int]) -> tuple[int, int, int, int]:
+        """(x0, y0, x1, y1) of a tile in canvas pixels, clipped to the canvas"""
+        ts = self.tile_size
+        h, w = self.canvas.shape[:2]
+        x0, y0 = tile[0] * ts, tile[1] * ts
+        return x0, y0, min(x0 + ts, w), min(y0 + ts, h)
+
+    def _blend(self, layer: ImageHandler, dest: np.ndarray, x0: int, y0: int):
+        """blends one layer into dest, whose top left corner sits at (x0, y0)"""
+        x, y = self._layer_states[id(layer)][2][:2]
+        image, mask = layer.get_level(self.level)
+        merge_arrays(image, mask, Vector2D(x - x0, y - y0), dest)
+
+
+def _overlaps(a: tuple[int, int, int, int], b: tuple[int, int, int, int]) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
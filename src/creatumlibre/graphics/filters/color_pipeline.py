@@ -0,0 +1,84 @@
+# pylint: disable = no-member
+from typing import NamedTuple
+
+import cv2
+import numpy as np
+
+from creatumlibre.graphics.filters.tiled_executor import pointwise
+
+IDENTITY = np.repeat(np.arange(256, dtype=np.uint8)[:, None], 3, axis=1)
+
+
+class ColorSettings(NamedTuple):
+    """Factors and offsets as produced by the dialog's scale functions."""
+
+    brightness: float = 1.0
+    saturation: float = 1.0
+    contrast: float = 1.0
+    red: float = 0.0
+    green: float = 0.0
+    blue: float = 0.0
+
+
+class ColorPipeline:
+    """The color adjustment sliders compiled into per-channel 256-entry LUTs.
+
+    Brightness, contrast and the channel offsets are per channel and end
+    up in one table, so without saturation the whole adjustment is a
+    single cv2.LUT pass. Saturation is a table on the HSV planes in
+    between: LUT, HSV, LUT, BGR, LUT. Same results as the enhancers chain.
+    """
+
+    def __init__(
+        self,
+        lut: np.ndarray | None,
+        hsv_lut: np.ndarray | None = None,
+        post_lut: np.ndarray | None = None,
+    ):
+        self.lut = lut  # (256, 1, 3) uint8 tables, None where nothing changes
+        self.hsv_lut = hsv_lut
+        self.post_lut = post_lut
+
+    @classmethod
+    def compile(cls, settings: ColorSettings = ColorSettings()) -> "ColorPipeline":
+        """The settings applied in the order of the enhancers chain."""
+        brightness, saturation, contrast, red, green, blue = settings
+        # the tables come from the same operations, rounding included
+        levels = np.arange(256, dtype=np.uint8).reshape(256, 1)
+        bright = cv2.convertScaleAbs(levels, alpha=brightness)
+        contrasted = cv2.convertScaleAbs(levels, alpha=contrast)
+        post = np.hstack(
+            [
+                np.clip(contrasted + offset * 255, 0, 255)
+                for offset in (blue, green, red)
+            ]
+        )
+        bright = np.repeat(bright, 3, axis=1)
+
+        if saturation == 1:
+            fused = np.take_along_axis(post, bright.astype(np.intp), axis=0)
+            return cls(_as_lut(fused))
+
+        hsv = np.repeat(levels, 3, axis=1).astype(np.float64)
+        hsv[:, 1] = np.clip(levels[:, 0] * saturation, 0, 255)
+        return cls(_as_lut(bright), _as_lut(hsv), _as_lut(post))
+
+    @pointwise
+    def apply(self, image: np.ndarray) -> np.ndarray:
+        """Returns the adjusted image, the input stays untouched."""
+        result = image if self.lut is None else cv2.LUT(image, self.lut)
+        if self.hsv_lut is not None:
+            hsv = cv2.cvtColor(result, cv2.COLOR_BGR2HSV)
+            cv2.LUT(hsv, self.hsv_lut, dst=hsv)
+            result = cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
+        if self.post_lut is not None:
+            result = cv2.LUT(result, self.post_lut)
+        return result
+
+
+def _as_lut(table: np.ndarray) -> np.ndarray | None:
+    """(256, 3) table -> cv2 LUT, None if it changes nothing"""
+    table = table.astype(np.uint8)  # truncates like assigning to the image
+    if np.array_equal(table, IDENTITY):
+        return None
+    return table.reshape(256, 1, 3)
@@ -2,7 +2,10 @@
 import cv2
 import numpy as np
 
+from creatumlibre.graphics.filters.tiled_executor import pointwise
 
+
+@pointwise
 def adjust_brightness(image, factor):
     """Adjust brightness of the image."""
     image = cv2.convertScaleAbs(
@@ -11,6 +14,7 @@ def adjust_brightness(image, factor):
     return image
 
 
+@pointwise
 def adjust_saturation(image, factor):
     """Adjust saturation of the image."""
     hsv = cv2.cvtColor(image, cv2.COLOR_BGR2HSV)
@@ -18,11 +22,13 @@ def adjust_saturation(image, factor):
     return cv2.cvtColor(hsv, cv2.COLOR_HSV2BGR)
 
 
+@pointwise
 def adjust_contrast(image, factor):
     """Adjust contrast of the image."""
     return cv2.convertScaleAbs(image, alpha=factor, beta=0)  # Adjust contrast
 
 
+@pointwise
 def adjust_rgb(image, value, channel):
     """Adjust RGB channels of the image."""
     if channel == "Red":
@@ -0,0 +1,95 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from creatumlibre.graphics.io.image_store import get_default_store
+
+MIN_BAND_ROWS = 64  # smaller bands cost more in overhead than they save
+BANDS_PER_WORKER = 2  # a little slack for bands that finish late
+MAX_BAND_BYTES = 64 * 1024 * 1024  # images on disk stream through in bands
+
+
+def pointwise(function):
+    """Declares a filter whose output pixel only depends on the same input pixel."""
+    function.halo = 0
+    return function
+
+
+def needs_halo(rows: int):
+    """Declares a filter reading up to 'rows' neighbouring rows (kernel radius)."""
+
+    def declare(function):
+        function.halo = rows
+        return function
+
+    return declare
+
+
+class TiledExecutor:
+    """Runs filters on horizontal bands of an image in parallel.
+
+    OpenCV and NumPy release the GIL inside their kernels, so plain
+    threads scale with the cores. Filters declare their footprint with
+    @pointwise or @needs_halo(rows), undeclared filters run in one piece.
+    A filter takes the band (plus arguments) and returns the filtered band,
+    which may be the band itself when it works in place: every filter gets
+    its own copy of the pixels, the input is never written and may be
+    read-only.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._pool: ThreadPoolExecutor | None = None
+
+    def bands(self, height: int, row_bytes: int = 0) -> list[tuple[int, int]]:
+        """row ranges (y0, y1) covering 'height' rows of 'row_bytes' each"""
+        count = 1
+        if self.max_workers > 1:
+            count = min(self.max_workers * BANDS_PER_WORKER, height // MIN_BAND_ROWS)
+        count = min(max(count, -(-height * row_bytes // MAX_BAND_BYTES), 1), height)
+        edges = np.linspace(0, height, count + 1).astype(int)
+        return list(zip(edges[:-1].tolist(), edges[1:].tolist()))
+
+    def run(self, function, image: np.ndarray, *args) -> np.ndarray:
+        """Returns function(image, *args), computed band by band."""
+        halo = getattr(function, "halo", None)
+        bands = self.bands(image.shape[0], image[:1].nbytes)
+        if halo is None or len(bands) == 1:
+            return function(get_default_store().copy(image), *args)
+
+        result = get_default_store().empty_like(image)
+        height = image.shape[0]
+
+        def run_band(band):
+            y0, y1 = band
+            top, bottom = max(y0 - halo, 0), min(y1 + halo, height)
+            filtered = function(image[top:bottom].copy(), *args)
+            result[y0:y1] = filtered[y0 - top : y1 - top]
+
+        if self.max_workers == 1:
+            for band in bands:
+                run_band(band)
+            return result
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(self.max_workers)
+        for future in [self._pool.submit(run_band, band) for band in bands]:
+            future.result()  # re-raises errors of the filter
+        return result
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+_default_executor: TiledExecutor | None = None
+
+
+def get_default_executor() -> TiledExecutor:
+    """shared executor with one worker per core"""
+    global _default_executor  # pylint: disable=global-statement
+    if _default_executor is None:
+        _default_executor = TiledExecutor()
+    return _default_executor
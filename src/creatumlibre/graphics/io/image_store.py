@@ -0,0 +1,141 @@
+# pylint: disable=no-member
+import hashlib
+import os
+import tempfile
+import threading
+
+import cv2
+import numpy as np
+
+DISK_THRESHOLD = 256 * 1024 * 1024  # decoded bytes from which images live on disk
+CACHE_LIMIT = 20 * 1024 * 1024 * 1024  # bytes of decoded files kept around
+CACHE_DIR = os.path.join(tempfile.gettempdir(), "creatumlibre-cache")
+REDUCED_FLAGS = {
+    1: cv2.IMREAD_REDUCED_COLOR_2,
+    2: cv2.IMREAD_REDUCED_COLOR_4,
+    3: cv2.IMREAD_REDUCED_COLOR_8,
+}
+SCALED_DECODE = (".jpg", ".jpeg")  # decoders that skip detail when reducing
+
+
+class ImageStore:
+    """Keeps images larger than 'threshold' bytes in memory-mapped files.
+
+    A file is decoded once into an uncompressed .npy cache file, opening
+    it again only maps that file. Pages are read when a tile touches them
+    and the OS drops cold ones, so documents may exceed physical memory.
+    The mapping is copy-on-write: edits never reach the cache file.
+    Large scratch arrays (filter results, copies, pyramid levels) are
+    mapped on unlinked temporary files the OS may write back under
+    pressure. Everything below the threshold stays plain numpy. Without
+    'keep_cache' decoded files are not written back, nothing outlives the
+    process (one-off jobs that never open a file twice).
+    """
+
+    def __init__(
+        self,
+        cache_dir: str = CACHE_DIR,
+        threshold: int | None = DISK_THRESHOLD,
+        cache_limit: int = CACHE_LIMIT,
+        keep_cache: bool = True,
+    ):
+        self.cache_dir = cache_dir
+        self.threshold = threshold  # None: always in memory
+        self.cache_limit = cache_limit
+        self.keep_cache = keep_cache  # False: decoded files stay in memory
+
+    def load(self, file_path: str) -> np.ndarray | None:
+        """cv2.imread, large images come back mapped from the cache file"""
+        cache_path = self._cache_path(file_path)
+        if cache_path is not None and os.path.exists(cache_path):
+            os.utime(cache_path)  # recently used, pruned last
+            return np.load(cache_path, mmap_mode="c")
+
+        image = cv2.imread(file_path)
+        if image is None or not self.is_large(image.nbytes) or cache_path is None:
+            return image
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        partial = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.part"
+        mapped = np.lib.format.open_memmap(
+            partial, mode="w+", dtype=image.dtype, shape=image.shape
+        )
+        mapped[:] = image
+        mapped.flush()
+        del mapped, image  # the decoded copy goes, the pages stay on disk
+        os.replace(partial, cache_path)  # complete files only
+        self._prune(keep=cache_path)
+        return np.load(cache_path, mmap_mode="c")
+
+    def load_reduced(self, file_path: str, level: int) -> np.ndarray | None:
+        """Quick decode at 1 / 2**level of the size (level 1 to 3). Only JPEG
+        gets faster this way (scaled DCT), None for everything else.
+        """
+        if level not in REDUCED_FLAGS:
+            return None
+        if not file_path.lower().endswith(SCALED_DECODE):
+            return None
+        return cv2.imread(file_path, REDUCED_FLAGS[level])
+
+    def is_large(self, nbytes: int) -> bool:
+        return self.threshold is not None and nbytes >= self.threshold
+
+    def empty(self, shape: tuple, dtype) -> np.ndarray:
+        """np.empty, mapped on a temporary file when large"""
+        nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+        if not self.is_large(nbytes):
+            return np.empty(shape, dtype=dtype)
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with tempfile.TemporaryFile(dir=self.cache_dir) as file:
+            # the mapping keeps its own handle, the file is gone once unmapped
+            return np.memmap(file, dtype=dtype, mode="w+", shape=shape)
+
+    def empty_like(self, image: np.ndarray) -> np.ndarray:
+        return self.empty(image.shape, image.dtype)
+
+    def copy(self, image: np.ndarray) -> np.ndarray:
+        """image.copy(), mapped on a temporary file when large"""
+        if not self.is_large(image.nbytes):
+            return image.copy()
+        result = self.empty_like(image)
+        result[:] = image
+        return result
+
+    def _cache_path(self, file_path: str) -> str | None:
+        """one cache file per path, size and modification time"""
+        if not self.keep_cache:
+            return None
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(file_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        name = hashlib.sha1(key.encode()).hexdigest()[:24]
+        return os.path.join(self.cache_dir, f"{name}.npy")
+
+    def _prune(self, keep: str):
+        """deletes the least recently used cache files above the limit"""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".npy") and entry.path != keep:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = os.path.getsize(keep) + sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.cache_limit:
+                break
+            os.remove(path)  # open mappings keep their pages
+            total -= size
+
+
+_default_store: ImageStore | None = None
+
+
+def get_default_store() -> ImageStore:
+    """shared store in the temp directory"""
+    global _default_store  # pylint: disable=global-statement
+    if _default_store is None:
+        _default_store = ImageStore()
+    return _default_store
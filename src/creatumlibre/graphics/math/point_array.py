@@ -0,0 +1,73 @@
+from typing import Iterable
+
+import numpy as np
+
+from creatumlibre.graphics.math.vector2d import Vector2D
+
+
+class PointArray:
+    """Many points (x, y) in one (n, 2) int32 array instead of n Vector2D.
+
+    Appending grows the buffer by doubling, so building a point cloud point
+    by point stays O(1) per point. Moving, bounds and conversion to OpenCV
+    or Qt are whole-array operations. Indexing and iterating hand out
+    Vector2D, slicing a PointArray, so code written for a list of Vector2D
+    keeps working.
+    """
+
+    __slots__ = ("_data", "_count")
+
+    def __init__(self, points: Iterable = (), capacity: int = 16):
+        if not isinstance(points, (np.ndarray, PointArray)):
+            points = list(points)  # Vector2D are tuples, numpy takes them as rows
+        points = np.asarray(points, dtype=np.int32).reshape(-1, 2)
+        self._count = len(points)
+        self._data = np.empty((max(capacity, self._count), 2), dtype=np.int32)
+        self._data[: self._count] = points
+
+    def append(self, point: Vector2D | tuple[int, int]):
+        if self._count == len(self._data):
+            grown = np.empty((2 * len(self._data) or 16, 2), dtype=np.int32)
+            grown[: self._count] = self._data[: self._count]
+            self._data = grown
+        self._data[self._count] = point
+        self._count += 1
+
+    def clear(self):
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int | slice) -> "Vector2D | PointArray":
+        if isinstance(index, slice):
+            return PointArray(self.to_array()[index])
+        x, y = self.to_array()[index].tolist()
+        return Vector2D(x, y)
+
+    def __iter__(self):
+        for x, y in self.to_array().tolist():
+            yield Vector2D(x, y)
+
+    def __array__(self, dtype=None, copy=None):  # pylint: disable=unused-argument
+        points = self.to_array()
+        return points if dtype is None else points.astype(dtype)
+
+    def to_array(self) -> np.ndarray:
+        """read-only (n, 2) int32 view of the points"""
+        points = self._data[: self._count]
+        points.flags.writeable = False
+        return points
+
+    def translated(self, delta: Vector2D | tuple[int, int]) -> "PointArray":
+        """all points moved by delta, in one operation"""
+        return PointArray(self.to_array() + np.asarray(delta, dtype=np.int32))
+
+    def get_bounds(self) -> tuple[int, int, int, int] | None:
+        """(min x, min y, max x, max y), inclusive. None without points."""
+        if not self._count:
+            return None
+        points = self.to_array()
+        x0, y0 = points.min(axis=0).tolist()
+        x1, y1 = points.max(axis=0).tolist()
+        return x0, y0, x1, y1
@@ -1,19 +1,23 @@
 import math
+from typing import NamedTuple
 
 
-class Vector2D:
-    """2D vector class with basic operations."""
+class Vector2D(NamedTuple):
+    """Immutable 2D vector with basic operations.
 
-    def __init__(self, x: int, y: int | None = None):
-        self.x = x
-        self.y = y
+    A tuple underneath: no per-instance dict, hashable, and it unpacks
+    as x, y. Still never equal to a plain tuple.
+    """
+
+    x: int
+    y: int | None = None
 
     @classmethod
     def from_tuple(cls, vector: tuple[int, int]) -> "Vector2D":
         return cls(vector[0], vector[1])
 
     def copy(self) -> "Vector2D":
-        return Vector2D(self.x, self.y)
+        return self  # immutable, nothing to copy
 
     def to_tuple(self) -> tuple[int, int]:
         return (self.x, self.y)
@@ -26,9 +30,16 @@ class Vector2D:
 
     def __eq__(self, other: object) -> bool:
         if not isinstance(other, Vector2D):
-            return NotImplemented
+            # False rather than NotImplemented, tuple would compare items
+            return False if isinstance(other, tuple) else NotImplemented
         return self.x == other.x and self.y == other.y
 
+    def __ne__(self, other: object) -> bool:
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    __hash__ = tuple.__hash__
+
     def __abs__(self) -> float:
         return self.length()
 
@@ -0,0 +1,70 @@
+import numpy as np
+
+from creatumlibre.graphics.io.image_store import get_default_store
+
+
+class _SharedArray:  # pylint: disable=too-few-public-methods
+    """The pixels plus the number of buffers looking at them."""
+
+    __slots__ = ("array", "owners")
+
+    def __init__(self, array: np.ndarray, owners: int = 0):
+        self.array = array
+        self.owners = owners
+
+
+class CowBuffer:
+    """Copy-on-write array: copies share the pixels until one of them writes.
+
+    read() returns the pixels, read-only while they are shared, and
+    write() detaches the buffer (one real copy) before handing out a
+    writable array.
+    """
+
+    __slots__ = ("_shared", "_read_view")
+
+    def __init__(self, array: "np.ndarray | _SharedArray"):
+        """'array' are the pixels, or the source of a buffer to share with"""
+        if not isinstance(array, _SharedArray):
+            array = _SharedArray(array)
+        array.owners += 1
+        self._shared = array
+        self._read_view: np.ndarray | None = None
+
+    def __del__(self):
+        self._shared.owners -= 1
+
+    def share(self) -> "CowBuffer":
+        """O(1) copy, the pixels are copied once either side writes"""
+        return CowBuffer(self._shared)
+
+    @property
+    def source(self) -> _SharedArray:
+        """the pixels with their owner count, one object for all sharing buffers"""
+        return self._shared
+
+    def is_shared(self) -> bool:
+        return self._shared.owners > 1
+
+    def shares_with(self, other: "CowBuffer") -> bool:
+        """whether both still look at the same pixels, nobody wrote since"""
+        return self._shared is other.source
+
+    def read(self) -> np.ndarray:
+        """the pixels, read-only as long as they are shared"""
+        if not self.is_shared():
+            return self._shared.array
+        if self._read_view is None or self._read_view.base is not self._shared.array:
+            self._read_view = self._shared.array.view()
+            self._read_view.flags.writeable = False
+        return self._read_view
+
+    def write(self) -> np.ndarray:
+        """the pixels for writing in place, detached from all other copies"""
+        if self.is_shared():
+            self._shared.owners -= 1
+            self._shared = _SharedArray(
+                get_default_store().copy(self._shared.array), owners=1
+            )
+            self._read_view = None
+        return self._shared.array
@@ -0,0 +1,128 @@
+import os
+import tempfile
+import zlib
+
+import numpy as np
+
+TILE_SIZE = 256  # same grid as the compositor
+COMPRESSION_LEVEL = 1  # fast, pixel tiles of edits compress well anyway
+
+
+class TileDelta:
+    """The tiles in which two versions of an image differ, holding the
+    pixels of the other version. swap() exchanges them with an image, so
+    the same delta turns 'after' into 'before' and back again.
+
+    The tiles are kept as arrays, zlib compressed bytes or in a file.
+    Only the first two count as memory (nbytes).
+    """
+
+    __slots__ = ("slices", "whole", "dtype", "channels", "_tiles", "_packed", "_path")
+
+    def __init__(self, slices: list[tuple[int, int, int, int]], tiles, whole=False):
+        self.slices = slices  # (y0, y1, x0, x1) of every stored tile
+        self.whole = whole  # the size changed, the single tile is the image
+        self.dtype = tiles[0].dtype
+        self.channels = tiles[0].shape[2:]
+        self._tiles: list[np.ndarray] | None = tiles
+        self._packed: bytes | None = None
+        self._path: str | None = None
+
+    @classmethod
+    def between(
+        cls, before: np.ndarray, after: np.ndarray, tile_size: int = TILE_SIZE
+    ) -> "TileDelta | None":
+        """Tiles of 'before' that differ in 'after'. None if nothing changed."""
+        if before is after:
+            return None
+        if before.shape != after.shape or before.dtype != after.dtype:
+            height, width = before.shape[:2]
+            return cls([(0, height, 0, width)], [before.copy()], whole=True)
+
+        height, width = before.shape[:2]
+        slices, tiles = [], []
+        for y0 in range(0, height, tile_size):
+            y1 = min(y0 + tile_size, height)
+            for x0 in range(0, width, tile_size):
+                x1 = min(x0 + tile_size, width)
+                tile = before[y0:y1, x0:x1]
+                if not np.array_equal(tile, after[y0:y1, x0:x1]):
+                    slices.append((y0, y1, x0, x1))
+                    tiles.append(tile.copy())
+        return cls(slices, tiles) if tiles else None
+
+    @property
+    def nbytes(self) -> int:
+        """memory held, files on disk are not counted"""
+        if self._tiles is not None:
+            return sum(tile.nbytes for tile in self._tiles)
+        return 0 if self._packed is None else len(self._packed)
+
+    def is_compressed(self) -> bool:
+        return self._tiles is None
+
+    def swap(self, image: np.ndarray) -> np.ndarray:
+        """Puts the stored tiles into 'image' (in place) and keeps the ones
+        they replace. Returns the image, a different array if the size changed.
+        """
+        tiles = self._load()
+        if self.whole:
+            self._tiles = [image]
+            height, width = image.shape[:2]
+            self.slices = [(0, height, 0, width)]
+            return tiles[0]
+
+        replaced = []
+        for (y0, y1, x0, x1), tile in zip(self.slices, tiles):
+            replaced.append(image[y0:y1, x0:x1].copy())
+            image[y0:y1, x0:x1] = tile
+        self._tiles = replaced
+        return image
+
+    def compress(self):
+        """tiles -> zlib bytes, about a third of the memory for photos"""
+        if self._tiles is not None:
+            self._packed = zlib.compress(
+                b"".join(tile.tobytes() for tile in self._tiles), COMPRESSION_LEVEL
+            )
+            self._tiles = None
+
+    def spill(self, directory: str):
+        """moves the compressed tiles to a file in 'directory'"""
+        self.compress()
+        if self._path is None:
+            handle, self._path = tempfile.mkstemp(suffix=".undo", dir=directory)
+            with os.fdopen(handle, "wb") as file:
+                file.write(self._packed)
+            self._packed = None
+
+    def discard(self):
+        """drops the tiles, deletes the spill file"""
+        if self._path is not None:
+            os.remove(self._path)
+            self._path = None
+        self._tiles = None
+        self._packed = None
+
+    def _load(self) -> list[np.ndarray]:
+        if self._tiles is not None:
+            return self._tiles
+
+        if self._path is not None:
+            with open(self._path, "rb") as file:
+                self._packed = file.read()
+            os.remove(self._path)
+            self._path = None
+
+        data = zlib.decompress(self._packed)
+        self._packed = None
+        tiles, start = [], 0
+        for y0, y1, x0, x1 in self.slices:
+            shape = (y1 - y0, x1 - x0) + self.channels
+            count = int(np.prod(shape))
+            tiles.append(np.frombuffer(data, self.dtype, count, start).reshape(shape))
+            start += count * self.dtype.itemsize
+        if self.whole:
+            tiles[0] = tiles[0].copy()  # becomes the image, must be writable
+        self._tiles = tiles
+        return tiles
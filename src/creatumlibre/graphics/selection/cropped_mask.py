@@ -0,0 +1,109 @@
+# pylint: disable=no-member
+import cv2
+import numpy as np
+
+BLOCK_SHIFT = 4  # occupancy blocks of 16 x 16 pixels
+EMPTY, MIXED, FULL = 0, 1, 2  # occupancy of a block
+
+
+class CroppedMask:
+    """uint8 alpha of a layer (0: transparent, 255: opaque), stored only
+    inside its non-zero bounding box. Everything outside is transparent.
+
+    Masks are immutable: a changed selection gets a new CroppedMask, so
+    copies of a layer share it. Caches detect a new mask by
+    RegionManager.mask_revision, not by the mask object.
+    Fully opaque layers have no mask at all (None).
+    """
+
+    __slots__ = ("alpha", "offset", "size", "_occupancy")
+
+    def __init__(
+        self, alpha: np.ndarray, offset: tuple[int, int], size: tuple[int, int]
+    ):
+        alpha.flags.writeable = False
+        self.alpha = alpha
+        self.offset = offset  # (x, y) of the alpha inside the layer
+        self.size = size  # (width, height) of the layer
+        self._occupancy: np.ndarray | None = None
+
+    @classmethod
+    def from_array(cls, mask: np.ndarray) -> "CroppedMask | None":
+        """Compacts a full size mask, float 0..1 or uint8. None when opaque."""
+        alpha = mask if mask.dtype == np.uint8 else cv2.convertScaleAbs(mask, alpha=255)
+        size = (alpha.shape[1], alpha.shape[0])
+        if alpha.size and cv2.minMaxLoc(alpha)[0] == 255:
+            return None
+
+        x, y, w, h = cv2.boundingRect(alpha)  # of the non-zero pixels
+        return cls(alpha[y : y + h, x : x + w].copy(), (x, y), size)
+
+    def to_array(self) -> np.ndarray:
+        """the full size uint8 alpha"""
+        width, height = self.size
+        x, y = self.offset
+        h, w = self.alpha.shape
+        full = np.zeros((height, width), dtype=np.uint8)
+        full[y : y + h, x : x + w] = self.alpha
+        return full
+
+    def downsampled(self) -> "CroppedMask":
+        """the mask of the next pyramid level, half the size like the layer"""
+        width, height = self.size
+        size = (max(1, (width + 1) // 2), max(1, (height + 1) // 2))
+        x, y = self.offset
+        h, w = self.alpha.shape
+        if w == 0 or h == 0:
+            return CroppedMask(self.alpha, (0, 0), size)
+
+        # grow to even coordinates, so 2x2 blocks match those of the image
+        x0, y0 = x & ~1, y & ~1
+        x1, y1 = min((x + w + 1) & ~1, width), min((y + h + 1) & ~1, height)
+        padded = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        padded[y - y0 : y - y0 + h, x - x0 : x - x0 + w] = self.alpha
+        half = cv2.resize(
+            padded,
+            ((x1 - x0 + 1) // 2, (y1 - y0 + 1) // 2),
+            interpolation=cv2.INTER_AREA,
+        )
+        return CroppedMask(half, (x0 // 2, y0 // 2), size)
+
+    def contains(self, x: int, y: int) -> bool:
+        """Whether layer pixel (x, y) is visible (alpha > 0). Outside the
+        box and in empty or full blocks no alpha pixel is read at all.
+        """
+        x -= self.offset[0]
+        y -= self.offset[1]
+        h, w = self.alpha.shape
+        if not (0 <= x < w and 0 <= y < h):
+            return False
+
+        state = self.get_occupancy()[y >> BLOCK_SHIFT, x >> BLOCK_SHIFT]
+        if state != MIXED:
+            return state == FULL
+        return bool(self.alpha[y, x])
+
+    def get_occupancy(self) -> np.ndarray:
+        """EMPTY, MIXED or FULL per 16 x 16 block of the alpha, built once"""
+        if self._occupancy is None:
+            h, w = self.alpha.shape
+            block = 1 << BLOCK_SHIFT
+            rows, cols = -(-h // block), -(-w // block)
+
+            # pad with copies of the edge, they do not change min or max
+            padded = np.pad(
+                self.alpha,
+                pad_width=((0, rows * block - h), (0, cols * block - w)),
+                mode="edge",
+            ).reshape((rows, block, cols, block))
+            occupancy = np.full((rows, cols), MIXED, dtype=np.uint8)
+            occupancy[padded.max(axis=(1, 3)) == 0] = EMPTY
+            occupancy[padded.min(axis=(1, 3)) > 0] = FULL
+            self._occupancy = occupancy
+        return self._occupancy
+
+    def get_bounds(self) -> tuple[int, int, int, int]:
+        """(x0, y0, x1, y1) of the visible pixels inside the layer"""
+        x, y = self.offset
+        h, w = self.alpha.shape
+        return x, y, x + w, y + h
@@ -0,0 +1,16 @@
+# pylint: disable=no-member
+import cv2
+import numpy as np
+
+
+def rasterize_polygon(
+    points: np.ndarray, bounds: tuple[int, int, int, int]
+) -> np.ndarray:
+    """Anti-aliased uint8 alpha of the closed polygon (N x 2 int points),
+    computed only inside bounds (x0, y0, x1, y1) of the same coordinates.
+    """
+    x0, y0, x1, y1 = bounds
+    alpha = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+    shifted = (points - (x0, y0)).astype(np.int32)
+    cv2.fillPoly(alpha, [shifted], 255, lineType=cv2.LINE_AA)
+    return alpha
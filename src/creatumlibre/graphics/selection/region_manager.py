@@ -1,26 +1,47 @@
+from itertools import count
+
 import numpy as np
 
+from creatumlibre.graphics.math.point_array import PointArray
 from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.graphics.selection.cropped_mask import CroppedMask
+
+_mask_revisions = count(1)  # never reused, unlike id() of a freed mask
 
 
 class RegionManager:
     """Handles selection modifications, mask updates, and dynamic resizing."""
 
     def __init__(self):
-        self.mask = None  # Stores selection mask (0-255)
+        self._mask: CroppedMask | None = None  # None: fully opaque
+        self.mask_revision = 0  # changes with every new mask, read by caches
         self.bounding_rect = None  # Stores current selection bounds
-        self.point_list: list[Vector2D] = []  # stores the point cloud selection
+        self.point_list = PointArray()  # stores the point cloud selection
+
+    @property
+    def mask(self) -> CroppedMask | None:
+        """Stores selection mask, immutable and shared with copies"""
+        return self._mask
+
+    @mask.setter
+    def mask(self, mask: CroppedMask | np.ndarray | None):
+        """full size arrays (float 0..1 or uint8) are compacted"""
+        if isinstance(mask, np.ndarray):
+            mask = CroppedMask.from_array(mask)
+        self._mask = mask
+        self.mask_revision = next(_mask_revisions)
 
     def copy(self):
         new = RegionManager()
-        new.mask = self.mask.copy()
+        new.mask = self.mask  # shared, masks are never changed in place
+        new.mask_revision = self.mask_revision
         new.bounding_rect = self.bounding_rect
         return new
 
-    def set_mask_points(self, point_list: list[Vector2D] = None):
-        self.point_list = point_list
+    def set_mask_points(self, point_list: PointArray | list[Vector2D] = ()):
+        self.point_list = PointArray(point_list)
 
-    def get_mask_points(self) -> list[Vector2D]:
+    def get_mask_points(self) -> PointArray:
         return self.point_list
 
     def set_bounding_rect(self, x: int, y: int, width: int, height: int):
@@ -32,18 +53,17 @@ class RegionManager:
     def get_mask(self):
         return self.mask
 
-    def initialize_mask(self, image_shape):
-        """Creates an empty mask matching the image dimensions.
-        0: transparent, 1: opaque (visible)
-        """
-        self.mask = np.ones((image_shape[0], image_shape[1]), dtype=np.float32)
+    def initialize_mask(self, image_shape):  # pylint: disable=unused-argument
+        """Resets the mask of an image with the given shape to fully opaque."""
+        self.mask = None
 
     def update_mask(self, selection):
         """Updates the mask based on selection coordinates."""
         x, y, width, height = selection.get_rect()
-        self.mask[y : y + height, x : x + width] = (
-            1  # Mark selection area as fully opaque
-        )
+        if self._mask is not None:
+            mask = self._mask.to_array()
+            mask[y : y + height, x : x + width] = 255  # Mark selection area as opaque
+            self.mask = mask
 
         # Update bounding rect
         self.bounding_rect = (x, y, width, height)
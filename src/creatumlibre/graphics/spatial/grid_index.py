@@ -0,0 +1,77 @@
+CELL_SIZE = 256  # scene pixels per grid cell
+
+
+class GridIndex:
+    """Uniform grid over bounding boxes (x0, y0, x1, y1, right/bottom exclusive).
+
+    Every cell lists the keys of the boxes touching it, so point and
+    rectangle queries only look at the boxes in the cells they cover
+    instead of all of them. Keys can be any hashable object.
+    """
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], set] = {}
+        self._bounds: dict = {}  # key -> bounds
+
+    def __len__(self):
+        return len(self._bounds)
+
+    def __contains__(self, key):
+        return key in self._bounds
+
+    def insert(self, key, bounds: tuple[int, int, int, int]):
+        self.remove(key)
+        self._bounds[key] = bounds
+        for cell in self._cells_of(bounds):
+            self._cells.setdefault(cell, set()).add(key)
+
+    def update(self, key, bounds: tuple[int, int, int, int]):
+        """moves or resizes a box, cheap if nothing changed"""
+        if self._bounds.get(key) != bounds:
+            self.insert(key, bounds)
+
+    def remove(self, key):
+        if (bounds := self._bounds.pop(key, None)) is None:
+            return
+        for cell in self._cells_of(bounds):
+            keys = self._cells[cell]
+            keys.discard(key)
+            if not keys:
+                del self._cells[cell]
+
+    def get_bounds(self, key) -> tuple[int, int, int, int] | None:
+        return self._bounds.get(key)
+
+    def query_point(self, x: int, y: int) -> list:
+        """keys of all boxes containing the point"""
+        cell = (x // self.cell_size, y // self.cell_size)
+        return [
+            key
+            for key in self._cells.get(cell, ())
+            if (b := self._bounds[key])[0] <= x < b[2] and b[1] <= y < b[3]
+        ]
+
+    def query_rect(self, rect: tuple[int, int, int, int]) -> list:
+        """keys of all boxes overlapping the rectangle"""
+        x0, y0, x1, y1 = rect
+        found = set()
+        for cell in self._cells_of(rect):
+            found.update(self._cells.get(cell, ()))
+        return [
+            key
+            for key in found
+            if (b := self._bounds[key])[0] < x1
+            and x0 < b[2]
+            and b[1] < y1
+            and y0 < b[3]
+        ]
+
+    def _cells_of(self, bounds: tuple[int, int, int, int]):
+        x0, y0, x1, y1 = bounds
+        if x0 >= x1 or y0 >= y1:
+            return
+        size = self.cell_size
+        for cy in range(y0 // size, (y1 - 1) // size + 1):
+            for cx in range(x0 // size, (x1 - 1) // size + 1):
+                yield cx, cy
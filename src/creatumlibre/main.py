@@ -1,11 +1,20 @@
 import sys
 
-from PyQt6.QtWidgets import QApplication
 
-from creatumlibre.ui.root_ui import RootUi  # pylint: disable = no-name-in-module
+def main(argv: list[str] | None = None):
+    """'creatumlibre' starts the editor, 'creatumlibre batch ...' runs without Qt"""
+    # pylint: disable=import-outside-toplevel
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "batch":
+        from creatumlibre.core.batch import main as batch_main
 
+        sys.exit(batch_main(argv[1:]))
+
+    # Qt is imported only for the editor, batch jobs run on machines without it
+    from PyQt6.QtWidgets import QApplication
+
+    from creatumlibre.ui.root_ui import RootUi  # pylint: disable = no-name-in-module
 
-def main():
     app = QApplication(sys.argv)
     window = RootUi()
     window.show()
@@ -0,0 +1,28 @@
+from PyQt6.QtCore import QTimer
+
+FRAME_INTERVAL_MS = 16  # about 60 frames per second
+
+
+class FrameScheduler:
+    """Renders at most once per frame, however often it is asked to.
+
+    Input handlers update their state per event and call request(); the
+    first request starts a single shot timer, further ones until it fires
+    are free. 'render' then sees only the latest state, so a 1000 Hz mouse
+    costs as many renders as a 60 Hz one.
+    """
+
+    def __init__(self, render, interval_ms: int = FRAME_INTERVAL_MS):
+        self.render = render
+        self.timer = QTimer()
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.render)
+
+    def request(self):
+        """a render within the next frame"""
+        if not self.timer.isActive():
+            self.timer.start()
+
+    def cancel(self):
+        self.timer.stop()
@@ -0,0 +1,155 @@
+# pylint: disable=no-member
+import math
+
+from PyQt6.QtCore import QPoint, QRect, QRectF, Qt
+from PyQt6.QtGui import QPainter
+from PyQt6.QtWidgets import QAbstractScrollArea
+
+from creatumlibre.ui.canvas.marquee_preview import MarqueePreview
+from creatumlibre.ui.canvas.overlay_painter import OverlayPainter
+from creatumlibre.ui.canvas.polygon_preview import PolygonPreview
+from creatumlibre.ui.canvas.qimage_buffer import wrap_bgr
+from creatumlibre.ui.manager.object_manager import ObjectManager
+
+
+class ImageCanvas(QAbstractScrollArea):
+    """Scrollable view that renders only the visible part of the composited image."""
+
+    def __init__(self, object_manager: ObjectManager, parent=None):
+        super().__init__(parent)
+        self.object_manager = object_manager
+        self.overlay_painter = OverlayPainter(self)
+        self.polygon_preview = PolygonPreview(self)  # point cloud being drawn
+        self.marquee_preview = MarqueePreview(self)  # region selection being dragged
+
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOn)
+        self.update_scroll_range()
+
+    def content_offset(self) -> tuple[int, int]:
+        """top left corner of the zoomed image in viewport coordinates"""
+        width, height = self.object_manager.get_display_size()
+        viewport = self.viewport()
+
+        if width < viewport.width():
+            x = (viewport.width() - width) // 2  # centered like an aligned QLabel
+        else:
+            x = -self.horizontalScrollBar().value()
+        if height < viewport.height():
+            y = (viewport.height() - height) // 2
+        else:
+            y = -self.verticalScrollBar().value()
+        return x, y
+
+    def map_to_image(self, global_pos: QPoint) -> tuple[int, int]:
+        """global screen position -> pixel in the original image"""
+        local_pos = self.viewport().mapFromGlobal(global_pos)
+        offset_x, offset_y = self.content_offset()
+        zoom = self.object_manager.zoom_factor
+        return (
+            math.floor((local_pos.x() - offset_x) / zoom),
+            math.floor((local_pos.y() - offset_y) / zoom),
+        )
+
+    def map_to_viewport(self, x0: int, y0: int, x1: int, y1: int) -> QRect:
+        """image rectangle -> covering rectangle in viewport coordinates"""
+        offset_x, offset_y = self.content_offset()
+        zoom = self.object_manager.zoom_factor
+        left, top = math.floor(x0 * zoom) + offset_x, math.floor(y0 * zoom) + offset_y
+        right, bottom = math.ceil(x1 * zoom) + offset_x, math.ceil(y1 * zoom) + offset_y
+        return QRect(left, top, right - left, bottom - top)
+
+    def map_from_viewport(self, rect: QRect) -> tuple[int, int, int, int]:
+        """viewport rectangle -> covering rectangle in image coordinates"""
+        offset_x, offset_y = self.content_offset()
+        zoom = self.object_manager.zoom_factor
+        return (
+            math.floor((rect.left() - offset_x) / zoom),
+            math.floor((rect.top() - offset_y) / zoom),
+            math.ceil((rect.right() + 1 - offset_x) / zoom),
+            math.ceil((rect.bottom() + 1 - offset_y) / zoom),
+        )
+
+    def refresh(self):
+        """repaints the areas that changed since the last frame"""
+        for rect in self.object_manager.update_display():
+            self.viewport().update(self.map_to_viewport(*rect))
+        self.viewport().update(self.overlay_painter.refresh())
+
+    def zoom_changed(self):
+        """the zoom factor was changed from outside, everything is new"""
+        self.update_scroll_range()
+        self.object_manager.update_display()
+        self.viewport().update()
+
+    def update_scroll_range(self):
+        width, height = self.object_manager.get_display_size()
+        viewport = self.viewport().size()
+
+        for scroll_bar, content, page in (
+            (self.horizontalScrollBar(), width, viewport.width()),
+            (self.verticalScrollBar(), height, viewport.height()),
+        ):
+            scroll_bar.setRange(0, max(0, content - page))
+            scroll_bar.setPageStep(page)
+            scroll_bar.setSingleStep(20)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_scroll_range()
+
+    def scrollContentsBy(self, dx, dy):
+        # keep what is on screen, only the uncovered strip is painted again
+        self.viewport().scroll(dx, dy)
+
+    def paintEvent(self, event):
+        if not self.object_manager.object_list:
+            return
+
+        profiler = self.object_manager.profiler
+        with profiler.stage("paint"):
+            painter = QPainter(self.viewport())
+            painter.setClipRect(event.rect())
+            self._paint_image(painter, event.rect())
+            with profiler.stage("overlays"):
+                # frames etc. on top, in screen space
+                self.overlay_painter.paint(painter)
+                self.polygon_preview.paint(painter)
+                self.marquee_preview.paint(painter)
+            painter.end()
+
+    def _paint_image(self, painter: QPainter, rect: QRect):
+        offset_x, offset_y = self.content_offset()
+        width, height = self.object_manager.get_display_size()
+        exposed = rect.intersected(QRect(offset_x, offset_y, width, height))
+        if exposed.isEmpty():
+            return
+
+        pixels, origin, level = self.object_manager.render_region(
+            *self.map_from_viewport(exposed)
+        )
+        if pixels.size:
+            self._blit(painter, exposed, pixels, origin, level)
+
+    def _blit(self, painter: QPainter, exposed: QRect, pixels, origin, level: int):
+        """draws canvas pixels of a pyramid level, top left at 'origin', zoomed"""
+        offset_x, offset_y = self.content_offset()
+        left, top = origin
+        pixel_h, pixel_w = pixels.shape[:2]
+        scale = self.object_manager.zoom_factor * (1 << level)  # per canvas pixel
+        target = QRectF(
+            offset_x + left * scale,
+            offset_y + top * scale,
+            pixel_w * scale,
+            pixel_h * scale,
+        )
+
+        # the compositor keeps its canvas between frames, Qt reads it in place
+        image = wrap_bgr(pixels)
+        with self.object_manager.profiler.stage("upload"):  # scaling and drawing by Qt
+            painter.save()
+            painter.setClipRect(exposed)
+            if scale < 1:
+                painter.setRenderHint(QPainter.RenderHint.SmoothPixmapTransform)
+            painter.drawImage(target, image)
+            painter.restore()
@@ -0,0 +1,49 @@
+from PyQt6.QtCore import QRect, Qt
+from PyQt6.QtGui import QPainter, QPen, QRegion
+
+from creatumlibre.ui.canvas.overlay_painter import PADDING, POINT_COLOR
+
+
+class MarqueePreview:
+    """The rectangle of a region selection while it is being dragged.
+
+    Only a frame in screen space: no pixels are copied and nothing is
+    composited, a move repaints the edges of the old and the new frame.
+    The pixels are cut out once when the drag ends.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.rect: tuple[int, int, int, int] | None = None  # x0, y0, x1, y1 in image
+
+    def set_rect(self, x: int, y: int, width: int, height: int):
+        region = self._frame_region()
+        self.rect = (x, y, x + width, y + height)
+        region += self._frame_region()
+        self.canvas.viewport().update(region)
+
+    def clear(self):
+        if self.rect is not None:
+            self.canvas.viewport().update(self._frame_region())
+        self.rect = None
+
+    def paint(self, painter: QPainter):
+        if self.rect is None:
+            return
+        painter.setPen(QPen(POINT_COLOR, 1, Qt.PenStyle.DashLine))
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRect(self._frame().adjusted(0, 0, -1, -1))
+
+    def _frame(self) -> QRect:
+        return self.canvas.map_to_viewport(*self.rect)
+
+    def _frame_region(self) -> QRegion:
+        """the four edges, the inside stays as it is"""
+        if self.rect is None:
+            return QRegion()
+        frame = self._frame()
+        region = QRegion(frame.adjusted(-PADDING, -PADDING, PADDING, PADDING))
+        inner = frame.adjusted(PADDING, PADDING, -PADDING, -PADDING)
+        if inner.isValid():
+            region -= QRegion(inner)
+        return region
@@ -0,0 +1,108 @@
+import numpy as np
+from PyQt6.QtCore import QPoint, Qt
+from PyQt6.QtGui import QColor, QPainter, QPen, QPolygon, QRegion
+
+from creatumlibre.ui.mode.ui_input_mode import TransformMode
+
+FRAME_COLORS = {
+    TransformMode.NONE: QColor(255, 255, 0),
+    TransformMode.SCALE: QColor(255, 0, 255),
+    TransformMode.MULTI_SCALE: QColor(0, 0, 255),
+}
+POINT_COLOR = QColor(255, 255, 0)
+POINT_RADIUS = 3  # screen pixels
+PADDING = POINT_RADIUS + 2  # around everything that gets repainted
+
+
+def collect_overlays(object_list) -> list[tuple]:
+    """(transform mode, (x0, y0, x1, y1), point cloud) of every decorated object,
+    in image coordinates
+    """
+    overlays = []
+    for image_object in object_list[1:]:
+        modes = []
+        if image_object.is_promoted:
+            modes.append(TransformMode.NONE)
+        if image_object.is_selected:
+            modes.append(TransformMode.SCALE)
+        if not modes:
+            continue
+
+        x, y = image_object.get_position().to_tuple()
+        h, w = image_object.get_image().shape[:2]
+        # the PointArray itself, unchanged clouds compare equal by identity
+        points = image_object.region_manager.get_mask_points()
+        for mode in modes:
+            overlays.append(
+                (
+                    mode,
+                    (x, y, x + w, y + h),
+                    points if points and mode == TransformMode.NONE else (),
+                )
+            )
+    return overlays
+
+
+class OverlayPainter:
+    """Draws selection frames and point clouds in screen space at paint time.
+    Pixel data is never copied or touched for UI decoration and the lines
+    keep their width at any zoom.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.invalidated: list[tuple] = []  # as of the last refresh, its baseline
+        self.painted: list[tuple] = []  # as drawn by the last paint
+
+    def refresh(self) -> QRegion:
+        """Returns the viewport region to repaint because overlays changed."""
+        overlays = collect_overlays(self.canvas.object_manager.object_list)
+        region = QRegion()
+        if overlays != self.invalidated:
+            for overlay in self.invalidated + overlays:
+                region += self._overlay_region(overlay)
+            self.invalidated = overlays
+        return region
+
+    def paint(self, painter: QPainter):
+        # refresh() alone moves the baseline, or an overlay changed since
+        # then would never get its old place invalidated
+        self.painted = collect_overlays(self.canvas.object_manager.object_list)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+
+        for mode, rect, points in self.painted:
+            frame = self.canvas.map_to_viewport(*rect)
+            painter.setPen(QPen(FRAME_COLORS[mode], 1))  # cosmetic, 1 screen pixel
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.drawRect(frame.adjusted(0, 0, -1, -1))
+
+            if not points:
+                continue
+            screen_points = self._to_viewport(points)
+            painter.setPen(QPen(POINT_COLOR, 1))
+            painter.drawPolyline(QPolygon(screen_points))
+            painter.setBrush(POINT_COLOR)
+            for point in screen_points:
+                painter.drawEllipse(point, POINT_RADIUS, POINT_RADIUS)
+
+    def _to_viewport(self, points) -> list[QPoint]:
+        """all points of a PointArray mapped like map_to_viewport at once"""
+        offset = np.asarray(self.canvas.content_offset())
+        zoom = self.canvas.object_manager.zoom_factor
+        screen = np.floor(points.to_array() * zoom).astype(np.int64) + offset
+        return [QPoint(x, y) for x, y in screen.tolist()]
+
+    def _overlay_region(self, overlay: tuple) -> QRegion:
+        """only the frame edges and the point cloud, not the frame interior"""
+        _, rect, points = overlay
+        frame = self.canvas.map_to_viewport(*rect)
+        outer = frame.adjusted(-PADDING, -PADDING, PADDING, PADDING)
+        inner = frame.adjusted(PADDING, PADDING, -PADDING, -PADDING)
+
+        region = QRegion(outer)
+        if inner.isValid():
+            region -= QRegion(inner)
+        if points:
+            cloud = self.canvas.map_to_viewport(*points.get_bounds())
+            region += QRegion(cloud.adjusted(-PADDING, -PADDING, PADDING, PADDING))
+        return region
@@ -0,0 +1,100 @@
+from PyQt6.QtCore import QPoint, QRect, Qt
+from PyQt6.QtGui import QPainter, QPen, QPixmap, QPolygon, QRegion
+
+from creatumlibre.graphics.math.point_array import PointArray
+from creatumlibre.ui.canvas.overlay_painter import PADDING, POINT_COLOR, POINT_RADIUS
+
+
+class PolygonPreview:
+    """The point cloud selection while it is being drawn, in screen space.
+
+    Committed edges are painted once into a cached transparent layer, so a
+    new point costs one segment no matter how many came before. Only zoom,
+    scrolling or resizing the viewport redraws all of them.
+    """
+
+    def __init__(self, canvas):
+        self.canvas = canvas
+        self.points = PointArray()  # image coordinates
+        self.cursor: tuple[int, int] | None = None  # end of the rubber band
+        self._layer: QPixmap | None = None
+        self._layer_key = None
+        self._drawn = 0  # points already painted into the layer
+
+    def add_point(self, point: tuple[int, int]):
+        region = self._rubber_band_region()
+        previous = self.points[-1] if self.points else point
+        self.points.append(point)
+        region += self._segment_region(previous, point)
+        region += self._rubber_band_region()
+        self.canvas.viewport().update(region)
+
+    def move_cursor(self, point: tuple[int, int]):
+        region = self._rubber_band_region()
+        self.cursor = point
+        region += self._rubber_band_region()
+        self.canvas.viewport().update(region)
+
+    def clear(self):
+        if self.points:
+            self.canvas.viewport().update()
+        self.points.clear()
+        self.cursor = None
+        self._layer = None
+        self._drawn = 0
+
+    def paint(self, painter: QPainter):
+        if not self.points:
+            return
+        self._sync_layer()
+        painter.drawPixmap(0, 0, self._layer)
+
+        if self.cursor is not None:
+            painter.setPen(QPen(POINT_COLOR, 1, Qt.PenStyle.DashLine))
+            painter.drawLine(
+                self._to_viewport(self.points[-1]), self._to_viewport(self.cursor)
+            )
+
+    def _sync_layer(self):
+        """paints the edges added since the last frame into the cached layer"""
+        viewport = self.canvas.viewport()
+        ratio = viewport.devicePixelRatio()
+        key = (
+            self.canvas.object_manager.zoom_factor,
+            self.canvas.content_offset(),
+            viewport.size(),
+            ratio,
+        )
+        if key != self._layer_key:
+            self._layer = QPixmap(viewport.size() * ratio)
+            self._layer.setDevicePixelRatio(ratio)
+            self._layer.fill(Qt.GlobalColor.transparent)
+            self._layer_key = key
+            self._drawn = 0
+        if self._drawn == len(self.points):
+            return
+
+        start = max(self._drawn - 1, 0)  # the new edges start at the last drawn point
+        screen_points = [self._to_viewport(point) for point in self.points[start:]]
+        painter = QPainter(self._layer)
+        painter.setPen(QPen(POINT_COLOR, 1))
+        if len(screen_points) > 1:
+            painter.drawPolyline(QPolygon(screen_points))
+        painter.setBrush(POINT_COLOR)
+        for point in screen_points[1 if self._drawn else 0 :]:
+            painter.drawEllipse(point, POINT_RADIUS, POINT_RADIUS)
+        painter.end()
+        self._drawn = len(self.points)
+
+    def _to_viewport(self, point: tuple[int, int]) -> QPoint:
+        rect = self.canvas.map_to_viewport(point[0], point[1], point[0], point[1])
+        return rect.topLeft()
+
+    def _segment_region(self, start: tuple[int, int], end: tuple[int, int]) -> QRegion:
+        rect = QRect(self._to_viewport(start), self._to_viewport(end)).normalized()
+        return QRegion(rect.adjusted(-PADDING, -PADDING, PADDING, PADDING))
+
+    def _rubber_band_region(self) -> QRegion:
+        if not self.points or self.cursor is None:
+            return QRegion()
+        return self._segment_region(self.points[-1], self.cursor)
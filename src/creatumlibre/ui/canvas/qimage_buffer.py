@@ -0,0 +1,63 @@
+# pylint: disable=no-member
+import cv2
+import numpy as np
+from PyQt6 import sip
+from PyQt6.QtGui import QImage, QPixmap
+
+from creatumlibre.graphics.selection.cropped_mask import CroppedMask
+
+
+def wrap_bgr(pixels: np.ndarray) -> QImage:
+    """Wraps BGR (or gray) pixels as a QImage without copying them.
+    Row strides are taken over, so slices of a larger buffer work as well.
+    The array is kept alive as long as the QImage lives.
+    """
+    if pixels.ndim == 2:
+        image_format = QImage.Format.Format_Grayscale8
+        row_contiguous = pixels.strides[1] == 1
+    else:
+        image_format = QImage.Format.Format_BGR888
+        row_contiguous = pixels.strides[1:] == (3, 1)
+    if not row_contiguous:
+        pixels = np.ascontiguousarray(pixels)
+
+    height, width = pixels.shape[:2]
+    image = QImage(
+        sip.voidptr(pixels.ctypes.data), width, height, pixels.strides[0], image_format
+    )
+    image.buffer = pixels  # ties the buffer lifetime to the image
+    return image
+
+
+def layer_to_qpixmap(pixels: np.ndarray, mask: CroppedMask | None) -> QPixmap:
+    """QPixmap of a layer, transparent where its mask is (None: opaque)."""
+    if mask is None:
+        return QPixmap.fromImage(wrap_bgr(pixels))
+
+    bgra = cv2.cvtColor(pixels, cv2.COLOR_BGR2BGRA)
+    bgra[..., 3] = mask.to_array()
+    height, width = bgra.shape[:2]
+    # ARGB32 is stored as B, G, R, A bytes on little endian machines
+    image = QImage(
+        bgra.data, width, height, bgra.strides[0], QImage.Format.Format_ARGB32
+    )
+    return QPixmap.fromImage(image)
+
+
+class DisplayBuffer:  # pylint: disable=too-few-public-methods
+    """Backing buffer for frames scaled to display size, reused across frames."""
+
+    def __init__(self):
+        self.pixels: np.ndarray | None = None
+
+    def resize_from(self, image: np.ndarray, size: tuple[int, int]) -> np.ndarray:
+        """scales 'image' to size (width, height) into the persistent buffer"""
+        width, height = size
+        shape = (height, width) + image.shape[2:]
+        if (
+            self.pixels is None
+            or self.pixels.shape != shape
+            or self.pixels.dtype != image.dtype
+        ):
+            self.pixels = np.empty(shape, dtype=image.dtype)
+        return cv2.resize(image, size, dst=self.pixels)
@@ -1,4 +1,6 @@
-from PyQt6.QtCore import Qt
+# pylint: disable=no-member
+import cv2
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtWidgets import (
     QDialog,
     QHBoxLayout,
@@ -8,17 +10,60 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
-from creatumlibre.graphics.filters.enhancers import (
-    adjust_brightness,
-    adjust_contrast,
-    adjust_rgb,
-    adjust_saturation,
-)
+from creatumlibre.graphics.compositing.image_pyramid import level_for_zoom, level_size
+from creatumlibre.graphics.filters.color_pipeline import ColorPipeline, ColorSettings
+from creatumlibre.graphics.filters.tiled_executor import get_default_executor
+from creatumlibre.graphics.io.image_store import get_default_store
 from creatumlibre.ui.dialogs.color_adjustment_dialog_css import (
     BTN_APPLY,
     BTN_CANCEL,
     MAIN_DIALOG,
 )
+from creatumlibre.ui.workers.task_worker import LatestTaskRunner
+
+SETTLE_MS = 250  # full resolution once the sliders rested this long
+
+
+class AdjustmentSession:
+    """What one showing of the dialog works on, taken from the tab that was
+    active when it opened: its manager, its canvas and the unchanged pixels.
+    """
+
+    def __init__(self, manager, canvas):
+        self.manager = manager
+        self.canvas = canvas
+        self.snapshot = None  # unchanged image
+        self.proxy = None  # (pyramid level, snapshot downsampled to the viewport)
+        self.shown_parameters = None  # settings of the full resolution result
+        self.in_step = False  # the manager has an open undo step of this dialog
+
+    def get_promoted_object(self):
+        for obj in self.manager.object_list:
+            if getattr(obj, "is_promoted", False):
+                return obj
+        return None
+
+    def get_proxy(self):
+        """(level, snapshot) downsampled until it fits the visible viewport"""
+        if self.proxy is None:
+            viewport = self.canvas.viewport().size()
+            height, width = self.snapshot.shape[:2]
+            zoom = min(
+                self.manager.zoom_factor,
+                viewport.width() / width,
+                viewport.height() / height,
+            )
+
+            level = level_for_zoom(zoom)
+            proxy = self.snapshot
+            if level > 0:
+                proxy = cv2.resize(
+                    proxy,
+                    level_size(width, height, level),
+                    interpolation=cv2.INTER_AREA,
+                )
+            self.proxy = (level, proxy)
+        return self.proxy
 
 
 class ColorAdjustmentDialog(QDialog):
@@ -31,7 +76,15 @@ class ColorAdjustmentDialog(QDialog):
         self.cancel_button = QPushButton("Cancel")
         self.sliders = {}
         self.labels = {}
-        self.base_image_snapshot = None  # unchanged image
+        self.session: AdjustmentSession | None = None  # while the dialog is shown
+
+        # newer slider values cancel older jobs, only the latest gets shown
+        self.preview_runner = LatestTaskRunner()
+        self.full_runner = LatestTaskRunner()
+        self.settle_timer = QTimer(self)
+        self.settle_timer.setSingleShot(True)
+        self.settle_timer.setInterval(SETTLE_MS)
+        self.settle_timer.timeout.connect(self.render_full_resolution)
 
         self._init_layout()
 
@@ -48,7 +101,7 @@ class ColorAdjustmentDialog(QDialog):
         button_layout.addWidget(self.apply_button)
 
         self.cancel_button.setStyleSheet(BTN_CANCEL)
-        self.cancel_button.clicked.connect(self.cancel_changes)
+        self.cancel_button.clicked.connect(self.reject)
         button_layout.addWidget(self.cancel_button)
 
         self.slider_settings = {
@@ -57,42 +110,42 @@ class ColorAdjustmentDialog(QDialog):
                 "range": (-100, 100),
                 "tick_interval": 10,
                 "scale_function": lambda value: 1 + (value / 100 * 1),
-                "apply_function": adjust_brightness,
+                "parameter": "brightness",
             },
             "Saturation": {
                 "default": 0,
                 "range": (-100, 100),
                 "tick_interval": 10,
                 "scale_function": lambda value: 1 + (value / 100 * 2),
-                "apply_function": adjust_saturation,
+                "parameter": "saturation",
             },
             "Contrast": {
                 "default": 0,
                 "range": (-100, 100),
                 "tick_interval": 10,
                 "scale_function": lambda value: 1 + (value / 100 * 1.0),
-                "apply_function": adjust_contrast,
+                "parameter": "contrast",
             },
             "Red": {
                 "default": 0,
                 "range": (-100, 100),
                 "tick_interval": 10,
                 "scale_function": lambda value: value / 100,
-                "apply_function": lambda img, value: adjust_rgb(img, value, "Red"),
+                "parameter": "red",
             },
             "Green": {
                 "default": 0,
                 "range": (-100, 100),
                 "tick_interval": 10,
                 "scale_function": lambda value: value / 100,
-                "apply_function": lambda img, value: adjust_rgb(img, value, "Green"),
+                "parameter": "green",
             },
             "Blue": {
                 "default": 0,
                 "range": (-100, 100),
                 "tick_interval": 10,
                 "scale_function": lambda value: value / 100,
-                "apply_function": lambda img, value: adjust_rgb(img, value, "Blue"),
+                "parameter": "blue",
             },
         }
 
@@ -122,83 +175,150 @@ class ColorAdjustmentDialog(QDialog):
     def showEvent(self, event):
         """Runs logic when the dialog is shown."""
         super().showEvent(event)
-
-        promoted = self.get_promoted_object()
-        if promoted:
-            self.base_image_snapshot = promoted.get_image().copy()
-            self.apply_all_adjustments()
-
-            return  # Already has a promoted object
-
-        # Promote base image if no selection is active
         active_tab = self.tab_manager.get_active_tab()
         if not active_tab:
             return
 
         manager = active_tab.get("manager")
+        self.session = AdjustmentSession(manager, active_tab.get("widget"))
+        # promoting, adjusting and merging become one undo step
+        self.session.in_step = manager.begin_step()
+
+        promoted = self.session.get_promoted_object()
+        if promoted is None:
+            # Promote base image if no selection is active
+            promoted = self._promote_base_image(manager)
+        if promoted is None:
+            return
+
+        self.session.snapshot = get_default_store().copy(promoted.get_image())
+        self.apply_all_adjustments()
+        self.tab_manager.refresh_active_tab_display()
+
+    def _promote_base_image(self, manager):
+        """Promotes the full image as fallback, returns the new object."""
         base_object = manager.get_base_object()
+        if not base_object:
+            return None
 
-        if base_object:
-            # Promote full image as fallback
-            height, width = base_object.get_image().shape[:2]
-            fake_selection = (0, 0, width, height)
+        height, width = base_object.get_image().shape[:2]
+        fake_selection = (0, 0, width, height)
 
-            # Make RegionManager believe the full image is selected
-            base_object.region_manager.set_bounding_rect(*fake_selection)
-            base_object.region_manager.initialize_mask(base_object.get_image().shape)
+        # Make RegionManager believe the full image is selected
+        base_object.region_manager.set_bounding_rect(*fake_selection)
+        base_object.region_manager.initialize_mask(base_object.get_image().shape)
 
-            new_obj = base_object.extract_selection_as_new_image()
-            if new_obj:
-                manager.add_object(new_obj)
-                self.base_image_snapshot = new_obj.get_image().copy()
-                self.apply_all_adjustments()
-                self.tab_manager.refresh_active_tab_display()
+        new_obj = base_object.extract_selection_as_new_image()
+        if new_obj:
+            manager.add_object(new_obj)
+        return new_obj
 
     def apply_all_adjustments(self):
-        promoted = self.get_promoted_object()
+        """Slider moved: a quick preview from the downsampled snapshot on a
+        worker thread, full resolution once the sliders settle.
+        """
+        if self.session is None or self.session.get_promoted_object() is None:
+            return
+
+        parameters = self.read_sliders()
+        level, proxy = self.session.get_proxy()
+        self.full_runner.cancel()
+        self.preview_runner.submit(
+            ColorPipeline.compile(parameters).apply,
+            proxy,
+            on_finished=lambda image: self.show_result(image, level, parameters),
+        )
+        if level > 0:
+            self.settle_timer.start()  # restarted by every tick
+
+    def render_full_resolution(self):
+        parameters = self.read_sliders()
+        self.preview_runner.cancel()  # would only cover the sharp result
+        self.full_runner.submit(
+            get_default_executor().run,  # full resolution on all cores
+            ColorPipeline.compile(parameters).apply,
+            self.session.snapshot,
+            on_finished=lambda image: self.show_result(image, 0, parameters),
+        )
+
+    def show_result(self, image, level: int, parameters: ColorSettings):
+        """puts a worker result (pixels at pyramid 'level') on the canvas"""
+        if self.session is None:
+            return  # closed while the worker ran
+        promoted = self.session.get_promoted_object()
         if promoted is None:
             return
 
-        image = self.base_image_snapshot.copy()  # Work on a copy for preview
+        if level == 0:
+            promoted.set_image(image)
+            self.session.shown_parameters = parameters
+        else:
+            promoted.set_preview(image, level)
+        # all layers at the preview resolution
+        self.session.manager.preview_level = level
+        self.tab_manager.refresh_active_tab_display()
 
+    def read_sliders(self) -> ColorSettings:
+        """ColorPipeline parameters of the sliders, updates the labels"""
+        parameters = {}
         for name, config in self.slider_settings.items():
-            value = self.sliders[name].value()
-            scale = config["scale_function"](value)
-            image = config["apply_function"](image, scale)
-            mapped_value = config["scale_function"](value)
+            mapped_value = config["scale_function"](self.sliders[name].value())
+            parameters[config["parameter"]] = mapped_value
             self.labels[name].setText(f"{name} [{mapped_value:.2f}]")
-
-        promoted.set_image(image)
-
-        self.tab_manager.refresh_active_tab_display()
-
-    def get_promoted_object(self):
-        """Finds the promoted object in the current tab's object manager."""
-        active_tab = self.tab_manager.get_active_tab()
-        if not active_tab:
-            return None
-
-        object_manager = active_tab.get("manager")
-        if not object_manager:
-            return None
-
-        for obj in object_manager.object_list:
-            if getattr(obj, "is_promoted", False):
-                return obj
-        return None
+        return ColorSettings(**parameters)
+
+    def stop_workers(self):
+        """no more results arrive, the layers are back at full resolution"""
+        self.settle_timer.stop()
+        self.preview_runner.cancel()
+        self.full_runner.cancel()
+        if self.session is not None:
+            self.session.manager.preview_level = 0
+
+    def done(self, result):
+        """every way out (Apply, Cancel, Esc, closing) ends the session"""
+        self.stop_workers()
+        self.session = None
+        super().done(result)
 
     def apply_changes(self):
-        obj_manager = self.tab_manager.get_active_tab().get("manager")
-        obj_manager.merge_selection()
+        self.stop_workers()
+        session = self.session
+        if session is None:
+            self.accept()
+            return
+
+        promoted = session.get_promoted_object()
+        parameters = self.read_sliders()
+        if promoted is not None and parameters != session.shown_parameters:
+            # not rendered at full resolution yet, the user waits for it here
+            pipeline = ColorPipeline.compile(parameters)
+            promoted.set_image(
+                get_default_executor().run(pipeline.apply, session.snapshot)
+            )
+
+        session.manager.merge_selection()
+        if session.in_step:
+            session.manager.end_step("color adjustment")
+            session.in_step = False
         self.tab_manager.refresh_active_tab_display()
         self.accept()
 
+    def reject(self):
+        """Cancel, Esc and the close button of the window end up here"""
+        self.cancel_changes()
+        super().reject()
+
     def cancel_changes(self):
         """Cancel adjustments, delete the promoted layer"""
-        promoted = self.get_promoted_object()
+        self.stop_workers()
+        session = self.session
+        if session is None:
+            return
+        if session.in_step:
+            session.manager.abort_step()
+            session.in_step = False
+        promoted = session.get_promoted_object()
         if promoted:
-            active_tab = self.tab_manager.get_active_tab()
-            object_manager = active_tab.get("manager")
-            object_manager.object_list.remove(promoted)
+            session.manager.delete_object(promoted)
             self.tab_manager.refresh_active_tab_display()
-            self.reject()
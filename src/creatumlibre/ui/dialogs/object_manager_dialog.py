@@ -10,6 +10,7 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
 )
 
+from creatumlibre.ui.canvas.qimage_buffer import layer_to_qpixmap
 from creatumlibre.ui.manager.object_manager import ObjectManager
 
 
@@ -55,7 +56,9 @@ class ObjectManagerDialog(QDialog):
             item = QListWidgetItem(
                 f"Object {len(self.object_manager.object_list) - idx - 1}"
             )
-            pixmap = obj.get_pixmap().scaled(64, 64, Qt.AspectRatioMode.KeepAspectRatio)
+            pixmap = layer_to_qpixmap(obj.get_image(), obj.get_mask()).scaled(
+                64, 64, Qt.AspectRatioMode.KeepAspectRatio
+            )
             item.setIcon(QIcon(pixmap))
             self.layer_list.addItem(item)
 
@@ -1,53 +1,42 @@
 from PyQt6.QtCore import QEvent, QObject, Qt
 from PyQt6.QtGui import QKeySequence
 
+from creatumlibre.core.image_handler import ImageHandler
 from creatumlibre.graphics.boolean_operations.image_boolean import Vector2D
+from creatumlibre.graphics.math.point_array import PointArray
+from creatumlibre.ui.canvas.frame_scheduler import FRAME_INTERVAL_MS, FrameScheduler
 from creatumlibre.ui.dialogs.object_manager_dialog import ObjectManagerDialog
 from creatumlibre.ui.input.intersection_state import InteractionState
-from creatumlibre.ui.manager.image_handler import ImageHandler
 from creatumlibre.ui.mode.ui_input_mode import InputMode
 
 
 class InputHandler(QObject):
     """Handles global key and mouse events."""
 
-    def __init__(self, parent):
+    def __init__(self, parent, frame_interval_ms: int = FRAME_INTERVAL_MS):
         super().__init__()
         self.parent = parent  #  Reference to UI mode for event interpretation
         self.clipboard = None
         self.active_tab = None
         self.interaction = InteractionState()
-        self.point_cloud_points: list[Vector2D] = []
+        self.point_cloud_points = PointArray()
         self.mode = InputMode.IDLE
+        # mouse moves only update state, the display follows once per frame
+        self.frame_scheduler = FrameScheduler(self.render_frame, frame_interval_ms)
+
+    def render_frame(self):
+        self.parent.tab_manager.refresh_active_tab_display()
 
     def map_event_to_image_coordinates(self, event) -> tuple[int, int] | None:
-        """Get the real position of the mouse within the image QLabel."""
+        """Get the real position of the mouse within the image canvas."""
         if (active_tab := self.parent.tab_manager.get_active_tab()) is None:
             return None
 
-        if (label_widget := active_tab.get("widget")) is None:
-            return None
-
-        global_pos = event.globalPosition().toPoint()
-        local_pos = label_widget.mapFromGlobal(global_pos)
-
-        # Center offset: compensate for QLabel centering the image
-        pixmap = label_widget.pixmap()
-        if pixmap is None:
+        if (canvas_widget := active_tab.get("widget")) is None:
             return None
 
-        offset_x = max(0, (label_widget.width() - pixmap.width()) // 2)
-        offset_y = max(0, (label_widget.height() - pixmap.height()) // 2)
-
-        real_x = local_pos.x() - offset_x
-        real_y = local_pos.y() - offset_y
-
-        # Optional: also return unscaled pixel in original image space
-        zoom = active_tab.get("manager").zoom_factor
-        orig_x = int(real_x / zoom)
-        orig_y = int(real_y / zoom)
-
-        return orig_x, orig_y
+        # unscaled pixel in original image space
+        return canvas_widget.map_to_image(event.globalPosition().toPoint())
 
     def eventFilter(self, _, event):
         """Intercept global events and delegate handling."""
@@ -81,39 +70,37 @@ class InputHandler(QObject):
         """Handles mouse movement feedback."""
 
         pos = Vector2D.from_tuple(self.map_event_to_image_coordinates(event))
-        print(pos.to_tuple())
+        was_dragging = self.interaction.drag_started
         delta = self.interaction.update(pos)
 
         if self.interaction.drag_started:
+            if not was_dragging and self.mode == InputMode.MOVE_OBJECTS:
+                self.active_tab["manager"].begin_drag()
             self.active_tab["manager"].update_selected_position(delta)
         else:
             if self.mode in [InputMode.POINT_CLOUD]:
-                # trick to just to show the rect
-                print("....")
-                tmp_object = self.create_new_image_object_from_selection()
-                tmp_object.region_manager.set_mask_points(self.point_cloud_points)
-                self.parent.tab_manager.refresh_active_tab_display()
-                self.active_tab["manager"].delete_object(tmp_object)
+                # only the rubber band to the cursor is repainted
+                self.active_tab["widget"].polygon_preview.move_cursor(pos.to_tuple())
 
             return
 
         if self.mode == InputMode.SELECT_REGION:
-            # trick to just to show the rect
-            tmp_object = self.create_new_image_object_from_selection()
-            self.parent.tab_manager.refresh_active_tab_display()
-            self.active_tab["manager"].delete_object(tmp_object)
+            # only the frame, the pixels are cut out on release
+            self.active_tab["widget"].marquee_preview.set_rect(
+                *self.process_rect_selection()
+            )
 
         elif self.mode == InputMode.MOVE_OBJECTS:
-            self.active_tab["manager"].update_selected_position(delta)
-            print(delta.to_tuple())
-            # paint everything
-            self.parent.tab_manager.refresh_active_tab_display()
+            # positions are set above, composited with the next frame
+            self.frame_scheduler.request()
 
     def handle_mouse_release(self, event):
         """Handles mouse release actions."""
+        self.frame_scheduler.cancel()  # the final state is shown below
 
         if self.interaction.drag_started:
             self.active_tab["manager"].set_new_position()
+            self.active_tab["manager"].end_drag()
         else:
             if self.mode == InputMode.IDLE:
                 self.active_tab["manager"].set_selected_object_by_click(
@@ -122,6 +109,7 @@ class InputHandler(QObject):
                 self.parent.ui_input_mode.set_mode(InputMode.MOVE_OBJECTS)
 
         if self.mode == InputMode.SELECT_REGION:
+            self.active_tab["widget"].marquee_preview.clear()
             self.create_new_image_object_from_selection()
             self.parent.ui_input_mode.set_mode(InputMode.IDLE)
         elif self.mode == InputMode.MOVE_OBJECTS:
@@ -137,6 +125,7 @@ class InputHandler(QObject):
                 self.finish_point_cloud()
             else:
                 self.point_cloud_points.append(pos)
+                self.active_tab["widget"].polygon_preview.add_point(pos.to_tuple())
 
         self.parent.tab_manager.refresh_active_tab_display()
         self.interaction.reset()
@@ -201,6 +190,15 @@ class InputHandler(QObject):
 
             self.parent.tab_manager.refresh_active_tab_display()
 
+        elif key_seq in QKeySequence.keyBindings(QKeySequence.StandardKey.Undo):
+            if self.active_tab["manager"].undo():
+                self.parent.tab_manager.refresh_active_tab_display()
+
+        elif key_seq in QKeySequence.keyBindings(QKeySequence.StandardKey.Redo):
+            # all bindings, Ctrl+Shift+Z is not the primary one everywhere
+            if self.active_tab["manager"].redo():
+                self.parent.tab_manager.refresh_active_tab_display()
+
         elif self.mode == InputMode.POINT_CLOUD and event.key() == Qt.Key.Key_Return:
             self.finish_point_cloud()
             self.parent.tab_manager.refresh_active_tab_display()
@@ -224,14 +222,21 @@ class InputHandler(QObject):
         return self.clipboard
 
     def finish_point_cloud(self):
+        """closes the polygon and cuts it out as new promoted object"""
+        self.active_tab["widget"].polygon_preview.clear()
         if len(self.point_cloud_points) < 3:
             print("Nicht genug Punkte für eine Maske.")
             self.point_cloud_points.clear()
             return
 
         print(f"Punktwolke abgeschlossen mit {len(self.point_cloud_points)} Punkten")
-        for p in self.point_cloud_points:
-            print(f"Punkt: {p.to_tuple()}")
-        self.point_cloud_points.clear()
+        manager = self.active_tab["manager"]
+        new_image_object = manager.get_parent().extract_polygon_as_new_image(
+            self.point_cloud_points
+        )
+        if new_image_object is not None:
+            manager.add_object(new_image_object)
+
+        self.point_cloud_points = PointArray()
         self.parent.ui_input_mode.set_mode(InputMode.IDLE)
         self.parent.tab_manager.refresh_active_tab_display()
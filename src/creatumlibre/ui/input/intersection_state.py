@@ -1,5 +1,5 @@
+from creatumlibre.core.image_handler import ImageHandler
 from creatumlibre.graphics.boolean_operations.image_boolean import Vector2D
-from creatumlibre.ui.manager.image_handler import ImageHandler
 
 
 class InteractionState:
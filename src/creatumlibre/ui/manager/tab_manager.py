@@ -1,17 +1,38 @@
 # pylint: disable=no-member
+import logging
 from pathlib import Path
 
+import cv2
+import numpy as np
 from PyQt6.QtCore import Qt
-from PyQt6.QtWidgets import (
-    QLabel,
-    QScrollArea,
-    QSizePolicy,
-    QTabWidget,
-    QVBoxLayout,
-    QWidget,
-)
-
+from PyQt6.QtGui import QImageIOHandler, QImageReader
+from PyQt6.QtWidgets import QSizePolicy, QTabWidget
+
+from creatumlibre.core.frame_profiler import get_default_profiler
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.compositing.image_pyramid import level_size
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.ui.canvas.image_canvas import ImageCanvas
 from creatumlibre.ui.manager.object_manager import ObjectManager
+from creatumlibre.ui.workers.image_load_queue import ImageLoadQueue
+
+PREVIEW_LEVEL = 3  # tabs show a 1/8 size decode until the full image is there
+LAYER_CASCADE = 20  # imported layers are offset diagonally by this much
+
+logger = logging.getLogger(__name__)
+
+
+def read_image_size(file_path: str) -> tuple[int, int] | None:
+    """(width, height) from the file header, turned like cv2.imread turns it"""
+    reader = QImageReader(file_path)
+    size = reader.size()
+    if not size.isValid():
+        return None
+    width, height = size.width(), size.height()
+    rotated = QImageIOHandler.Transformation.TransformationRotate90
+    if reader.transformation() & rotated:
+        width, height = height, width  # EXIF orientation
+    return width, height
 
 
 class TabManager:
@@ -20,13 +41,15 @@ class TabManager:
     def __init__(self, parent):
         self.parent = parent
         self.tab_widget = QTabWidget()
-        self.object_manager_instances = {}  # Track objectManagers by tab index
+        # tabs by their canvas widget, indices shift when a tab is removed
+        self.object_manager_instances = {}
+        self.load_queue = ImageLoadQueue()  # decodes of all tabs, bounded
 
         self._init_layout()
 
     def _init_layout(self):
         self.tab_widget.setTabsClosable(True)
-        self.tab_widget.tabCloseRequested.connect(self.tab_widget.removeTab)
+        self.tab_widget.tabCloseRequested.connect(self.close_tab)
         # self.tab_widget.installEventFilter(self.parent.input_handler)
         self.tab_widget.setMovable(True)
         self.tab_widget.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
@@ -36,75 +59,149 @@ class TabManager:
         )
         self.parent.workspace_layout.addWidget(self.tab_widget)
 
-    def _add_scroll_container(self, filename):
-        """Add a scroll container around the objects"""
-        scroll_area_widget = QScrollArea()
-        scroll_area_widget.setWidgetResizable(True)
-        scroll_area_widget.setHorizontalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAlwaysOn
-        )
-        scroll_area_widget.setVerticalScrollBarPolicy(
-            Qt.ScrollBarPolicy.ScrollBarAlwaysOn
-        )
-        # Fixed image/object-manger container inside the scroll area
-        object_manager_container_widget = QWidget()
-        object_manager_container_layout = QVBoxLayout(object_manager_container_widget)
-        object_manager_container_layout.setContentsMargins(0, 0, 0, 0)
-
-        object_manager_label_widget = QLabel()
-        object_manager_label_widget.setAlignment(Qt.AlignmentFlag.AlignCenter)
-
-        object_manager_container_layout.addWidget(object_manager_label_widget)
-        object_manager_container_widget.setLayout(object_manager_container_layout)
-
-        # Place fixed widget inside the scrollable area
-        scroll_area_widget.setWidget(object_manager_container_widget)
-        tab_index = self.tab_widget.addTab(scroll_area_widget, filename)
-        return tab_index, object_manager_label_widget
+    def _add_scroll_container(self, filename, object_manager: ObjectManager):
+        """Add a scrollable canvas which renders only the visible viewport"""
+        canvas_widget = ImageCanvas(object_manager)
+        tab_index = self.tab_widget.addTab(canvas_widget, filename)
+        return tab_index, canvas_widget
+
+    def load_new_images(self, file_paths: list[str]):
+        """one tab per file, the decodes run in parallel and arrive as they finish"""
+        for file_path in file_paths:
+            # reduced decodes run on the GUI thread, worth it for a single file
+            self.load_new_image(file_path, quick_preview=len(file_paths) == 1)
+
+    def load_new_image(self, file_path, quick_preview: bool = True):
+        """Opens the tab at once with a quick low resolution preview, the full
+        image is decoded on a worker thread. The tab takes no input until then.
+        """
+        file_path = str(file_path)
+        if (size := read_image_size(file_path)) is None:
+            logger.warning("Bild kann nicht gelesen werden: %s", file_path)
+            return
 
-    def load_new_image(self, file_path):
-        """Load a new image with scroll support inside a fixed widget."""
-        object_manager_instance = ObjectManager(file_path)
+        object_manager_instance = ObjectManager()
+        # full size without memory behind it, only the preview gets drawn
+        width, height = size
+        object_manager_instance.set_base_image(
+            np.broadcast_to(np.zeros(3, dtype=np.uint8), (height, width, 3))
+        )
+        self._show_loading_preview(object_manager_instance, file_path, quick_preview)
         filename = Path(file_path).name
 
-        tab_index, object_manager_label_widget = self._add_scroll_container(filename)
-        self.object_manager_instances[tab_index] = {
+        tab_index, canvas_widget = self._add_scroll_container(
+            filename, object_manager_instance
+        )
+        tab = {
             "manager": object_manager_instance,
-            "widget": object_manager_label_widget,  # Store label reference per tab
+            "widget": canvas_widget,  # Store canvas reference per tab
             "file_apth": file_path,  # saved for saving
+            "loading": True,
         }
+        self.object_manager_instances[canvas_widget] = tab
+        canvas_widget.setEnabled(False)
+        self.load_queue.submit(
+            object_manager_instance.image_store.load,
+            file_path,
+            nbytes=width * height * 3,
+            on_finished=lambda image: self._finish_loading(tab, image),
+            on_failed=lambda error: self._finish_loading(tab, None, error),
+        )
 
         self.refresh_tab_display(tab_index)
         self.tab_widget.setCurrentIndex(tab_index)
 
-    def refresh_tab_display(self, tab_index):
-        """Redraws the image for a specific tab by requesting a refreshed pixmap."""
-        if tab_index not in self.object_manager_instances:
+    def _show_loading_preview(
+        self, object_manager: ObjectManager, file_path: str, quick_preview: bool
+    ):
+        """reduced decode where the format allows it (JPEG), blank otherwise"""
+        height, width = object_manager.get_base_image().shape[:2]
+        preview_size = level_size(width, height, PREVIEW_LEVEL)
+        reduced = None
+        if quick_preview:
+            reduced = object_manager.image_store.load_reduced(file_path, PREVIEW_LEVEL)
+        if reduced is None:
+            reduced = np.full(preview_size[::-1] + (3,), 128, dtype=np.uint8)
+        elif (reduced.shape[1], reduced.shape[0]) != preview_size:
+            reduced = cv2.resize(reduced, preview_size, interpolation=cv2.INTER_AREA)
+
+        object_manager.get_base_object().set_preview(reduced, PREVIEW_LEVEL)
+        object_manager.preview_level = PREVIEW_LEVEL
+
+    def _finish_loading(self, tab: dict, image, error: str = ""):
+        """the full pixels arrived (None: decoding failed, 'error' may say why)"""
+        canvas_widget = tab["widget"]
+        if image is None:
+            logger.warning("Laden fehlgeschlagen: %s %s", tab["file_apth"], error)
+            self.close_tab(self.tab_widget.indexOf(canvas_widget))
+            return
+
+        tab["manager"].set_base_image(image)  # drops the preview
+        tab["manager"].preview_level = 0
+        tab["loading"] = False
+        canvas_widget.setEnabled(True)
+        canvas_widget.zoom_changed()  # the orientation may differ from the header
+
+    def import_as_layers(self, file_paths: list[str]):
+        """Decodes the files in parallel, each one becomes a layer of the active
+        tab as soon as it is done.
+        """
+        if (tab := self.get_active_tab()) is None:
+            return
+
+        for file_path in map(str, file_paths):
+            if (size := read_image_size(file_path)) is None:
+                logger.warning("Bild kann nicht gelesen werden: %s", file_path)
+                continue
+            width, height = size
+            self.load_queue.submit(
+                tab["manager"].image_store.load,
+                file_path,
+                nbytes=width * height * 3,
+                on_finished=lambda image, path=file_path: self._add_layer(
+                    tab, image, path
+                ),
+            )
+
+    def _add_layer(self, tab: dict, image, file_path: str):
+        if image is None:
+            logger.warning("Laden fehlgeschlagen: %s", file_path)
+            return
+
+        manager = tab["manager"]
+        offset = LAYER_CASCADE * (len(manager.object_list) - 1)
+        with manager.undo_step("import layer"):
+            manager.add_object(ImageHandler(image, Vector2D(offset, offset)))
+        tab["widget"].refresh()
+
+    def close_tab(self, tab_index: int):
+        if (canvas_widget := self.tab_widget.widget(tab_index)) is None:
             return
+        self.tab_widget.removeTab(tab_index)
+        self.object_manager_instances.pop(canvas_widget, None)
 
-        obj_ref = self.object_manager_instances[tab_index]
+    def refresh_tab_display(self, tab_index):
+        """Repaints the changed areas of a specific tab, rendering happens on paint."""
+        canvas_widget = self.tab_widget.widget(tab_index)
+        if canvas_widget not in self.object_manager_instances:
+            return
 
-        tab_pixmap = obj_ref[
-            "manager"
-        ].show_resulting_image()  # Get final image with all objects/layers
-        self._refresh_widget(widget=obj_ref["widget"], pixmap=tab_pixmap)
+        with get_default_profiler().stage("refresh"):
+            canvas_widget.refresh()
 
     def refresh_active_tab_display(self):
         """Convinience methot to update the tab"""
         active_tab = self.get_active_tab_index()
         self.refresh_tab_display(active_tab)
 
-    def _refresh_widget(self, widget: QWidget, pixmap):
-        """update widget"""
-        widget.setPixmap(pixmap)
-        widget.repaint()
-
     def get_active_tab(self):
-        """Retrieves the current ObjectManager instance safely."""
-        if (current_index := self.tab_widget.currentIndex()) == -1:
+        """Retrieves the current ObjectManager instance safely.
+        None while the tab is still loading, so it takes no input.
+        """
+        tab = self.object_manager_instances.get(self.tab_widget.currentWidget())
+        if tab is None or tab.get("loading"):
             return None
-
-        return self.object_manager_instances.get(current_index, None)
+        return tab
 
     def get_active_tab_index(self):
         return self.tab_widget.currentIndex()
@@ -124,9 +221,7 @@ class TabManager:
         active_tab["manager"].zoom_factor = max(
             0.1, min(3.0, active_tab["manager"].zoom_factor * factor)
         )  # Prevent extreme zoom
-        self._refresh_widget(
-            active_tab["widget"], active_tab["manager"].show_resulting_image()
-        )
+        active_tab["widget"].zoom_changed()
 
     def fit_to_container(self):
         """Resize the image while preserving aspect ratio."""
@@ -164,6 +259,4 @@ class TabManager:
             return
 
         active_tab["manager"].zoom_factor = 1.0
-        self._refresh_widget(
-            active_tab["widget"], active_tab["manager"].show_resulting_image()
-        )
+        active_tab["widget"].zoom_changed()
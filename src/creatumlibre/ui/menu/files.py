@@ -12,6 +12,7 @@ class FileMenu:
         file_actions = {
             "New": ("Ctrl+N", lambda: None),
             "Open": ("Ctrl+O", parent.load_new_image_dialog),
+            "Import as Layers": ("Ctrl+Shift+O", parent.import_layers_dialog),
             "Save": ("Ctrl+S", lambda: None),
             "Save As": ("Ctrl+Shift+S", lambda: None),
             "Quit": ("Ctrl+Q", parent.close),
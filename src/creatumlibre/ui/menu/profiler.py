@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from PyQt6.QtGui import QAction, QKeySequence
+from PyQt6.QtWidgets import QFileDialog, QMenu
+
+from creatumlibre.ui.status_bar.frame_time_label import FrameTimeLabel
+
+
+class ProfilerMenu(QMenu):
+    """Frame stage timings: on and off, export for offline analysis.
+    The menu bar owns the menu, the window needs no reference to it.
+    """
+
+    def __init__(self, parent):
+        super().__init__("Profiler", parent.menu_bar)
+        parent.menu_bar.addMenu(self)
+        self.root = parent
+        self.label = parent.findChild(FrameTimeLabel)
+
+        toggle = QAction("Show Frame Times", parent)
+        toggle.setCheckable(True)
+        toggle.setChecked(self.label.profiler.enabled)
+        toggle.setShortcut(QKeySequence("Ctrl+Shift+P"))
+        toggle.toggled.connect(self.label.set_enabled)
+        self.addAction(toggle)
+
+        profiler_actions = {
+            "Export Statistics (JSON)": self.export_json,
+            "Export Chrome Trace": self.export_chrome_trace,
+            "Reset": self.reset,
+        }
+        for name, function in profiler_actions.items():
+            action = QAction(name, parent)
+            action.triggered.connect(function)
+            self.addAction(action)
+
+    def export_json(self):
+        if file_path := self._select_target("frame_times.json"):
+            self.label.profiler.export_json(file_path)
+
+    def export_chrome_trace(self):
+        """opens in chrome://tracing or ui.perfetto.dev"""
+        if file_path := self._select_target("frame_trace.json"):
+            self.label.profiler.export_chrome_trace(file_path)
+
+    def reset(self):
+        self.label.profiler.reset()
+        self.label.update_text()
+
+    def _select_target(self, name: str) -> str:
+        file_path, _ = QFileDialog.getSaveFileName(
+            self.root,
+            "Export",
+            str(Path(self.root.last_opened_folder) / name),
+            "JSON (*.json)",
+        )
+        return file_path
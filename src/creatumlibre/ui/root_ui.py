@@ -16,8 +16,10 @@ from creatumlibre.ui.input.input_handler import InputHandler
 from creatumlibre.ui.left_sidebar.left_sidebar import LeftSidebar
 from creatumlibre.ui.manager.tab_manager import TabManager
 from creatumlibre.ui.menu.files import FileMenu
+from creatumlibre.ui.menu.profiler import ProfilerMenu
 from creatumlibre.ui.menu.zoom import ZoomMenu
 from creatumlibre.ui.mode.ui_input_mode import UiMode
+from creatumlibre.ui.status_bar.frame_time_label import FrameTimeLabel
 
 
 class RootUi(QMainWindow):
@@ -46,6 +48,7 @@ class RootUi(QMainWindow):
 
         self.file_menu = FileMenu(self)  # Initialize File Menu
         self.zoom_menu = ZoomMenu(self)  # Initialize Zoom Menu
+        ProfilerMenu(self)  # frame times in the status bar
 
         self.input_handler = InputHandler(self)
         self.installEventFilter(self.input_handler)
@@ -107,6 +110,8 @@ class RootUi(QMainWindow):
         status_bar_widget = QWidget()
         status_bar_widget.setFixedHeight(80)
         status_bar_widget.setStyleSheet("background-color: #fff0f0;")
+        status_bar_layout = QHBoxLayout(status_bar_widget)
+        status_bar_layout.addWidget(FrameTimeLabel())
 
         self.workspace_layout.addLayout(editor_panel_layout, stretch=9)
         self.workspace_layout.addWidget(status_bar_widget, stretch=1)
@@ -121,15 +126,24 @@ class RootUi(QMainWindow):
         self.debug_sizes()
 
     def load_new_image_dialog(self):
-        """Open a file dialog to load a new image and let ImageManager handle the rest."""
+        """Open a file dialog to load new images, one tab each."""
+        if file_paths := self._select_images("Open Images"):
+            self.tab_manager.load_new_images(file_paths)
+
+    def import_layers_dialog(self):
+        """Open a file dialog to add images as layers of the current tab."""
+        if file_paths := self._select_images("Import as Layers"):
+            self.tab_manager.import_as_layers(file_paths)
+
+    def _select_images(self, title: str) -> list[str]:
         file_dialog = QFileDialog(self)
-        file_path, _ = file_dialog.getOpenFileName(
-            self, "Open Image", self.last_opened_folder, "Images (*.png *.jpg *.bmp)"
+        file_paths, _ = file_dialog.getOpenFileNames(
+            self, title, self.last_opened_folder, "Images (*.png *.jpg *.jpeg *.bmp)"
         )
 
-        if file_path:
-            self.last_opened_folder = str(Path(file_path).parent)
-            self.tab_manager.load_new_image(file_path)
+        if file_paths:
+            self.last_opened_folder = str(Path(file_paths[0]).parent)
+        return file_paths
 
     def debug_sizes(self):
         print(f"Main Window Height: {self.height()}")
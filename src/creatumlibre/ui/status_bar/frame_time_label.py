@@ -0,0 +1,36 @@
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QLabel
+
+from creatumlibre.core.frame_profiler import FrameProfiler, get_default_profiler
+
+UPDATE_INTERVAL_MS = 500  # the text is read, not watched per frame
+
+
+class FrameTimeLabel(QLabel):
+    """Rolling p50 / p95 / max per frame stage in milliseconds.
+    Polls the profiler on a timer, so painting it adds nothing to a frame.
+    """
+
+    def __init__(self, profiler: FrameProfiler | None = None, parent=None):
+        super().__init__(parent)
+        self.profiler = profiler or get_default_profiler()
+        self.timer = QTimer(self)
+        self.timer.setInterval(UPDATE_INTERVAL_MS)
+        self.timer.timeout.connect(self.update_text)
+        self.set_enabled(self.profiler.enabled)
+
+    def set_enabled(self, enabled: bool):
+        """starts or stops timing, the label shows it only while on"""
+        self.profiler.set_enabled(enabled)
+        if enabled:
+            self.timer.start()
+        else:
+            self.timer.stop()
+        self.update_text()
+
+    def update_text(self):
+        if not self.profiler.enabled:
+            self.setText("")
+            return
+        summary = self.profiler.summary() or "waiting for frames"
+        self.setText(f"ms p50 / p95 / max:   {summary}")
@@ -0,0 +1,68 @@
+import os
+from collections import deque
+
+from PyQt6.QtCore import QThreadPool
+
+from creatumlibre.ui.workers.task_worker import Task
+
+MAX_LOADERS = 4  # decoders at once, beyond that they mostly wait for the disk
+IN_FLIGHT_BUDGET = 1024 * 1024 * 1024  # decoded bytes not yet handed to the UI
+
+
+class ImageLoadQueue:
+    """Decodes many files on a bounded pool and hands each result to the GUI
+    thread as soon as it is done, in the order they finish.
+
+    A job starts only while the estimated size of all started but not yet
+    delivered images stays within 'budget' (one job always runs). Selecting
+    a hundred files therefore never holds a hundred decoded images at once.
+    """
+
+    def __init__(
+        self,
+        pool: QThreadPool | None = None,
+        budget: int = IN_FLIGHT_BUDGET,
+        max_workers: int = MAX_LOADERS,
+    ):
+        if pool is None:
+            pool = QThreadPool()
+            pool.setMaxThreadCount(min(max_workers, os.cpu_count() or 1))
+        self.pool = pool
+        self.budget = budget
+        self.in_flight = 0  # estimated bytes of the running jobs
+        self._waiting: deque[tuple[Task, int]] = deque()
+        self._running: dict[Task, int] = {}  # alive until done
+
+    def submit(
+        self, function, *args, nbytes: int = 0, on_finished=None, on_failed=None
+    ) -> Task:
+        """queues function(*args), 'nbytes' is the expected size of its result"""
+        task = Task(function, *args, on_finished=on_finished, on_failed=on_failed)
+        task.signals.done.connect(lambda: self._release(task))
+        self._waiting.append((task, nbytes))
+        self._start_next()
+        return task
+
+    def cancel_all(self):
+        """waiting jobs are dropped, results of running ones ignored"""
+        self._waiting.clear()
+        for task in self._running:
+            task.cancel()
+
+    def get_pending_count(self) -> int:
+        return len(self._waiting) + len(self._running)
+
+    def _start_next(self):
+        while self._waiting:
+            task, nbytes = self._waiting[0]
+            if self._running and self.in_flight + nbytes > self.budget:
+                return
+            self._waiting.popleft()
+            self._running[task] = nbytes
+            self.in_flight += nbytes
+            self.pool.start(task)
+
+    def _release(self, task: Task):
+        # 'done' follows 'finished', the result is with the UI by now
+        self.in_flight -= self._running.pop(task, 0)
+        self._start_next()
@@ -0,0 +1,91 @@
+import logging
+
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+
+class TaskSignals(QObject):  # pylint: disable=too-few-public-methods
+    """Lives in the GUI thread, emissions from pool threads arrive queued."""
+
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    done = pyqtSignal()  # always last, also after cancel or failure
+
+
+class Task(QRunnable):
+    """Runs function(*args) on a thread pool and hands the result to
+    on_finished, or the error message to on_failed, in the GUI thread.
+    A cancelled task does not start and never reports a result.
+    """
+
+    def __init__(self, function, *args, on_finished=None, on_failed=None):
+        super().__init__()
+        self.setAutoDelete(False)  # the owner keeps the Python object alive
+        self.function = function
+        self.args = args
+        self.on_finished = on_finished
+        self.on_failed = on_failed
+        self.signals = TaskSignals()
+        self.signals.finished.connect(self._deliver)
+        self.signals.failed.connect(self._fail)
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            if not self.cancelled:
+                self.signals.finished.emit(self.function(*self.args))
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            self.signals.failed.emit(str(error))
+        finally:
+            self.signals.done.emit()
+
+    def _deliver(self, result):
+        # checked again in the GUI thread, the task may be cancelled after emitting
+        if not self.cancelled and self.on_finished is not None:
+            self.on_finished(result)
+
+    def _fail(self, message: str):
+        if self.cancelled:
+            return
+        if self.on_failed is None:
+            logger.warning("Background task failed: %s", message)
+        else:
+            self.on_failed(message)
+
+
+class LatestTaskRunner:
+    """Runs only the most recent request: submitting cancels the previous
+    task, queued ones are dropped and results of running ones are ignored.
+    """
+
+    def __init__(self, pool: QThreadPool | None = None):
+        self.pool = pool or QThreadPool.globalInstance()
+        self.task: Task | None = None
+        self._started: set[Task] = set()  # alive until run() returned
+
+    def submit(self, function, *args, on_finished=None, on_failed=None) -> Task:
+        self.cancel()
+        task = Task(function, *args, on_finished=on_finished, on_failed=on_failed)
+        task.signals.done.connect(lambda: self._release(task))
+        self.task = task
+        self._started.add(task)
+        self.pool.start(task)
+        return task
+
+    def cancel(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        if self.pool.tryTake(self.task):
+            self._started.discard(self.task)  # never started, no signals follow
+        self.task = None
+
+    def _release(self, task: Task):
+        # 'done' follows the result, a newer task was submitted if it differs
+        self._started.discard(task)
+        if task is self.task:
+            self.task = None
@@ -0,0 +1,9 @@
+# Eine QApplication für alle Tests, bevor die Module ihre eigene anlegen:
+# Qt erlaubt nur eine pro Prozess, und Widgets brauchen genau diese Art.
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # vor dem Import von Qt
+
+from PyQt6.QtWidgets import QApplication  # pylint: disable=wrong-import-position
+
+app = QApplication.instance() or QApplication([])
@@ -0,0 +1,61 @@
+# pylint: disable=no-member
+import subprocess
+import sys
+
+import cv2
+import numpy as np
+
+from creatumlibre.core.batch import BatchJob, find_images, main, run_batch
+
+
+def _write_images(directory, count):
+    directory.mkdir()
+    for index in range(count):
+        cv2.imwrite(
+            str(directory / f"bild{index}.png"), np.zeros((16, 24, 3), np.uint8)
+        )
+    (directory / "notiz.txt").write_text("kein Bild")
+
+
+def test_filters_and_layers_on_pool(tmp_path):
+    _write_images(tmp_path / "in", 3)
+    logo = tmp_path / "logo.png"
+    cv2.imwrite(str(logo), np.full((4, 4, 3), 255, np.uint8))
+
+    files = find_images(str(tmp_path / "in"))
+    assert len(files) == 3  # die Textdatei zählt nicht
+
+    job = BatchJob(
+        str(tmp_path / "out"), [("blue", 0.5)], [(str(logo), 2, 3)], extension=".png"
+    )
+    results = list(run_batch(job, files, workers=2))
+    assert sorted(results) == [(path, None) for path in files]
+
+    result = cv2.imread(str(tmp_path / "out" / "bild0.png"))
+    assert (result[3:7, 2:6] == 255).all()  # Ebene oben drauf
+    assert result[0, 0].tolist() == [127, 0, 0]  # Filter auf dem Bild
+
+
+def test_cli_reports_unreadable_files(tmp_path, capsys):
+    _write_images(tmp_path / "in", 1)
+    (tmp_path / "in" / "kaputt.png").write_bytes(b"kein png")
+
+    code = main(
+        [str(tmp_path / "in"), str(tmp_path / "out"), "-f", "brightness=2", "-w", "1"]
+    )
+
+    assert code == 1
+    assert "kaputt.png: Datei nicht lesbar" in capsys.readouterr().out
+    assert (tmp_path / "out" / "bild0.png").exists()
+
+
+def test_missing_file_is_not_readable(tmp_path):
+    job = BatchJob(str(tmp_path / "out"))
+    missing = str(tmp_path / "fehlt.png")
+
+    assert job.process(missing) == (missing, "Datei nicht lesbar")
+
+
+def test_batch_runs_without_qt():
+    script = "import sys, creatumlibre.core.batch; sys.exit('PyQt6' in sys.modules)"
+    assert subprocess.run([sys.executable, "-c", script], check=False).returncode == 0
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from creatumlibre.core.document import Document
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.filters.enhancers import adjust_rgb
+from creatumlibre.graphics.filters.tiled_executor import TiledExecutor
+from creatumlibre.graphics.math.vector2d import Vector2D
+
+
+def _document(keep_history=True):
+    document = Document(keep_history=keep_history)
+    document.set_base_image(np.zeros((20, 30, 3), dtype=np.uint8))
+    return document
+
+
+def test_composite_blends_layers_onto_base():
+    document = _document()
+    layer = np.full((5, 5, 3), 200, dtype=np.uint8)
+    document.add_object(ImageHandler(layer, Vector2D(10, 4)))
+
+    result = document.composite()
+    assert result.shape == (20, 30, 3)
+    assert (result[4:9, 10:15] == 200).all()
+    assert result[:4].sum() == 0
+
+
+def test_apply_filter_is_undoable():
+    document = _document()
+    base = document.get_base_image()
+
+    document.apply_filter(adjust_rgb, 0.5, "Red")
+    red = document.get_base_image()[..., 2]  # pylint: disable=unsubscriptable-object
+    assert (red == 127).all()
+    assert base.sum() == 0  # das Original bleibt für Undo erhalten
+
+    assert document.undo()
+    assert document.get_base_image().sum() == 0
+
+
+def test_apply_filter_with_executor_keeps_shared_pixels():
+    document = Document()
+    document.set_base_image(np.zeros((256, 30, 3), dtype=np.uint8))
+    base = document.get_base_image()
+
+    # adjust_rgb arbeitet in place, die Pixel teilt sich der Undo-Schritt
+    executor = TiledExecutor(max_workers=2)  # 256 Zeilen: vier Bänder
+    document.apply_filter(adjust_rgb, 0.5, "Red", executor=executor)
+    red = document.get_base_image()[..., 2]  # pylint: disable=unsubscriptable-object
+    assert (red == 127).all()
+    assert base.sum() == 0
+
+    assert document.undo()
+    assert document.get_base_image().sum() == 0
+
+
+def test_failed_step_is_aborted():
+    document = _document()
+    document.apply_filter(adjust_rgb, 0.5, "Red")
+
+    with pytest.raises(RuntimeError):
+        with document.undo_step("kaputt"):
+            document.get_base_object().set_position(Vector2D(1, 1))
+            raise RuntimeError("Filter abgestürzt")
+
+    assert document.history.pending is None
+    assert document.undo()  # nimmt den Filter zurück, nicht den Abbruch
+    assert document.get_base_image().sum() == 0
+
+
+def test_without_history_filters_work_in_place():
+    document = _document(keep_history=False)
+    base = document.get_base_image()
+
+    document.apply_filter(adjust_rgb, 0.5, "Red")
+    assert document.get_base_image() is base  # keine Kopie
+    assert not document.undo()
@@ -0,0 +1,49 @@
+import json
+
+from creatumlibre.core.frame_profiler import FrameProfiler
+
+
+def test_disabled_profiler_records_nothing():
+    profiler = FrameProfiler()
+    with profiler.stage("composite"):
+        pass
+    assert profiler.get_stats() == {}
+    assert profiler.summary() == ""
+
+
+def test_rolling_percentiles():
+    profiler = FrameProfiler(window=100, enabled=True)
+    # 200 Werte, nur die letzten 100 (101..200 ms) zählen
+    for value in range(1, 201):
+        profiler.record("composite", 0, value * 1_000_000)
+
+    stats = profiler.get_stats()["composite"]
+    assert stats["count"] == 100
+    assert stats["p50"] == 151
+    assert stats["p95"] == 196
+    assert stats["max"] == 200
+
+
+def test_nested_stages_and_exports(tmp_path):
+    profiler = FrameProfiler(enabled=True)
+    with profiler.stage("paint"):
+        with profiler.stage("upload"):
+            pass
+    assert set(profiler.get_stats()) == {"paint", "upload"}
+    assert profiler.summary().startswith("paint")  # langsamste zuerst
+
+    profiler.export_json(tmp_path / "stats.json")
+    assert set(json.loads((tmp_path / "stats.json").read_text())["stages"]) == {
+        "paint",
+        "upload",
+    }
+
+    profiler.export_chrome_trace(tmp_path / "trace.json")
+    events = json.loads((tmp_path / "trace.json").read_text())["traceEvents"]
+    paint, upload = sorted(events, key=lambda event: event["ts"])
+    assert paint["ph"] == "X" and paint["name"] == "paint"
+    assert paint["ts"] <= upload["ts"]
+    assert upload["ts"] + upload["dur"] <= paint["ts"] + paint["dur"]
+
+    profiler.reset()
+    assert profiler.get_stats() == {}
@@ -0,0 +1,128 @@
+# pylint: disable=no-member
+# pylint: disable=redefined-outer-name
+import cv2
+import numpy as np
+import pytest
+
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.core.undo_history import UndoHistory
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.ui.manager.object_manager import ObjectManager
+
+
+@pytest.fixture
+def manager(tmp_path):
+    file_path = tmp_path / "base.png"
+    cv2.imwrite(str(file_path), np.full((600, 600, 3), 50, dtype=np.uint8))
+    return ObjectManager(str(file_path))
+
+
+def make_layer(position, value=200, size=20):
+    layer = ImageHandler(
+        np.full((size, size, 3), value, dtype=np.uint8), Vector2D(*position)
+    )
+    return layer
+
+
+def test_undo_redo_move(manager):
+    layer = make_layer((10, 10))
+    manager.add_object(layer)
+    layer.is_selected = True
+
+    manager.update_selected_position(Vector2D(100, 0))
+    manager.set_new_position()
+    assert layer.get_position() == Vector2D(110, 10)
+
+    assert manager.undo()
+    assert layer.get_position() == Vector2D(10, 10)
+    assert manager.get_object_at((15, 15)) is layer  # Index neu aufgebaut
+    assert manager.redo()
+    assert layer.get_position() == Vector2D(110, 10)
+    assert not manager.redo()
+
+
+def test_undo_move_keeps_the_mask_revision(manager):
+    layer = make_layer((10, 10))
+    mask = np.zeros((20, 20), dtype=np.uint8)
+    mask[:, :10] = 255
+    layer.region_manager.mask = mask
+    manager.add_object(layer)
+    layer.is_selected = True
+    revision = layer.get_mask_revision()
+
+    manager.update_selected_position(Vector2D(100, 0))
+    manager.set_new_position()
+    assert manager.undo()
+    assert manager.redo()
+    # unveränderte Maske: Kacheln und Pyramide bleiben gültig
+    assert layer.get_mask_revision() == revision
+
+
+def test_undo_merge_restores_tiles_and_layer(manager):
+    base = manager.get_base_object()
+    before = base.get_image().copy()
+    promoted = make_layer((300, 300))
+    promoted.is_promoted = True
+    manager.add_object(promoted)
+
+    manager.merge_selection()
+    assert promoted not in manager.object_list
+    # nur die eine betroffene Kachel wird gespeichert
+    (delta,) = manager.history.undo_steps[-1].deltas.values()
+    assert delta.slices == [(256, 512, 256, 512)]
+
+    manager.undo()
+    assert manager.object_list == [base, promoted]
+    assert np.array_equal(base.get_image(), before)
+
+    manager.redo()
+    assert manager.object_list == [base]
+    assert base.get_image()[305, 305, 0] == 200
+
+
+def test_paste_and_new_step_drops_redo(manager):
+    manager.paste_clipboard(make_layer((0, 0)))
+    assert len(manager.object_list) == 2
+    manager.undo()
+    assert len(manager.object_list) == 1
+
+    manager.paste_clipboard(make_layer((5, 5)))
+    assert not manager.history.redo_steps
+
+
+def test_pending_step_absorbs_inner_edits(manager):
+    assert manager.begin_step()
+    manager.paste_clipboard(make_layer((0, 0)))
+    manager.paste_clipboard(make_layer((50, 0)))
+    assert not manager.undo()  # nicht während eines offenen Schritts
+    manager.end_step("both")
+
+    assert len(manager.history.undo_steps) == 1
+    manager.undo()
+    assert len(manager.object_list) == 1
+
+
+def test_budget_compresses_spills_and_evicts(tmp_path):
+    layers = [ImageHandler(np.zeros((512, 512, 3), np.uint8), Vector2D(0, 0))]
+    history = UndoHistory(budget=300_000, spill_dir=str(tmp_path), raw_steps=1)
+
+    rng = np.random.default_rng(0)
+    for _ in range(4):
+        history.begin(layers, touched=layers)
+        layers[0].get_writable_image()[:256, :256] = rng.integers(
+            0, 255, (256, 256, 3), np.uint8
+        )  # Rauschen: kaum komprimierbar
+        layers[0].mark_dirty()
+        history.commit("noise", layers)
+
+    assert history.get_nbytes() <= 300_000
+    assert len(history.undo_steps) == 4
+    assert list(tmp_path.iterdir())  # ältere Schritte auf der Platte
+
+    history.spill_dir = None
+    history.budget = 200_000
+    history.begin(layers, touched=layers)
+    layers[0].get_writable_image()[256:, 256:] = 1
+    history.commit("fill", layers)
+    assert history.get_nbytes() <= 200_000
+    assert len(history.undo_steps) < 5  # älteste verworfen
@@ -1,8 +1,8 @@
 import numpy as np
 
-from creatumlibre.graphics.boolean_operations.image_boolean import merge
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.boolean_operations.image_boolean import merge, merge_arrays
 from creatumlibre.graphics.math.vector2d import Vector2D
-from creatumlibre.ui.manager.image_handler import ImageHandler
 
 
 def test_merge_with_negative_position():
@@ -29,3 +29,29 @@ def test_merge_with_negative_position():
     # Rest des Bildes bleibt weiß
     untouched_region = result[0:80, 0:100]
     assert np.all(untouched_region == 255)
+
+
+def test_merge_half_transparent_mask():
+    base_handler = ImageHandler(np.zeros((40, 40, 3), dtype=np.uint8), Vector2D(0, 0))
+    overlay_handler = ImageHandler(
+        np.full((20, 20, 3), 200, dtype=np.uint8), Vector2D(10, 10)
+    )
+    mask = np.full((20, 20), 0.5, dtype=np.float32)
+    mask[:, 10:] = 0  # rechte Hälfte durchsichtig
+    overlay_handler.region_manager.mask = mask
+
+    merge(overlay_handler, base_handler)
+
+    result = base_handler.get_image()
+    assert np.all(np.abs(result[10:30, 10:20].astype(int) - 100) <= 1)
+    assert np.all(result[10:30, 20:30] == 0)
+    assert np.all(result[0:10] == 0)
+
+
+def test_merge_arrays_uint16():
+    base = np.zeros((10, 10, 3), dtype=np.uint16)
+    overlay = np.full((10, 10, 3), 60000, dtype=np.uint16)
+    mask = np.full((10, 10), 0.5, dtype=np.float32)
+
+    assert merge_arrays(overlay, mask, Vector2D(0, 0), base)
+    assert np.all(np.abs(base.astype(int) - 30000) <= 200)
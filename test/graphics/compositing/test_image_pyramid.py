@@ -0,0 +1,67 @@
+import numpy as np
+
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.compositing.image_pyramid import level_for_zoom
+from creatumlibre.graphics.compositing.tile_compositor import TileCompositor
+from creatumlibre.graphics.math.vector2d import Vector2D
+
+
+def test_level_for_zoom():
+    assert level_for_zoom(3.0) == 0
+    assert level_for_zoom(1.0) == 0
+    assert level_for_zoom(0.5) == 1
+    assert level_for_zoom(0.3) == 1
+    assert level_for_zoom(0.25) == 2
+    assert level_for_zoom(0.1) == 3
+
+
+def test_levels_are_cached_and_invalidated():
+    handler = ImageHandler(np.full((101, 64, 3), 80, dtype=np.uint8), Vector2D(0, 0))
+
+    image, mask = handler.get_level(2)
+    assert image.shape == (26, 16, 3)
+    assert mask is None  # opaque
+    assert handler.get_level(2)[0] is image
+
+    handler.set_image(np.full((101, 64, 3), 160, dtype=np.uint8))
+    assert np.all(handler.get_level(2)[0] == 160)
+
+
+def test_new_mask_rebuilds_levels():
+    handler = ImageHandler(np.full((64, 64, 3), 80, dtype=np.uint8), Vector2D(0, 0))
+    left = np.zeros((64, 64), dtype=np.uint8)
+    left[:, :32] = 255
+    handler.region_manager.mask = left
+    assert handler.get_level(1)[1].contains(5, 5)
+
+    # neue Maske, auch wenn sie die id() der alten bekommt
+    handler.region_manager.mask = left[:, ::-1].copy()
+    assert not handler.get_level(1)[1].contains(5, 5)
+    assert handler.get_level(1)[1].contains(26, 5)
+
+
+def test_compositor_renders_at_pyramid_level():
+    base = ImageHandler(np.zeros((128, 128, 3), dtype=np.uint8), Vector2D(0, 0))
+    white = ImageHandler(np.full((32, 32, 3), 255, dtype=np.uint8), Vector2D(64, 32))
+    compositor = TileCompositor(tile_size=16)
+
+    canvas = compositor.render([base, white], 0.25)
+
+    assert canvas.shape == (32, 32, 3)
+    assert np.all(canvas[8:16, 16:24] == 255)
+    assert np.all(canvas[:8] == 0)
+
+
+def test_preview_replaces_levels_until_pixels_change():
+    handler = ImageHandler(np.full((64, 64, 3), 80, dtype=np.uint8), Vector2D(0, 0))
+    revision = handler.revision
+
+    handler.set_preview(np.full((16, 16, 3), 200, dtype=np.uint8), 2)
+    assert handler.revision > revision
+    assert np.all(handler.get_level(2)[0] == 200)
+    assert handler.get_level(3)[0].shape == (8, 8, 3)
+    assert np.all(handler.get_image() == 80)  # real pixels untouched
+
+    handler.set_image(np.full((64, 64, 3), 10, dtype=np.uint8))
+    assert handler.preview is None
+    assert np.all(handler.get_level(2)[0] == 10)
@@ -0,0 +1,99 @@
+import numpy as np
+
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.boolean_operations.image_boolean import merge
+from creatumlibre.graphics.compositing.tile_compositor import TileCompositor
+from creatumlibre.graphics.math.vector2d import Vector2D
+
+
+def make_layers():
+    base = ImageHandler(np.full((100, 120, 3), 200, dtype=np.uint8), Vector2D(0, 0))
+    red = np.zeros((20, 20, 3), dtype=np.uint8)
+    red[:, :] = [0, 0, 255]
+    green = np.zeros((30, 10, 3), dtype=np.uint8)
+    green[:, :] = [0, 255, 0]
+    return [
+        base,
+        ImageHandler(red, Vector2D(5, 5)),
+        ImageHandler(green, Vector2D(50, 60)),
+    ]
+
+
+def reference(layers):
+    # Alles neu zusammensetzen wie früher
+    result = layers[0].copy()
+    for layer in layers[1:]:
+        merge(layer, result)
+    return result.get_image()
+
+
+def test_render_matches_full_merge():
+    layers = make_layers()
+    compositor = TileCompositor(tile_size=32)
+
+    assert np.array_equal(compositor.render(layers, 1.0), reference(layers))
+
+
+def test_moving_layer_only_dirties_its_tiles():
+    layers = make_layers()
+    compositor = TileCompositor(tile_size=32)
+    compositor.render(layers, 1.0)
+
+    # Rot von (5,5) nach (40,5) verschieben
+    layers[1].set_position(Vector2D(40, 5))
+    dirty = compositor.sync(layers, 1.0)
+
+    assert dirty == {(0, 0), (1, 0)}
+    assert np.array_equal(compositor.render(layers, 1.0), reference(layers))
+
+
+def test_unchanged_frame_has_no_dirty_tiles():
+    layers = make_layers()
+    compositor = TileCompositor(tile_size=32)
+    compositor.render(layers, 1.0)
+
+    assert not compositor.sync(layers, 1.0)
+
+
+def test_removed_layer_is_erased():
+    layers = make_layers()
+    compositor = TileCompositor(tile_size=32)
+    compositor.render(layers, 1.0)
+
+    del layers[2]
+
+    assert np.array_equal(compositor.render(layers, 1.0), reference(layers))
+
+
+def test_new_mask_dirties_its_tiles():
+    layers = make_layers()
+    compositor = TileCompositor(tile_size=32)
+    compositor.render(layers, 1.0)
+
+    # Neue Maske, die alte ist weg und ihre id() darf wiederverwendet werden
+    layers[1].region_manager.mask = np.zeros((20, 20), dtype=np.uint8)
+    dirty = compositor.sync(layers, 1.0)
+
+    assert dirty == {(0, 0)}
+    assert np.array_equal(compositor.render(layers, 1.0), reference(layers))
+
+
+def test_frozen_drag_matches_full_merge():
+    layers = make_layers()
+    blue = np.zeros((40, 40, 3), dtype=np.uint8)
+    blue[:, :] = [255, 0, 0]
+    glass = ImageHandler(blue, Vector2D(30, 30))
+    glass.region_manager.mask = np.full(
+        (40, 40), 128, dtype=np.uint8
+    )  # halbtransparent
+    layers.append(glass)
+
+    compositor = TileCompositor(tile_size=32)
+    compositor.freeze(layers, 1.0, 1, 1)  # nur Rot bewegt sich
+
+    layers[1].set_position(Vector2D(35, 40))
+    frozen = compositor.render(layers, 1.0)
+    assert np.abs(frozen.astype(int) - reference(layers)).max() <= 1
+
+    compositor.thaw()
+    assert np.array_equal(compositor.render(layers, 1.0), reference(layers))
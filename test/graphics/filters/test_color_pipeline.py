@@ -0,0 +1,63 @@
+import numpy as np
+
+from creatumlibre.graphics.filters.color_pipeline import ColorPipeline, ColorSettings
+from creatumlibre.graphics.filters.enhancers import (
+    adjust_brightness,
+    adjust_contrast,
+    adjust_rgb,
+    adjust_saturation,
+)
+
+
+def _chained(image, settings):
+    image = adjust_brightness(image, settings.brightness)
+    image = adjust_saturation(image, settings.saturation)
+    image = adjust_contrast(image, settings.contrast)
+    image = adjust_rgb(image, settings.red, "Red")
+    image = adjust_rgb(image, settings.green, "Green")
+    return adjust_rgb(image, settings.blue, "Blue")
+
+
+def _test_image():
+    rng = np.random.default_rng(7)
+    return rng.integers(0, 256, (64, 80, 3), dtype=np.uint8)
+
+
+def test_saturation_matches_chain():
+    image = _test_image()
+    for settings in (
+        ColorSettings(brightness=0.7, saturation=1.6, contrast=1.1, blue=0.1),
+        ColorSettings(brightness=1.2, saturation=0.3, contrast=0.9, red=-0.1),
+        ColorSettings(saturation=3.0),
+        ColorSettings(saturation=-1.0),
+    ):
+        expected = _chained(image.copy(), settings)
+        result = ColorPipeline.compile(settings).apply(image)
+        assert np.array_equal(result, expected), settings
+
+
+def test_per_channel_settings_match_chain():
+    image = _test_image()
+    settings = ColorSettings(brightness=1.3, contrast=0.8, red=0.1, green=-0.2)
+    expected = _chained(image.copy(), settings)
+    result = ColorPipeline.compile(settings).apply(image)
+
+    # the chain still takes the lossy HSV round trip at saturation 1
+    diff = np.abs(result.astype(int) - expected.astype(int))
+    assert diff.max() <= 5
+
+
+def test_without_saturation_is_one_lut():
+    pipeline = ColorPipeline.compile(
+        ColorSettings(brightness=1.5, contrast=0.5, red=0.2)
+    )
+    assert pipeline.lut.shape == (256, 1, 3)
+    assert pipeline.post_lut is None
+
+
+def test_neutral_settings_keep_image():
+    image = _test_image()
+    before = image.copy()
+    result = ColorPipeline.compile().apply(image)
+    assert np.array_equal(result, image)
+    assert np.array_equal(image, before)
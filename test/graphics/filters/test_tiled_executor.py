@@ -0,0 +1,69 @@
+# pylint: disable=no-member
+import cv2
+import numpy as np
+
+from creatumlibre.graphics.filters.color_pipeline import ColorPipeline, ColorSettings
+from creatumlibre.graphics.filters.enhancers import adjust_rgb, adjust_saturation
+from creatumlibre.graphics.filters.tiled_executor import TiledExecutor, needs_halo
+
+
+@needs_halo(6)
+def _blur(image):
+    return cv2.GaussianBlur(image, (13, 13), 0)
+
+
+def _test_image():
+    rng = np.random.default_rng(3)
+    return rng.integers(0, 256, (1000, 120, 3), dtype=np.uint8)
+
+
+def test_bands_cover_all_rows():
+    executor = TiledExecutor(max_workers=4)
+    bands = executor.bands(1000)
+    assert len(bands) == 8
+    assert bands[0][0] == 0 and bands[-1][1] == 1000
+    assert all(a[1] == b[0] for a, b in zip(bands, bands[1:]))
+    assert executor.bands(100) == [(0, 100)]
+
+
+def test_bands_are_bounded_in_bytes():
+    executor = TiledExecutor(max_workers=1)
+    assert executor.bands(1000) == [(0, 1000)]
+    # 1000 Zeilen zu 1 MB: höchstens 64 MB je Band
+    assert len(executor.bands(1000, row_bytes=1024 * 1024)) == 16
+
+
+def test_pointwise_filters_match_single_pass():
+    executor = TiledExecutor(max_workers=4)
+    image = _test_image()
+    pipeline = ColorPipeline.compile(
+        ColorSettings(brightness=1.2, saturation=1.5, red=0.1)
+    )
+
+    assert np.array_equal(executor.run(pipeline.apply, image), pipeline.apply(image))
+    assert np.array_equal(
+        executor.run(adjust_saturation, image, 0.5), adjust_saturation(image, 0.5)
+    )
+    expected = adjust_rgb(image.copy(), 0.2, "Red")
+    assert np.array_equal(executor.run(adjust_rgb, image.copy(), 0.2, "Red"), expected)
+    executor.shutdown()
+
+
+def test_in_place_filter_leaves_input_untouched():
+    image = _test_image()
+    before = image.copy()
+    image.flags.writeable = False  # wie geteilte Pixel
+    expected = adjust_rgb(before.copy(), 0.2, "Red")
+
+    for workers in (1, 4):
+        executor = TiledExecutor(max_workers=workers)
+        assert np.array_equal(executor.run(adjust_rgb, image, 0.2, "Red"), expected)
+        executor.shutdown()
+    assert np.array_equal(image, before)
+
+
+def test_halo_filter_matches_single_pass():
+    executor = TiledExecutor(max_workers=4)
+    image = _test_image()
+    assert np.array_equal(executor.run(_blur, image), _blur(image))
+    executor.shutdown()
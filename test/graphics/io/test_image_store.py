@@ -0,0 +1,67 @@
+# pylint: disable=no-member
+import cv2
+import numpy as np
+
+from creatumlibre.graphics.io.image_store import ImageStore
+
+
+def _write_png(path, value=0):
+    image = np.full((40, 50, 3), value, dtype=np.uint8)
+    image[10, 20] = (1, 2, 3)
+    cv2.imwrite(str(path), image)
+    return image
+
+
+def test_large_image_is_decoded_once_and_mapped(tmp_path):
+    store = ImageStore(str(tmp_path / "cache"), threshold=1000)
+    image = _write_png(tmp_path / "scan.png")
+
+    first = store.load(str(tmp_path / "scan.png"))
+    assert isinstance(first, np.memmap)
+    assert np.array_equal(first, image)
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+    first[0, 0] = 99  # copy-on-write: die Cache-Datei bleibt unverändert
+    second = store.load(str(tmp_path / "scan.png"))
+    assert np.array_equal(second, image)
+
+
+def test_small_images_and_scratch_stay_in_memory(tmp_path):
+    store = ImageStore(str(tmp_path / "cache"), threshold=10_000)
+    image = _write_png(tmp_path / "small.png")
+
+    loaded = store.load(str(tmp_path / "small.png"))
+    assert not isinstance(loaded, np.memmap)
+    assert np.array_equal(loaded, image)
+    assert not isinstance(store.empty((10, 10), np.uint8), np.memmap)
+
+    big = store.copy(np.ones((100, 100, 3), dtype=np.uint8))
+    assert isinstance(big, np.memmap) and big.sum() == 30_000
+    assert store.load(str(tmp_path / "missing.png")) is None
+
+
+def test_without_cache_nothing_is_written(tmp_path):
+    store = ImageStore(str(tmp_path / "cache"), threshold=1000, keep_cache=False)
+    image = _write_png(tmp_path / "scan.png")
+
+    assert np.array_equal(store.load(str(tmp_path / "scan.png")), image)
+    assert not (tmp_path / "cache").exists()
+
+
+def test_cache_keeps_newest_files_within_limit(tmp_path):
+    store = ImageStore(str(tmp_path / "cache"), threshold=1000, cache_limit=8000)
+    for index in range(3):
+        _write_png(tmp_path / f"{index}.png", value=index)
+        store.load(str(tmp_path / f"{index}.png"))
+
+    assert len(list((tmp_path / "cache").iterdir())) == 1  # je Datei ~6 kB
+
+
+def test_reduced_decode_only_for_jpeg(tmp_path):
+    store = ImageStore(str(tmp_path / "cache"))
+    image = np.zeros((80, 96, 3), dtype=np.uint8)
+    cv2.imwrite(str(tmp_path / "photo.jpg"), image)
+    cv2.imwrite(str(tmp_path / "drawing.png"), image)
+
+    assert store.load_reduced(str(tmp_path / "photo.jpg"), 3).shape == (10, 12, 3)
+    assert store.load_reduced(str(tmp_path / "drawing.png"), 3) is None
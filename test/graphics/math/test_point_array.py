@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from creatumlibre.graphics.math.point_array import PointArray
+from creatumlibre.graphics.math.vector2d import Vector2D
+
+
+def test_vector_is_immutable_and_hashable():
+    vector = Vector2D(3, 4)
+    with pytest.raises(AttributeError):
+        vector.x = 5
+
+    x, y = vector
+    assert (x, y) == (3, 4)
+    assert vector + Vector2D(1, 1) == Vector2D(4, 5)
+    assert abs(vector) == 5
+    assert len({Vector2D(1, 2), Vector2D(1, 2)}) == 1
+    assert vector != (3, 4)  # kein Tupel-Vergleich
+
+
+def test_append_grows_and_hands_out_vectors():
+    points = PointArray(capacity=2)
+    for i in range(100):
+        points.append(Vector2D(i, 2 * i))
+
+    assert len(points) == 100
+    assert points[0] == Vector2D(0, 0)
+    assert points[-1] == Vector2D(99, 198)
+    assert list(points)[10] == Vector2D(10, 20)
+    assert np.asarray(points).shape == (100, 2)
+
+    tail = points[98:]
+    assert isinstance(tail, PointArray)
+    assert list(tail) == [Vector2D(98, 196), Vector2D(99, 198)]
+
+    points.clear()
+    assert not points
+
+
+def test_translate_and_bounds_in_one_step():
+    points = PointArray([Vector2D(0, 5), Vector2D(10, -3), (4, 4)])
+    moved = points.translated(Vector2D(100, 200))
+
+    assert moved.get_bounds() == (100, 197, 110, 205)
+    assert points.get_bounds() == (0, -3, 10, 5)  # Original unverändert
+    assert PointArray().get_bounds() is None
+
+    with pytest.raises(ValueError):
+        points.to_array()[0, 0] = 1  # nur lesbar
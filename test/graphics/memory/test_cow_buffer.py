@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.graphics.memory.cow_buffer import CowBuffer
+
+
+def test_share_until_write():
+    buffer = CowBuffer(np.zeros((4, 4), dtype=np.uint8))
+    copy = buffer.share()
+
+    assert np.shares_memory(buffer.read(), copy.read())
+    with pytest.raises(ValueError):
+        copy.read()[0, 0] = 1  # geteilt: nur lesbar
+
+    copy.write()[0, 0] = 9
+
+    assert copy.read()[0, 0] == 9
+    assert buffer.read()[0, 0] == 0
+    assert not buffer.is_shared()
+    assert buffer.read().flags.writeable
+
+
+def test_released_copy_unshares():
+    buffer = CowBuffer(np.zeros((4, 4), dtype=np.uint8))
+    copy = buffer.share()
+    del copy
+
+    assert not buffer.is_shared()
+
+
+def test_image_handler_copy_is_lazy():
+    handler = ImageHandler(np.zeros((10, 10, 3), dtype=np.uint8), Vector2D(0, 0))
+    handler.region_manager.mask = np.full((10, 10), 0.5, dtype=np.float32)
+    pasted = [handler.copy() for _ in range(5)]
+
+    assert all(np.shares_memory(handler.get_image(), p.get_image()) for p in pasted)
+    assert pasted[0].get_mask() is handler.get_mask()
+
+    pasted[0].get_writable_image()[:] = 255
+
+    assert np.all(handler.get_image() == 0)
+    assert not np.shares_memory(handler.get_image(), pasted[0].get_image())
+    assert np.shares_memory(handler.get_image(), pasted[1].get_image())
@@ -0,0 +1,53 @@
+import numpy as np
+
+from creatumlibre.graphics.memory.tile_delta import TileDelta
+
+
+def test_only_changed_tiles_are_stored_and_swap_both_ways():
+    before = np.random.default_rng(1).integers(0, 255, (600, 700, 3), np.uint8)
+    after = before.copy()
+    after[300:310, 300:310] = 0  # nur eine Kachel betroffen
+
+    delta = TileDelta.between(before, after, tile_size=256)
+    assert delta.slices == [(256, 512, 256, 512)]
+    assert delta.nbytes == 256 * 256 * 3
+
+    image = after.copy()
+    delta.swap(image)
+    assert np.array_equal(image, before)
+    delta.swap(image)
+    assert np.array_equal(image, after)
+
+    assert TileDelta.between(before, before.copy()) is None
+
+
+def test_compressed_and_spilled_tiles_come_back(tmp_path):
+    before = np.zeros((300, 300), dtype=np.uint8)
+    after = before.copy()
+    after[:, 290:] = 7  # Randkacheln mit krummer Größe
+
+    delta = TileDelta.between(before, after, tile_size=256)
+    raw = delta.nbytes
+    delta.compress()
+    assert 0 < delta.nbytes < raw
+
+    delta.spill(str(tmp_path))
+    assert delta.nbytes == 0
+    assert len(list(tmp_path.iterdir())) == 1
+
+    image = after.copy()
+    delta.swap(image)
+    assert np.array_equal(image, before)
+    assert not list(tmp_path.iterdir())  # Datei wieder gelöscht
+
+
+def test_size_change_replaces_whole_image():
+    before = np.ones((10, 10, 3), dtype=np.uint8)
+    after = np.zeros((20, 5, 3), dtype=np.uint8)
+
+    delta = TileDelta.between(before, after)
+    delta.compress()
+    restored = delta.swap(after)
+    assert np.array_equal(restored, before)
+    assert restored.flags.writeable
+    assert delta.swap(restored) is after
@@ -0,0 +1,67 @@
+import numpy as np
+
+from creatumlibre.graphics.boolean_operations.image_boolean import merge_arrays
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.graphics.selection.cropped_mask import CroppedMask
+from creatumlibre.graphics.selection.region_manager import RegionManager
+
+
+def test_mask_is_stored_cropped():
+    full = np.zeros((400, 600), dtype=np.float32)
+    full[100:150, 200:230] = 1.0
+
+    mask = CroppedMask.from_array(full)
+
+    assert mask.alpha.dtype == np.uint8
+    assert mask.alpha.shape == (50, 30)
+    assert mask.offset == (200, 100)
+    assert np.array_equal(mask.to_array(), (full * 255).astype(np.uint8))
+
+
+def test_opaque_mask_is_none():
+    assert CroppedMask.from_array(np.ones((20, 20), dtype=np.float32)) is None
+
+    region_manager = RegionManager()
+    region_manager.initialize_mask((20, 20, 3))
+    assert region_manager.mask is None
+
+
+def test_merge_uses_cropped_mask():
+    overlay = np.full((40, 60, 3), 200, dtype=np.uint8)
+    full = np.zeros((40, 60), dtype=np.uint8)
+    full[10:20, 5:25] = 255
+    full[10:20, 25:30] = 128
+
+    expected = np.zeros((100, 100, 3), dtype=np.uint8)
+    merge_arrays(overlay, full, Vector2D(30, 20), expected)
+    result = np.zeros((100, 100, 3), dtype=np.uint8)
+    merge_arrays(overlay, CroppedMask.from_array(full), Vector2D(30, 20), result)
+
+    assert np.array_equal(result, expected)
+    assert not merge_arrays(
+        overlay, CroppedMask.from_array(np.zeros((40, 60))), Vector2D(0, 0), result
+    )
+
+
+def test_downsampled_matches_full_mask():
+    full = np.zeros((64, 64), dtype=np.uint8)
+    full[11:37, 21:50] = 255
+
+    half = CroppedMask.from_array(full).downsampled()
+
+    assert half.size == (32, 32)
+    expected = full.reshape((32, 2, 32, 2)).mean(axis=(1, 3))
+    assert np.abs(half.to_array().astype(int) - expected).max() <= 1
+
+
+def test_contains_matches_alpha():
+    full = np.zeros((70, 90), dtype=np.uint8)
+    full[5:60, 10:80] = 255
+    full[20:40, 30:50] = 0  # Loch
+    full[50:60, 10:80:3] = 100  # Streifen, gemischte Blöcke
+
+    mask = CroppedMask.from_array(full)
+
+    hits = np.array([[mask.contains(x, y) for x in range(90)] for y in range(70)])
+    assert np.array_equal(hits, full > 0)
+    assert mask.get_bounds() == (10, 5, 80, 60)
@@ -0,0 +1,44 @@
+import numpy as np
+
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.graphics.selection.polygon_mask import rasterize_polygon
+
+
+def test_rasterize_within_bounds():
+    triangle = np.array([[110, 210], [150, 210], [110, 250]])
+
+    alpha = rasterize_polygon(triangle, (100, 200, 160, 260))
+
+    assert alpha.shape == (60, 60)
+    assert alpha[15, 15] == 255  # innen
+    assert alpha[55, 55] == 0  # außen
+    edge = alpha[30, 5:35]
+    assert np.any((edge > 0) & (edge < 255))  # geglättete Kante
+
+
+def test_polygon_becomes_masked_promoted_layer():
+    image = np.arange(200 * 300 * 3, dtype=np.uint32).reshape(200, 300, 3)
+    base = ImageHandler(image.astype(np.uint8), Vector2D(0, 0))
+    points = [
+        Vector2D(50, 40),
+        Vector2D(150, 40),
+        Vector2D(150, 120),
+        Vector2D(50, 120),
+    ]
+    points.append(Vector2D(100, 80))  # Einbuchtung
+
+    layer = base.extract_polygon_as_new_image(points)
+
+    assert layer.is_promoted
+    assert layer.get_position().to_tuple() == (50, 40)
+    assert layer.get_image().shape == (81, 101, 3)
+    assert np.array_equal(layer.get_image(), base.get_image()[40:121, 50:151])
+    mask = layer.get_mask().to_array()
+    assert mask[5, 50] == 255 and mask[40, 10] == 0  # Kerbe ist durchsichtig
+
+
+def test_polygon_outside_image():
+    base = ImageHandler(np.zeros((50, 50, 3), dtype=np.uint8), Vector2D(0, 0))
+    points = [Vector2D(60, 60), Vector2D(80, 60), Vector2D(70, 90)]
+    assert base.extract_polygon_as_new_image(points) is None
@@ -0,0 +1,25 @@
+from creatumlibre.graphics.spatial.grid_index import GridIndex
+
+
+def test_point_and_rect_queries():
+    index = GridIndex(cell_size=10)
+    index.insert("a", (0, 0, 25, 25))
+    index.insert("b", (20, 20, 40, 30))
+
+    assert sorted(index.query_point(22, 22)) == ["a", "b"]
+    assert index.query_point(25, 5) == []  # rechter Rand gehört nicht dazu
+    assert sorted(index.query_rect((30, 0, 100, 100))) == ["b"]
+    assert index.query_rect((50, 50, 60, 60)) == []
+
+
+def test_update_and_remove():
+    index = GridIndex(cell_size=10)
+    index.insert("a", (0, 0, 5, 5))
+    index.update("a", (100, 100, 105, 105))
+
+    assert index.query_point(2, 2) == []
+    assert index.query_point(102, 102) == ["a"]
+
+    index.remove("a")
+    assert len(index) == 0
+    assert index.query_point(102, 102) == []
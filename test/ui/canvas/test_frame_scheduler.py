@@ -0,0 +1,50 @@
+import time
+
+from PyQt6.QtCore import QCoreApplication
+
+from creatumlibre.ui.canvas.frame_scheduler import FrameScheduler
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def _run_events(milliseconds: int, until=lambda: False):
+    end = time.monotonic() + milliseconds / 1000
+    while time.monotonic() < end and not until():
+        QCoreApplication.processEvents()
+
+
+def test_requests_within_a_frame_render_once():
+    state = {"pos": 0}
+    rendered = []
+    scheduler = FrameScheduler(lambda: rendered.append(state["pos"]), 10)
+
+    # viele Mausereignisse innerhalb eines Frames
+    for pos in range(500):
+        state["pos"] = pos
+        scheduler.request()
+    assert not rendered
+    _run_events(50)
+
+    assert rendered == [499]  # nur der letzte Zustand
+
+
+def test_request_after_a_frame_renders_again():
+    rendered = []
+    scheduler = FrameScheduler(lambda: rendered.append(1), 5)
+
+    scheduler.request()
+    _run_events(1000, until=lambda: rendered)
+    scheduler.request()
+    _run_events(1000, until=lambda: len(rendered) == 2)
+
+    assert rendered == [1, 1]
+
+
+def test_cancel_drops_the_pending_frame():
+    rendered = []
+    scheduler = FrameScheduler(lambda: rendered.append(1), 5)
+
+    scheduler.request()
+    scheduler.cancel()
+    _run_events(30)
+    assert not rendered
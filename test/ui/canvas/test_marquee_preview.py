@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from PyQt6.QtCore import QRect
+from PyQt6.QtGui import QGuiApplication, QRegion
+
+from creatumlibre.ui.canvas.marquee_preview import MarqueePreview
+
+app = QGuiApplication.instance() or QGuiApplication([])
+
+
+def _viewport():
+    updates = []
+    return SimpleNamespace(
+        updates=updates, update=lambda region=None: updates.append(region)
+    )
+
+
+class _Canvas:
+    """Zoom 2, kein Versatz"""
+
+    def __init__(self):
+        self._viewport = _viewport()
+
+    def viewport(self):
+        return self._viewport
+
+    def map_to_viewport(self, x0, y0, x1, y1):
+        return QRect(x0 * 2, y0 * 2, (x1 - x0) * 2, (y1 - y0) * 2)
+
+
+def test_move_repaints_only_the_frame_edges():
+    canvas = _Canvas()
+    marquee = MarqueePreview(canvas)
+
+    marquee.set_rect(10, 10, 100, 100)
+    region = canvas.viewport().updates[-1]
+    assert isinstance(region, QRegion)
+    assert region.contains(QRect(20, 20, 1, 1).topLeft())  # Kante
+    assert not region.contains(QRect(200, 200, 1, 1).topLeft())  # Innenraum
+
+    marquee.set_rect(10, 10, 120, 80)
+    region = canvas.viewport().updates[-1]
+    assert region.contains(QRect(220, 100, 1, 1).topLeft())  # alte rechte Kante
+    assert region.contains(QRect(260, 100, 1, 1).topLeft())  # neue rechte Kante
+    assert marquee.rect == (10, 10, 130, 90)
+
+
+def test_clear():
+    canvas = _Canvas()
+    marquee = MarqueePreview(canvas)
+
+    marquee.clear()  # nichts zu löschen
+    assert not canvas.viewport().updates
+
+    marquee.set_rect(0, 0, 5, 5)
+    marquee.clear()
+    assert marquee.rect is None
+    assert len(canvas.viewport().updates) == 2
@@ -0,0 +1,38 @@
+from types import SimpleNamespace
+
+import numpy as np
+from PyQt6.QtCore import QPoint, QRect
+from PyQt6.QtGui import QImage, QPainter
+
+from creatumlibre.core.image_handler import ImageHandler
+from creatumlibre.graphics.math.vector2d import Vector2D
+from creatumlibre.ui.canvas.overlay_painter import OverlayPainter
+
+
+def _canvas(object_list):
+    """Zoom 1, kein Versatz"""
+    return SimpleNamespace(
+        object_manager=SimpleNamespace(object_list=object_list, zoom_factor=1.0),
+        map_to_viewport=lambda x0, y0, x1, y1: QRect(x0, y0, x1 - x0, y1 - y0),
+        content_offset=lambda: (0, 0),
+    )
+
+
+def test_paint_does_not_move_the_refresh_baseline():
+    base = ImageHandler(np.zeros((200, 200, 3), np.uint8), Vector2D(0, 0))
+    layer = ImageHandler(np.zeros((20, 20, 3), np.uint8), Vector2D(10, 10))
+    layer.is_selected = True
+    overlay_painter = OverlayPainter(_canvas([base, layer]))
+    overlay_painter.refresh()
+
+    # verschoben, gemalt wird vor dem nächsten refresh
+    layer.set_position(Vector2D(100, 100))
+    target = QImage(200, 200, QImage.Format.Format_ARGB32)
+    painter = QPainter(target)
+    overlay_painter.paint(painter)
+    painter.end()
+
+    region = overlay_painter.refresh()
+    assert region.contains(QPoint(10, 10))  # alter Rahmen wird gelöscht
+    assert region.contains(QPoint(100, 100))
+    assert overlay_painter.refresh().isEmpty()
@@ -0,0 +1,27 @@
+import numpy as np
+
+from creatumlibre.ui.canvas.qimage_buffer import DisplayBuffer, wrap_bgr
+
+
+def test_wrap_bgr_reads_slice_in_place():
+    pixels = np.zeros((100, 200, 3), dtype=np.uint8)
+    pixels[10:20, 30:40] = [255, 0, 0]  # Blau (BGR)
+
+    image = wrap_bgr(pixels[5:50, 20:100])
+
+    assert (image.width(), image.height()) == (80, 45)
+    assert image.pixelColor(15, 10).getRgb() == (0, 0, 255, 255)
+    pixels[10:20, 30:40] = [0, 0, 255]  # kein Kopieren: Änderung ist sichtbar
+    assert image.pixelColor(15, 10).getRgb() == (255, 0, 0, 255)
+
+
+def test_display_buffer_is_reused():
+    buffer = DisplayBuffer()
+    image = np.full((40, 60, 3), 7, dtype=np.uint8)
+
+    first = buffer.resize_from(image, (30, 20))
+    second = buffer.resize_from(image, (30, 20))
+
+    assert first is second
+    assert first.shape == (20, 30, 3)
+    assert np.all(first == 7)
@@ -0,0 +1,71 @@
+import numpy as np
+from PyQt6.QtCore import QCoreApplication, QThreadPool
+from PyQt6.QtWidgets import QApplication
+
+from creatumlibre.ui.canvas.image_canvas import ImageCanvas
+from creatumlibre.ui.dialogs.color_adjustment_dialog import ColorAdjustmentDialog
+from creatumlibre.ui.manager.object_manager import ObjectManager
+
+app = QApplication.instance() or QApplication([])
+
+
+class _TabManager:
+    def __init__(self, manager, canvas):
+        self.tab = {"manager": manager, "widget": canvas}
+
+    def get_active_tab(self):
+        return self.tab
+
+    def refresh_active_tab_display(self):
+        pass
+
+
+def _open_dialog():
+    manager = ObjectManager()
+    manager.set_base_image(np.full((1200, 1600, 3), 100, dtype=np.uint8))
+    canvas = ImageCanvas(manager)
+    canvas.resize(200, 150)  # kleiner Viewport: Vorschau auf einer groben Stufe
+    dialog = ColorAdjustmentDialog(None, _TabManager(manager, canvas))
+    dialog.show()
+    return dialog, manager
+
+
+def _wait_for_workers():
+    QThreadPool.globalInstance().waitForDone()
+    QCoreApplication.processEvents()
+
+
+def test_closing_stops_the_preview():
+    dialog, manager = _open_dialog()
+    dialog.sliders["Brightness"].setValue(30)
+    assert dialog.settle_timer.isActive()
+
+    dialog.reject()  # wie Esc
+    _wait_for_workers()
+
+    assert not dialog.settle_timer.isActive()
+    assert dialog.session is None
+    assert manager.preview_level == 0
+
+
+def test_late_result_after_close_is_ignored():
+    dialog, manager = _open_dialog()
+    dialog.close()
+    _wait_for_workers()  # der Task lebt nur so lange wie sein Dialog
+
+    dialog.show_result(np.zeros((10, 10, 3), dtype=np.uint8), 2, None)
+
+    assert manager.preview_level == 0
+
+
+def test_escape_and_close_abort_the_undo_step():
+    for close in (ColorAdjustmentDialog.reject, ColorAdjustmentDialog.close):
+        dialog, manager = _open_dialog()
+        assert manager.history.pending is not None
+        assert len(manager.object_list) == 2  # Basis und befördertes Bild
+
+        close(dialog)
+        _wait_for_workers()
+
+        assert manager.history.pending is None
+        assert len(manager.object_list) == 1
@@ -4,8 +4,8 @@ import cv2
 import numpy as np
 import pytest
 
+from creatumlibre.core.image_handler import ImageHandler
 from creatumlibre.graphics.math.vector2d import Vector2D
-from creatumlibre.ui.manager.image_handler import ImageHandler
 from creatumlibre.ui.manager.object_manager import ObjectManager
 
 
@@ -43,3 +43,73 @@ def test_delete_object_removes_item(manager, image_handler):
     length_before = len(manager.object_list)
     manager.delete_object(image_handler)
     assert len(manager.object_list) == length_before - 1
+
+
+def test_hit_test_follows_moves_and_stacking(manager):
+    lower = ImageHandler(np.zeros((10, 10, 3), dtype=np.uint8), Vector2D(0, 0))
+    upper = ImageHandler(np.zeros((10, 10, 3), dtype=np.uint8), Vector2D(5, 5))
+    manager.add_object(lower)
+    manager.add_object(upper)
+
+    assert manager.get_objects_at((7, 7)) == [upper, lower]
+    assert manager.get_object_at((2, 2)) is lower
+
+    upper.is_selected = True
+    upper.position_before_drag = upper.get_position()
+    manager.update_selected_position(Vector2D(100, 100))
+    assert manager.get_object_at((7, 7)) is lower
+    assert manager.get_object_at((107, 107)) is upper
+    assert manager.get_objects_in_rect(0, 0, 200, 200) == [upper, lower]
+
+    manager.delete_object(upper)
+    assert manager.get_object_at((107, 107)) is None
+
+
+def test_click_through_transparent_corner(manager):
+    lower = ImageHandler(np.zeros((100, 100, 3), dtype=np.uint8), Vector2D(0, 0))
+    manager.add_object(lower)
+    triangle = [Vector2D(0, 0), Vector2D(99, 0), Vector2D(0, 99)]
+    cut = lower.extract_polygon_as_new_image(triangle)
+    cut.is_promoted = False
+    manager.add_object(cut)
+
+    assert manager.get_object_at((10, 10)) is cut
+    assert manager.get_object_at((90, 90)) is lower  # durchsichtige Ecke
+
+
+def test_drag_moves_whole_selection_from_its_start(manager):
+    layers = [
+        ImageHandler(np.zeros((4, 4, 3), dtype=np.uint8), Vector2D(10 * i, 0))
+        for i in range(50)
+    ]
+    for layer in layers:
+        manager.add_object(layer)
+        layer.is_selected = True
+
+    manager.update_selected_position(Vector2D(5, 5))
+    manager.update_selected_position(Vector2D(1, 2))  # relativ zum Start
+    assert [layer.get_position() for layer in layers] == [
+        Vector2D(10 * i + 1, 2) for i in range(50)
+    ]
+    assert manager.get_object_at((492, 3)) is layers[49]
+
+    manager.set_new_position()
+    manager.update_selected_position(Vector2D(1, 0))
+    assert layers[0].get_position() == Vector2D(2, 2)
+
+
+def test_preview_while_loading_then_full_image():
+    manager = ObjectManager()
+    # Platzhalter in voller Größe ohne Speicher dahinter
+    manager.set_base_image(np.broadcast_to(np.zeros(3, np.uint8), (800, 640, 3)))
+    preview = np.full((100, 80, 3), 90, dtype=np.uint8)
+    manager.get_base_object().set_preview(preview, 3)
+    manager.preview_level = 3
+
+    frame = manager.compositor.render(manager.object_list, manager.render_zoom())
+    assert np.array_equal(frame, preview)
+
+    manager.set_base_image(np.full((800, 640, 3), 200, dtype=np.uint8))
+    manager.preview_level = 0
+    assert manager.get_base_object().preview is None
+    assert len(manager.object_list) == 1
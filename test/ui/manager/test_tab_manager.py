@@ -0,0 +1,35 @@
+# pylint: disable=no-member
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from PyQt6.QtCore import QCoreApplication
+from PyQt6.QtWidgets import QVBoxLayout
+
+from creatumlibre.ui.manager.tab_manager import TabManager
+
+
+def _load(tab_manager, paths):
+    tab_manager.load_new_images([str(path) for path in paths])
+    while tab_manager.load_queue.get_pending_count():
+        QCoreApplication.processEvents()
+
+
+def test_failed_file_leaves_the_other_tabs_intact(tmp_path):
+    paths = [tmp_path / f"img{index}.png" for index in range(3)]
+    for path in paths:
+        cv2.imwrite(str(path), np.full((40, 60, 3), 100, dtype=np.uint8))
+    # Kopf lesbar, Pixel fehlen: erst das Dekodieren schlägt fehl
+    paths[1].write_bytes(paths[1].read_bytes()[:60])
+
+    tab_manager = TabManager(SimpleNamespace(workspace_layout=QVBoxLayout()))
+    _load(tab_manager, paths)
+
+    tab_widget = tab_manager.tab_widget
+    assert [tab_widget.tabText(i) for i in range(tab_widget.count())] == [
+        "img0.png",
+        "img2.png",
+    ]
+    for index, path in enumerate((paths[0], paths[2])):
+        tab_widget.setCurrentIndex(index)
+        assert tab_manager.get_active_tab()["file_apth"] == str(path)
@@ -0,0 +1,49 @@
+import threading
+import time
+
+from PyQt6.QtCore import QCoreApplication, QThreadPool
+
+from creatumlibre.ui.workers.image_load_queue import ImageLoadQueue
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def _run_jobs(budget, nbytes, count=6):
+    pool = QThreadPool()
+    pool.setMaxThreadCount(4)
+    queue = ImageLoadQueue(pool, budget=budget)
+    lock = threading.Lock()
+    active = [0, 0]  # laufend, Maximum
+    results = []
+
+    def decode(index):
+        with lock:
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return index
+
+    for index in range(count):
+        queue.submit(decode, index, nbytes=nbytes, on_finished=results.append)
+    while queue.get_pending_count():
+        QCoreApplication.processEvents()
+        time.sleep(0.001)
+    return sorted(results), active[1], queue
+
+
+def test_budget_limits_jobs_in_flight():
+    results, most, queue = _run_jobs(budget=100, nbytes=60)
+    assert results == list(range(6))
+    assert most == 1  # zwei passen nicht ins Budget
+    assert queue.in_flight == 0
+
+    _, most, _ = _run_jobs(budget=100, nbytes=30)
+    assert most == 3
+
+
+def test_oversized_job_still_runs_alone():
+    results, most, _ = _run_jobs(budget=10, nbytes=1000, count=2)
+    assert results == [0, 1]
+    assert most == 1
@@ -0,0 +1,66 @@
+import threading
+
+from PyQt6.QtCore import QCoreApplication, QThreadPool
+
+from creatumlibre.ui.workers.task_worker import LatestTaskRunner
+
+app = QCoreApplication.instance() or QCoreApplication([])
+
+
+def _wait(pool: QThreadPool):
+    pool.waitForDone()
+    QCoreApplication.processEvents()  # queued signals from the pool threads
+
+
+def test_only_latest_result_is_delivered():
+    pool = QThreadPool()
+    pool.setMaxThreadCount(1)
+    runner = LatestTaskRunner(pool)
+    gate = threading.Event()
+    results = []
+
+    runner.submit(gate.wait, on_finished=results.append)  # keeps the pool busy
+    runner.submit(lambda: "stale", on_finished=results.append)  # queued, dropped
+    runner.submit(lambda: "latest", on_finished=results.append)
+    gate.set()
+    _wait(pool)
+
+    assert results == ["latest"]
+    assert runner.task is None
+
+
+def test_cancel_drops_running_result():
+    pool = QThreadPool()
+    runner = LatestTaskRunner(pool)
+    gate = threading.Event()
+    results = []
+
+    runner.submit(lambda: gate.wait() and "done", on_finished=results.append)
+    runner.cancel()
+    gate.set()
+    _wait(pool)
+
+    assert not results
+
+
+def test_failure_is_reported_to_caller():
+    pool = QThreadPool()
+    runner = LatestTaskRunner(pool)
+    errors = []
+
+    runner.submit(lambda: 1 / 0, on_failed=errors.append)
+    _wait(pool)
+
+    assert errors == ["division by zero"]
+    assert runner.task is None
+
+
+def test_failure_without_handler_is_logged(caplog):
+    pool = QThreadPool()
+    runner = LatestTaskRunner(pool)
+
+    runner.submit(lambda: 1 / 0)
+    _wait(pool)
+
+    assert "division by zero" in caplog.text
+    assert runner.task is None